@@ -1,24 +1,56 @@
-from fastapi import APIRouter, Path, Depends, Body, Response
+from fastapi import APIRouter, Path, Depends, Body, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from app.core.cache import DETAIL_CACHE_CONTROL
-from app.core.db import get_db
+from app.core.cache import DETAIL_CACHE_CONTROL, PENDING_CACHE_CONTROL
+from app.core.config import settings
+from app.core.db import get_read_db
+from app.core.deadline import extend_deadline
+from app.core.longpoll import LONGPOLL_MAX_WAIT_SEC
 from app.services.album_service import AlbumService
-from app.domain.schemas import AlbumDetail, SyncAlbumIn
+from app.domain.schemas import AbsorbStatus, AlbumDetail, SyncAlbumIn
 
 router = APIRouter()
 
 @router.get("/{album_id}", response_model=AlbumDetail)
-def get_album(response: Response, album_id: str = Path(...), db: Session = Depends(get_db)):
+def get_album(response: Response, album_id: str = Path(...), db: Session = Depends(get_read_db)):
     svc = AlbumService(db)
     detail = svc.get_album_detail(album_id)  # raises 404 before we set the header
     response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
     return detail
 
-@router.get("/by-spotify/{spotify_album_id}", response_model=AlbumDetail)
-def get_album_by_spotify(response: Response, spotify_album_id: str = Path(...), db: Session = Depends(get_db)):
+@router.get(
+    "/by-spotify/{spotify_album_id}",
+    response_model=AlbumDetail,
+    responses={202: {"model": AbsorbStatus, "description": "Worker is still absorbing the album (absorb tracking on)."}},
+)
+def get_album_by_spotify(
+    response: Response,
+    spotify_album_id: str = Path(...),
+    wait: int = Query(
+        0, ge=0, le=LONGPOLL_MAX_WAIT_SEC,
+        description="Long-poll: hold up to N seconds for the worker to absorb the album before answering 404.",
+    ),
+    db: Session = Depends(get_read_db),
+):
     # by-spotify can 404 while the worker is still absorbing; the 404 path raises
     # in the service, so the Cache-Control below is reached on success only.
     svc = AlbumService(db)
-    detail = svc.get_album_detail_by_spotify(spotify_album_id)
+    if wait:
+        extend_deadline(db, wait)
+        svc.wait_until_absorbed(spotify_album_id, wait)
+    try:
+        detail = svc.get_album_detail_by_spotify(spotify_album_id)
+    except HTTPException as e:
+        if e.status_code != 404 or not settings.ABSORB_TRACKING_ENABLED:
+            raise
+        pending = svc.get_absorb_status(spotify_album_id)
+        if pending is None:
+            raise
+        # Live absorb request → short-cached 202 with an ETA instead of the 404.
+        return JSONResponse(
+            status_code=202,
+            content=pending.model_dump(),
+            headers={"Cache-Control": PENDING_CACHE_CONTROL},
+        )
     response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
     return detail
\ No newline at end of file
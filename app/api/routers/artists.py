@@ -1,10 +1,17 @@
-from typing import List
+import json
+import uuid
+from datetime import datetime
+from typing import Iterable, Iterator, List, Literal, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.cache import DETAIL_CACHE_CONTROL
-from app.core.db import get_db
+from app.core.cache import DETAIL_CACHE_CONTROL, PENDING_CACHE_CONTROL
+from app.core.config import settings
+from app.core.db import get_read_db
+from app.core.deadline import extend_deadline
+from app.core.longpoll import LONGPOLL_MAX_WAIT_SEC
 from app.domain.schemas import ArtistHero, ArtistIdItem, SearchResult, TrackItem
 from app.repositories.album_repo import AlbumRepository
 from app.services.artist_service import ArtistService
@@ -16,18 +23,59 @@ def _service(db: Session) -> ArtistService:
     return ArtistService(db, AlbumRepository(db))
 
 
+# Rows per streamed chunk of /ids.
+_IDS_CHUNK_ROWS = 500
+
+
+def _encode_ids(rows: Iterable[Tuple[str, str]], ndjson: bool) -> Iterator[bytes]:
+    # Same items as List[ArtistIdItem], encoded straight from the row tuples.
+    buf: list[str] = []
+    first = True
+    if not ndjson:
+        yield b"["
+    for artist_id, name in rows:
+        item = json.dumps({"id": artist_id, "name": name}, ensure_ascii=False, separators=(",", ":"))
+        if ndjson:
+            buf.append(item + "\n")
+        else:
+            buf.append(item if first else "," + item)
+            first = False
+        if len(buf) >= _IDS_CHUNK_ROWS:
+            yield "".join(buf).encode()
+            buf.clear()
+    if buf:
+        yield "".join(buf).encode()
+    if not ndjson:
+        yield b"]"
+
+
 # FEAT-artist-page: full catalog-artist id list for the front's build-time
 # /artist/[id] getStaticPaths enumeration (the static build reads no DB/runtime
 # API otherwise). Literal route — MUST stay declared before the parametric
 # `/{artist_id}` below so FastAPI matches the literal segment first.
+# Streamed in artist-id order. Page with `limit` + `after` (the last id of the
+# previous page); incremental builds pass `since` for only the artists whose
+# first album was absorbed after it. The rows are read lazily through the
+# request's get_read_db session while the body streams: FastAPI >= 0.118
+# (requirements.txt) closes yield-dependencies after the response is sent;
+# 0.106–0.117 closed them before, mid-stream.
 @router.get("/ids", response_model=List[ArtistIdItem])
 def list_artist_ids(
-    response: Response,
-    db: Session = Depends(get_db),
+    after: Optional[uuid.UUID] = Query(None, description="Keyset cursor: the last artist id of the previous page."),
+    since: Optional[datetime] = Query(None, description="Delta: only artists whose first album was absorbed after this time."),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Page size (default: no limit)."),
+    fmt: Literal["json", "ndjson"] = Query(
+        "json", alias="format", description="`ndjson` streams one item per line."
+    ),
+    db: Session = Depends(get_read_db),
 ):
-    items = _service(db).list_artist_ids()
-    response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
-    return items
+    rows = _service(db).iter_artist_ids(after=after, since=since, limit=limit)
+    ndjson = fmt == "ndjson"
+    return StreamingResponse(
+        _encode_ids(rows, ndjson),
+        media_type="application/x-ndjson" if ndjson else "application/json",
+        headers={"Cache-Control": DETAIL_CACHE_CONTROL},
+    )
 
 
 @router.get("/{artist_id}/albums", response_model=SearchResult)
@@ -36,7 +84,7 @@ def get_artist_albums(
     artist_id: str = Path(...),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     result = _service(db).list_albums_by_artist(artist_id=artist_id, limit=limit, offset=offset)
     response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
@@ -47,19 +95,37 @@ def get_artist_albums(
 # artist drill-in panel. All DB-only (no synchronous Spotify call per
 # CLAUDE.md rule #9). 404 paths feed the frontend's poll/fallback flow.
 
-@router.get("/by-spotify/{spotify_id}", response_model=ArtistHero)
+@router.get(
+    "/by-spotify/{spotify_id}",
+    response_model=ArtistHero,
+    responses={202: {"model": ArtistHero, "description": 'Worker is still absorbing the artist — `status="pending"` with `eta_sec`.'}},
+)
 def get_artist_by_spotify(
     response: Response,
     spotify_id: str = Path(..., min_length=1),
-    db: Session = Depends(get_db),
+    wait: int = Query(
+        0, ge=0, le=LONGPOLL_MAX_WAIT_SEC,
+        description="Long-poll: hold up to N seconds for the worker to absorb the artist before answering 404.",
+    ),
+    db: Session = Depends(get_read_db),
 ):
     # Route order matters — declared before the parametric `/{artist_id}`
     # below so FastAPI matches the literal segment first.
-    hero = _service(db).get_hero_by_spotify_id(spotify_id)
+    svc = _service(db)
+    if wait:
+        extend_deadline(db, wait)
+        svc.wait_until_absorbed(spotify_id, wait)
+    hero = svc.get_hero_by_spotify_id(spotify_id)
     if not hero:
-        # Absorb-tracking table doesn't exist today, so we cannot distinguish
-        # "truly unknown" from "pending." Frontend polls until ready or gives up.
-        # The 404 must stay uncached so that poll sees the flip to 200 promptly.
+        # With absorb tracking on, a live absorb request answers a short-cached
+        # 202 `status="pending"` hero. Otherwise (flag off, truly unknown,
+        # failed, or stale) 404 — it must stay uncached so the frontend's
+        # long-poll (`?wait=N`) sees the flip to 200 promptly.
+        pending = svc.get_pending_hero(spotify_id) if settings.ABSORB_TRACKING_ENABLED else None
+        if pending is not None:
+            response.status_code = 202
+            response.headers["Cache-Control"] = PENDING_CACHE_CONTROL
+            return pending
         raise HTTPException(status_code=404, detail="artist not found")
     response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
     return hero
@@ -70,7 +136,7 @@ def get_artist_top_tracks(
     response: Response,
     artist_id: str = Path(...),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     result = _service(db).list_top_tracks(artist_id=artist_id, limit=limit)
     response.headers["Cache-Control"] = DETAIL_CACHE_CONTROL
@@ -81,7 +147,7 @@ def get_artist_top_tracks(
 def get_artist(
     response: Response,
     artist_id: str = Path(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     hero = _service(db).get_hero_by_id(artist_id)
     if not hero:
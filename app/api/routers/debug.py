@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from app.core.auth import require_cognito_token
+from app.core.cache_metrics import snapshot
+from app.core.config import settings
+
+router = APIRouter()
+
+
+def _enabled() -> None:
+    # 404 (not 403) so a disabled deployment doesn't advertise the route.
+    if not settings.DEBUG_ENDPOINTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+# 운영 진단용 — 이 컨테이너의 캐시 카운터/크기/적중 age 분포 (누적값).
+@router.get("/caches", dependencies=[Depends(_enabled), Depends(require_cognito_token)])
+def cache_stats(response: Response):
+    response.headers["Cache-Control"] = "no-store"
+    return snapshot()
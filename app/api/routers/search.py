@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Set
 
 from app.core.cache import SEARCH_CACHE_CONTROL
-from app.core.db import get_db
-from app.domain.schemas import CandidateSearchResult, UnifiedSearchResult
+from app.core.db import get_db, get_read_db
+from app.domain.schemas import (
+    CandidateSearchResult,
+    UnifiedSearchBatchIn,
+    UnifiedSearchBatchResult,
+    UnifiedSearchResult,
+)
 from app.services.search_service import SearchService as DBSearchService
 
 from app.clients.sqs_client import SqsClient
 from app.core.auth import require_cognito_token
+from app.core.config import settings
 from app.services.cadidate_search_service import CandidateSearchService
 from app.services.search_service import ALLOWED_TYPES
+from app.services.query_stats_service import flush_query_stats, record_query
 
 router = APIRouter()
 
@@ -30,16 +37,22 @@ def unified_search(
     artist_offset: Optional[int] = Query(None, ge=0, description="Per-bucket offset for the artists slice (overrides `offset`)."),
     album_offset: Optional[int] = Query(None, ge=0, description="Per-bucket offset for the albums slice (overrides `offset`)."),
     track_offset: Optional[int] = Query(None, ge=0, description="Per-bucket offset for the tracks slice (overrides `offset`)."),
-    explain: bool = Query(False, description="Dev triage: include per-row ranking debug under `debug` (default response shape is otherwise unchanged)."),
+    explain: bool = Query(False, description="Dev triage: include per-row ranking debug under `debug` and the query planner's strategy under `plan` (default response shape is otherwise unchanged)."),
+    x_search_session: Optional[str] = Header(
+        None,
+        alias="X-Search-Session",
+        max_length=64,
+        description="Search-as-you-type: an opaque id the client keeps for one typing session. Later keystrokes that extend the query are refined from the previous keystroke's matches instead of re-queried.",
+    ),
     response: Response = None,  # type: ignore[assignment]  # injected by FastAPI
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None,  # type: ignore[assignment]  # injected by FastAPI
+    db: Session = Depends(get_read_db),
 ):
-    types = {t.strip().lower() for t in type.split(",") if t.strip()}
-    invalid = types - ALLOWED_TYPES
-    if invalid:
-        raise HTTPException(status_code=400, detail=f"Invalid types: {sorted(invalid)}")
-    if not types:
-        raise HTTPException(status_code=400, detail="type must not be empty")
+    types = _parse_types(type)
+    # Query-frequency telemetry (QUERY_STATS_ENABLED) — memory-only here; the
+    # periodic DB flush runs after the response on its own session.
+    if record_query(q):
+        background_tasks.add_task(flush_query_stats)
     result = DBSearchService(db).unified_search(
         q=q,
         types=types,
@@ -49,12 +62,57 @@ def unified_search(
         album_offset=album_offset,
         track_offset=track_offset,
         explain=explain,
+        session=x_search_session,
     )
     # 200-only: validation 400s above raise before reaching here, so they stay uncached.
     response.headers["Cache-Control"] = SEARCH_CACHE_CONTROL
     return result
 
 
+def _parse_types(type: str) -> Set[str]:
+    types = {t.strip().lower() for t in type.split(",") if t.strip()}
+    invalid = types - ALLOWED_TYPES
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid types: {sorted(invalid)}")
+    if not types:
+        raise HTTPException(status_code=400, detail="type must not be empty")
+    return types
+
+
+# 통합 검색 일괄 — import / bulk-tagging flows: many /unified queries in one
+# request, one session. Results in request order.
+@router.post(
+    "/unified:batch",
+    response_model=UnifiedSearchBatchResult,
+    summary="통합 검색 일괄(DB-first)",
+)
+def unified_search_batch(
+    body: UnifiedSearchBatchIn,
+    background_tasks: BackgroundTasks = None,  # type: ignore[assignment]  # injected by FastAPI
+    db: Session = Depends(get_read_db),
+    _claims: dict = Depends(require_cognito_token),
+):
+    if len(body.queries) > settings.SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.SEARCH_BATCH_MAX_QUERIES} queries per batch",
+        )
+    queries = []
+    for i, item in enumerate(body.queries):
+        params = item.model_dump()
+        try:
+            params["types"] = _parse_types(params.pop("type"))
+        except HTTPException as e:
+            raise HTTPException(status_code=400, detail=f"queries[{i}]: {e.detail}")
+        queries.append(params)
+    flush = False
+    for item in body.queries:
+        flush = record_query(item.q) or flush
+    if flush:
+        background_tasks.add_task(flush_query_stats)
+    return UnifiedSearchBatchResult(results=DBSearchService(db).unified_search_batch(queries))
+
+
 # -------------------------------
 # 후보 검색 (+ 앨범 동기화 enqueue) - 기존 유지
 # -------------------------------
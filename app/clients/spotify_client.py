@@ -2,17 +2,28 @@
 # Auth logic (_get_token/_headers) must stay in sync. See docs/decisions/ADR-0004.
 import base64, time, httpx
 from typing import Optional, Dict, Any, List
+from app.core.cache_metrics import register as register_cache_metrics
 from app.core.config import settings
 
 class SpotifyClient:
     def __init__(self):
         self._token: Optional[str] = None
         self._exp: float = 0.0
+        self._fetched_at: float = 0.0
+        # Observability only (app/core/cache_metrics.py) — not part of the
+        # auth logic mirrored in the worker.
+        self._metrics = register_cache_metrics(
+            "spotify_token", lambda: (1 if self._token else 0, 0)
+        )
 
     def _get_token(self) -> str:
         now = time.time()
         if self._token and now < self._exp:
+            self._metrics.hit(now - self._fetched_at)
             return self._token
+        if self._token:
+            self._metrics.expired()
+        self._metrics.miss()
 
         auth = f"{settings.SPOTIFY_CLIENT_ID}:{settings.SPOTIFY_CLIENT_SECRET}".encode()
         headers = {
@@ -25,6 +36,7 @@ class SpotifyClient:
         r.raise_for_status()
         payload = r.json()
         self._token = payload["access_token"]
+        self._fetched_at = now
         # 만료 90% 지점으로 앞당겨 재발급
         self._exp = now + float(payload.get("expires_in", 3600)) * 0.9
         return self._token
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from functools import lru_cache
 from typing import Any, Dict
 
@@ -9,12 +10,19 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
+from app.core.cache_metrics import register as register_cache_metrics
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 _bearer = HTTPBearer(auto_error=False)
 
+# monotonic time of the last successful fetch; None while nothing is cached.
+_jwks_fetched_at: float | None = None
+_jwks_metrics = register_cache_metrics(
+    "jwks", lambda: (0 if _jwks_fetched_at is None else 1, 0)
+)
+
 
 @lru_cache(maxsize=1)
 def _get_jwks() -> Dict[str, Any]:
@@ -24,9 +32,17 @@ def _get_jwks() -> Dict[str, Any]:
     )
     resp = httpx.get(url, timeout=10)
     resp.raise_for_status()
+    global _jwks_fetched_at
+    _jwks_fetched_at = time.monotonic()
     return resp.json()
 
 
+def _clear_jwks() -> None:
+    global _jwks_fetched_at
+    _jwks_fetched_at = None
+    _get_jwks.cache_clear()
+
+
 def require_cognito_token(
     credentials: HTTPAuthorizationCredentials | None = Depends(_bearer),
 ) -> Dict[str, Any]:
@@ -41,6 +57,7 @@ def require_cognito_token(
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
 
+        fetched_at = _jwks_fetched_at
         try:
             jwks = _get_jwks()
         except httpx.HTTPError as e:
@@ -55,9 +72,17 @@ def require_cognito_token(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Auth provider unavailable",
             )
+        cached = fetched_at is not None and fetched_at == _jwks_fetched_at
+        if cached:
+            _jwks_metrics.hit(time.monotonic() - fetched_at)
+        else:
+            _jwks_metrics.miss()
         key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
         if key is None:
-            _get_jwks.cache_clear()
+            if cached:
+                _jwks_metrics.stale()  # key rotation: the cached set predates this kid
+            _jwks_metrics.evicted()
+            _clear_jwks()
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown token key")
 
         issuer = (
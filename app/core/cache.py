@@ -17,5 +17,14 @@ from __future__ import annotations
 # Search results churn more (new catalog rows surface via worker sync); keep short.
 SEARCH_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=60"
 
-# Album / artist detail is near-immutable once absorbed; cache longer.
-DETAIL_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=120"
+# Album / artist detail is near-immutable once absorbed; cache longer. The
+# max-age doubles as the staleness bound for precomputed detail data (the
+# artist top-tracks materialized view, migration 005).
+DETAIL_MAX_AGE_SEC = 300
+DETAIL_CACHE_CONTROL = f"public, max-age={DETAIL_MAX_AGE_SEC}, stale-while-revalidate=120"
+
+# Absorb-pending 202 (ABSORB_TRACKING_ENABLED). Unlike the 404 it replaces, this
+# is a positive answer ("enqueued, ETA n s"), so it may be cached — but only
+# briefly, so a poller still sees the flip to 200 within a few seconds while a
+# burst of identical polls collapses at the edge.
+PENDING_CACHE_CONTROL = "public, max-age=5"
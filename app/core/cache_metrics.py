@@ -0,0 +1,161 @@
+"""Per-cache counters + entry-age histograms, emitted as CloudWatch EMF.
+
+Every in-process cache (unified search, JWKS, Spotify token, ...) registers a
+`CacheMetrics` and reports its own events:
+
+- hit / miss
+- stale: a cached value that turned out to be out of date when used (e.g. a
+  JWKS missing the token's kid)
+- eviction: removed early (byte budget, invalidation); expiration: TTL ran out
+- rejected: too large to store
+- hit_age: age of the entry served on each hit, bucketed in seconds
+
+`emit_emf()` prints one Embedded Metric Format line per cache (counter deltas
+since the previous emit + current size). Lambda ships stdout to CloudWatch Logs,
+which extracts the metrics — no agent, no API call, nothing on the request path.
+`snapshot()` feeds the debug endpoint with cumulative values.
+
+No lock — a Lambda container handles one event at a time.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+EMF_NAMESPACE = "MusicCatalog/Cache"
+
+# Upper bounds (seconds) of the hit-age buckets; the last bucket is open-ended.
+AGE_BUCKETS_SEC: Tuple[float, ...] = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+COUNTERS = ("hits", "misses", "stale", "evictions", "expirations", "rejected")
+
+SizeFn = Callable[[], Tuple[int, int]]  # -> (entries, bytes)
+
+
+class CacheMetrics:
+    def __init__(self, name: str, size_fn: Optional[SizeFn] = None):
+        self.name = name
+        self.size_fn = size_fn
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.hit_age = [0] * (len(AGE_BUCKETS_SEC) + 1)
+        self._emitted: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._emitted_age = [0] * len(self.hit_age)
+
+    def hit(self, age_sec: float) -> None:
+        self.counts["hits"] += 1
+        self.hit_age[bisect_left(AGE_BUCKETS_SEC, age_sec)] += 1
+
+    def miss(self) -> None:
+        self.counts["misses"] += 1
+
+    def stale(self) -> None:
+        self.counts["stale"] += 1
+
+    def evicted(self, n: int = 1) -> None:
+        self.counts["evictions"] += n
+
+    def expired(self, n: int = 1) -> None:
+        self.counts["expirations"] += n
+
+    def rejected(self) -> None:
+        self.counts["rejected"] += 1
+
+    def size(self) -> Tuple[int, int]:
+        return self.size_fn() if self.size_fn else (0, 0)
+
+    def snapshot(self) -> dict:
+        entries, nbytes = self.size()
+        lookups = self.counts["hits"] + self.counts["misses"]
+        return {
+            **self.counts,
+            "hit_ratio": round(self.counts["hits"] / lookups, 4) if lookups else None,
+            "entries": entries,
+            "bytes": nbytes,
+            "hit_age_sec": _age_histogram(self.hit_age),
+        }
+
+    def emf_record(self, timestamp_ms: int) -> Optional[dict]:
+        """EMF document for the deltas since the last call; None when idle."""
+        delta = {k: self.counts[k] - self._emitted[k] for k in COUNTERS}
+        age_delta = [a - b for a, b in zip(self.hit_age, self._emitted_age)]
+        entries, nbytes = self.size()
+        if not any(delta.values()) and not entries:
+            return None
+        self._emitted = dict(self.counts)
+        self._emitted_age = list(self.hit_age)
+
+        metrics = [{"Name": _metric_name(k), "Unit": "Count"} for k in COUNTERS]
+        metrics += [{"Name": "Entries", "Unit": "Count"}, {"Name": "Bytes", "Unit": "Bytes"}]
+        doc = {_metric_name(k): v for k, v in delta.items()}
+        doc.update(Entries=entries, Bytes=nbytes, Cache=self.name)
+        values, counts = _histogram_values(age_delta)
+        if values:
+            metrics.append({"Name": "HitAge", "Unit": "Seconds"})
+            doc["HitAge"] = {"Values": values, "Counts": counts}
+        doc["_aws"] = {
+            "Timestamp": timestamp_ms,
+            "CloudWatchMetrics": [
+                {"Namespace": EMF_NAMESPACE, "Dimensions": [["Cache"]], "Metrics": metrics}
+            ],
+        }
+        return doc
+
+
+_registry: Dict[str, CacheMetrics] = {}
+_last_emit = time.monotonic()
+
+
+def register(name: str, size_fn: Optional[SizeFn] = None) -> CacheMetrics:
+    """Get-or-create; a re-registration (module reload) keeps the counters."""
+    m = _registry.get(name)
+    if m is None:
+        m = _registry[name] = CacheMetrics(name, size_fn)
+    elif size_fn is not None:
+        m.size_fn = size_fn
+    return m
+
+
+def snapshot() -> Dict[str, dict]:
+    return {name: m.snapshot() for name, m in sorted(_registry.items())}
+
+
+def emit_emf(out=None) -> int:
+    """Print one EMF line per non-idle cache. Returns how many were written."""
+    global _last_emit
+    _last_emit = time.monotonic()
+    stream = out or sys.stdout
+    ts = int(time.time() * 1000)
+    n = 0
+    for m in _registry.values():
+        doc = m.emf_record(ts)
+        if doc is not None:
+            stream.write(json.dumps(doc, separators=(",", ":")) + "\n")
+            n += 1
+    stream.flush()
+    return n
+
+
+def emit_emf_if_due(interval_sec: float) -> int:
+    if time.monotonic() - _last_emit < interval_sec:
+        return 0
+    return emit_emf()
+
+
+def _metric_name(counter: str) -> str:
+    return "".join(part.capitalize() for part in counter.split("_"))
+
+
+def _age_histogram(buckets: List[int]) -> Dict[str, int]:
+    labels = [f"le_{b:g}" for b in AGE_BUCKETS_SEC] + ["inf"]
+    return dict(zip(labels, buckets))
+
+
+def _histogram_values(buckets: List[int]) -> Tuple[List[float], List[int]]:
+    # EMF Values/Counts: each bucket is reported at its upper bound (the open
+    # bucket at twice the last bound).
+    bounds = list(AGE_BUCKETS_SEC) + [AGE_BUCKETS_SEC[-1] * 2]
+    pairs = [(float(b), c) for b, c in zip(bounds, buckets) if c]
+    return [p[0] for p in pairs], [p[1] for p in pairs]
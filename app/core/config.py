@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,6 +16,34 @@ class Settings(BaseSettings):
 
     # DB
     DATABASE_URL: str = ""
+    # Optional read replica (Neon read replica endpoint). When set, catalog GET
+    # routes and the /candidates existence check read from it; writes and the
+    # by-spotify miss / long-poll paths use the primary (app/core/db.py).
+    DATABASE_REPLICA_URL: str = ""
+    # Connection strategy (app/core/db.py): "queue" = QueuePool + pre-ping per
+    # checkout (original behaviour); "null" = NullPool, for Neon's -pooler
+    # (pgbouncer) endpoint; "single" = one long-lived connection per container,
+    # probed only after it sat idle > DB_THAW_PING_AFTER_SEC (container thaw).
+    DB_POOL_STRATEGY: Literal["queue", "null", "single"] = "queue"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_THAW_PING_AFTER_SEC: float = 30.0
+    DB_CONNECT_TIMEOUT_SEC: int = 10
+    # TCP keepalive (queue / single) — detect a socket dropped while frozen.
+    DB_KEEPALIVES_IDLE_SEC: int = 30
+    DB_KEEPALIVES_INTERVAL_SEC: int = 10
+    DB_KEEPALIVES_COUNT: int = 3
+    # Print one EMF line per invocation with connect / ping / query time split.
+    DB_TIMINGS_EMF: bool = False
+    # Per-request budget for catalog reads (app/core/deadline.py), well under the
+    # API Gateway 29s cap; by-spotify `?wait=N` adds N on top. Each read
+    # transaction gets `statement_timeout` = remaining budget (never below the
+    # floor) and is read-only. 0 disables the deadline (read-only still applies).
+    REQUEST_DEADLINE_SEC: float = 8.0
+    STATEMENT_TIMEOUT_FLOOR_MS: int = 100
+    # /search/unified drops decomposition / expansion (and marks the result
+    # `partial`) when less than this much budget is left before the phase.
+    SEARCH_OPTIONAL_PHASE_MIN_SEC: float = 2.0
 
     # Search (FEAT-music-search-recall Step 4 / A1). When true, the unified
     # search matcher adds a pg_trgm `similarity()` fuzzy fallback to the WHERE
@@ -27,6 +56,112 @@ class Settings(BaseSettings):
     # At/below the default 0.3 pg_trgm threshold on purpose — '방탄'↔'방탄소년단' =
     # 0.286 (RFC Step 3 caveat). Tuned against the recall gate.
     SEARCH_TRGM_THRESHOLD: float = 0.3
+    # Full-text matcher (db/migrations/008_search_documents.sql). When true,
+    # multi-word queries are matched with one ranked tsvector query per bucket
+    # over the trigger-maintained search_documents instead of the per-split
+    # decomposition queries. Default false until the migration is applied.
+    SEARCH_FTS_ENABLED: bool = False
+    # Unified-search rank blend (app/core/ranking.py): relevance-ladder weight
+    # and popularity (0-100 → [0,1]) weight. Used by the repos' SQL ORDER BY,
+    # the service's phase-4 ranking and the explain `score` alike. Keep the
+    # relevance weight's ladder gaps above the popularity weight if an exact
+    # title must never lose to a popular contains match.
+    SEARCH_RANK_RELEVANCE_WEIGHT: float = 0.7
+    SEARCH_RANK_POPULARITY_WEIGHT: float = 0.3
+    # Per-container byte budget for the unified-search result cache
+    # (app/core/result_cache.py). Entries are compressed JSON, typically a few KB
+    # per full page, so the default holds thousands of results in ~16 MiB.
+    SEARCH_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Offline search index (app/core/search_index.py), built by
+    # scripts/build_search_index.py and shipped in the bundle or /tmp. When set,
+    # unified search answers its literal / decomposition / expansion phases from
+    # the mmap'd file and reads Postgres only on misses and for the final
+    # hydrate. An index older than SEARCH_INDEX_MAX_AGE_SEC is ignored, which
+    # bounds how long rows absorbed after the build can be missed.
+    SEARCH_INDEX_PATH: str = ""
+    SEARCH_INDEX_MAX_AGE_SEC: int = 24 * 60 * 60
+    # Search-as-you-type refinement (app/core/refine_cache.py): for requests
+    # carrying an X-Search-Session header, the literal phase fetches up to
+    # SEARCH_REFINE_SUPERSET_ROWS matches per bucket and keeps them, so a
+    # following keystroke that extends the query is filtered and re-ranked in
+    # memory. SEARCH_REFINE_MAX_ENTRIES bounds the kept (session, bucket) sets
+    # per container; 0 disables.
+    SEARCH_REFINE_MAX_ENTRIES: int = 384
+    SEARCH_REFINE_SUPERSET_ROWS: int = 200
+    # POST /search/unified:batch: most queries one request may carry. The batch
+    # shares one session, the result cache and per-batch repository memos, and
+    # runs each bucket's literal phase for all its queries as one statement.
+    SEARCH_BATCH_MAX_QUERIES: int = 50
+
+    # Absorb tracking (db/migrations/002_absorb_requests.sql). When true,
+    # /candidates records every enqueued spotify id in `absorb_requests`, skips
+    # ids already in flight, and the by-spotify lookups answer a short-cached
+    # 202 "pending" shape with an ETA instead of a 404. Default false so the code
+    # can deploy before the migration is applied (same rollout as pg_trgm).
+    ABSORB_TRACKING_ENABLED: bool = False
+    # Typical enqueue → row-written latency; the pending ETA counts down from it.
+    ABSORB_ETA_SEC: int = 30
+    # A pending request older than this is presumed lost (DLQ'd / worker crash):
+    # it no longer blocks re-enqueue and by-spotify falls back to a plain 404.
+    ABSORB_INFLIGHT_TTL_SEC: int = 600
+
+    # Cold-start priming (app/services/warmup_service.py). Lambda init-phase CPU
+    # is free and unthrottled, so when true the container compiles every
+    # repository statement into SQLAlchemy's compiled cache, builds the response
+    # serializers and opens one warm pooled connection before the first invoke.
+    PRIME_ON_INIT: bool = False
+    # Optional comma-separated, most-popular-first queries to precompute into the
+    # unified-search cache at init (front default args). Only the first
+    # PRIME_TOP_N are used, and preloading stops once PRIME_BUDGET_SEC of the
+    # init phase (hard-capped at 10s by Lambda) has been spent.
+    PRIME_QUERIES: str = ""
+    PRIME_TOP_N: int = 20
+    PRIME_BUDGET_SEC: float = 4.0
+    # Warm-ping fast path (app/main.py handler). A scheduled keep-warm event
+    # never reaches FastAPI: it pings the pooled connection and recomputes at
+    # most WARM_REFRESH_MAX unified-search cache entries that would expire within
+    # WARM_REFRESH_WITHIN_SEC, so the container stays warm *and* hot.
+    WARM_REFRESH_WITHIN_SEC: int = 30
+    WARM_REFRESH_MAX: int = 20
+
+    # Query-frequency telemetry (db/migrations/003_search_query_stats.sql). When
+    # true, /search/unified counts canonical queries in a bounded per-container
+    # heavy-hitters sketch (QUERY_STATS_CAPACITY counters), flushes the counts to
+    # `search_query_stats` every QUERY_STATS_FLUSH_SEC, and cold-start priming /
+    # the warm ping precompute the top PRIME_TOP_N queries seen within
+    # QUERY_STATS_WINDOW_DAYS. Default false until the migration is applied.
+    QUERY_STATS_ENABLED: bool = False
+    QUERY_STATS_CAPACITY: int = 512
+    QUERY_STATS_FLUSH_SEC: int = 300
+    QUERY_STATS_WINDOW_DAYS: int = 7
+
+    # Denormalized artist counters (db/migrations/004_artist_stats.sql). When
+    # true, the artist hero reads album_count / track_count from the
+    # trigger-maintained `artist_stats` row in the same primary-key fetch as the
+    # artist, instead of two COUNT(*)s over the join tables. Default false until
+    # the migration is applied; reconcile drift with scripts/reconcile_artist_stats.py.
+    ARTIST_STATS_ENABLED: bool = False
+    # Artist top-tracks from the `artist_top_tracks` materialized view
+    # (db/migrations/005_artist_top_tracks.sql; refresh with
+    # scripts/refresh_artist_top_tracks.py at least every DETAIL max-age). A view
+    # older than that, or without rows for the artist, falls back to the live
+    # query. Default false until the migration is applied.
+    TOP_TRACKS_MATVIEW_ENABLED: bool = False
+
+    # Denormalized primary artist (db/migrations/006_primary_artist_columns.sql).
+    # When true, album / track read projections select the trigger-maintained
+    # primary_artist_* columns: unified search drops its get_primary_artist_map
+    # query and TrackItemMapper its per-row popularity sort. Default false until
+    # the migration is applied.
+    PRIMARY_ARTIST_COLUMNS_ENABLED: bool = False
+
+    # Cache observability (app/core/cache_metrics.py). Per-cache counters are
+    # printed as CloudWatch EMF lines at most every CACHE_METRICS_EMIT_SEC (and
+    # on every warm ping); 0 disables the per-invoke emit.
+    CACHE_METRICS_EMIT_SEC: int = 60
+    # Non-public /api/music/_debug/* routes (excluded from the OpenAPI schema,
+    # Cognito-guarded outside local/dev). 404 unless true.
+    DEBUG_ENDPOINTS_ENABLED: bool = False
 
     # Spotify
     SPOTIFY_CLIENT_ID: str = ""
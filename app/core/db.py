@@ -1,14 +1,296 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+"""Engine / session factory, tuned per DB_POOL_STRATEGY for Lambda + Neon.
+
+- ``queue`` (default): QueuePool with `pool_pre_ping` — one ping round trip per
+  checkout. Safe anywhere; the original behaviour.
+- ``null``: NullPool, meant for Neon's pgbouncer (``-pooler``) endpoint — the
+  connection pooling happens server-side, so each session opens a cheap
+  pooler connection and closes it. psycopg's automatic server-side prepared
+  statements are disabled (they don't survive transaction pooling).
+- ``single``: one long-lived connection per container (a container serves one
+  event at a time). No per-checkout ping; instead the connection is probed
+  only when it has sat idle longer than DB_THAW_PING_AFTER_SEC — i.e. after the
+  container was frozen between invokes, which is when Neon / NAT may have
+  dropped it. A failed probe is reported as a disconnect, so the pool
+  transparently reconnects.
+
+TCP keepalives (queue / single) let the kernel notice a half-dead socket on
+thaw instead of hanging on it. `db_timings` splits DB latency into connect,
+ping and query time per invocation (see app/main.py).
+
+Catalog-read routes use `get_read_db`: the session carries a per-request
+`Deadline` and every transaction it begins is `transaction_read_only` with a
+`statement_timeout` of the remaining budget (app/core/deadline.py).
+
+Read replica (DATABASE_REPLICA_URL, e.g. a Neon read replica): sessions are
+`RoutingSession`s. A read-only session's statements go to the replica; flushes
+and every other session stay on the primary. Replica lag is handled by the
+callers that care: a by-spotify miss (the row may just not have replicated
+yet) retries on the primary via `fallback_to_primary`, and the `?wait=N` poll
+probes the primary, where the worker writes.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
 from app.core.config import settings
+from app.core.deadline import Deadline, DeadlineExceeded
+
+EMF_NAMESPACE = "MusicCatalog/DB"
+
+
+class DbTimings:
+    """Per-invocation DB latency split. Reset by the Lambda handler."""
+
+    __slots__ = ("connects", "connect_ms", "pings", "ping_ms", "queries", "query_ms")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.connects = self.pings = self.queries = 0
+        self.connect_ms = self.ping_ms = self.query_ms = 0.0
+
+    def snapshot(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def emit_emf(self, out=None) -> bool:
+        """One EMF line for this invocation; nothing when no DB work happened."""
+        if not (self.connects or self.pings or self.queries):
+            return False
+        doc = {
+            "Strategy": settings.DB_POOL_STRATEGY,
+            "Connects": self.connects,
+            "ConnectMs": round(self.connect_ms, 2),
+            "Pings": self.pings,
+            "PingMs": round(self.ping_ms, 2),
+            "Queries": self.queries,
+            "QueryMs": round(self.query_ms, 2),
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": EMF_NAMESPACE,
+                    "Dimensions": [["Strategy"]],
+                    "Metrics": [
+                        {"Name": "Connects", "Unit": "Count"},
+                        {"Name": "ConnectMs", "Unit": "Milliseconds"},
+                        {"Name": "Pings", "Unit": "Count"},
+                        {"Name": "PingMs", "Unit": "Milliseconds"},
+                        {"Name": "Queries", "Unit": "Count"},
+                        {"Name": "QueryMs", "Unit": "Milliseconds"},
+                    ],
+                }],
+            },
+        }
+        stream = out or sys.stdout
+        stream.write(json.dumps(doc, separators=(",", ":")) + "\n")
+        stream.flush()
+        return True
+
+
+db_timings = DbTimings()
+
+
+def _connect_args(strategy: str) -> dict:
+    args: dict = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SEC}
+    if strategy == "null":
+        args["prepare_threshold"] = None
+    else:
+        args.update(
+            keepalives=1,
+            keepalives_idle=settings.DB_KEEPALIVES_IDLE_SEC,
+            keepalives_interval=settings.DB_KEEPALIVES_INTERVAL_SEC,
+            keepalives_count=settings.DB_KEEPALIVES_COUNT,
+        )
+    return args
+
+
+def build_engine(url: str, strategy: str) -> Engine:
+    connect_args = _connect_args(strategy)
+    if strategy == "null":
+        eng = create_engine(url, poolclass=NullPool, connect_args=connect_args, future=True)
+    elif strategy == "single":
+        eng = create_engine(
+            url,
+            pool_size=1,
+            # Overflow only covers a rare second session in the same invoke
+            # (e.g. a telemetry flush); those connections close on checkin.
+            max_overflow=2,
+            pool_pre_ping=False,
+            connect_args=connect_args,
+            future=True,
+        )
+        _install_thaw_probe(eng)
+    else:
+        eng = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            connect_args=connect_args,
+            future=True,
+        )
+    _install_timing(eng)
+    return eng
+
+
+def _install_thaw_probe(eng: Engine) -> None:
+    @event.listens_for(eng, "checkin")
+    def _mark_idle(dbapi_conn, record):
+        record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(eng, "checkout")
+    def _probe_after_thaw(dbapi_conn, record, proxy):
+        idle_since = record.info.pop("idle_since", None)
+        if idle_since is None or time.monotonic() - idle_since < settings.DB_THAW_PING_AFTER_SEC:
+            return
+        t0 = time.perf_counter()
+        try:
+            cur = dbapi_conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+            finally:
+                cur.close()
+            dbapi_conn.rollback()
+        except Exception as e:
+            # The pool discards this connection and retries the checkout.
+            raise exc.DisconnectionError(f"stale connection after thaw: {e}") from e
+        finally:
+            db_timings.pings += 1
+            db_timings.ping_ms += (time.perf_counter() - t0) * 1000
+
+
+def _install_timing(eng: Engine) -> None:
+    @event.listens_for(eng, "do_connect")
+    def _connect_started(dialect, conn_rec, cargs, cparams):
+        conn_rec.info["connect_t0"] = time.perf_counter()
+
+    @event.listens_for(eng, "connect")
+    def _connected(dbapi_conn, conn_rec):
+        t0 = conn_rec.info.pop("connect_t0", None)
+        if t0 is not None:
+            db_timings.connects += 1
+            db_timings.connect_ms += (time.perf_counter() - t0) * 1000
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
+    @event.listens_for(eng, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_t0", []).append(time.perf_counter())
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def _query_done(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("query_t0")
+        if stack:
+            db_timings.queries += 1
+            db_timings.query_ms += (time.perf_counter() - stack.pop()) * 1000
+
+    @event.listens_for(eng, "handle_error")
+    def _query_failed(ctx):
+        stack = ctx.connection.info.get("query_t0") if ctx.connection is not None else None
+        if stack:
+            stack.pop()
+
+
+engine = build_engine(settings.DATABASE_URL, settings.DB_POOL_STRATEGY)
+replica_engine: Optional[Engine] = (
+    build_engine(settings.DATABASE_REPLICA_URL, settings.DB_POOL_STRATEGY)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+ROUTE_PRIMARY = "primary"
+ROUTE_REPLICA = "replica"
+
+
+class RoutingSession(Session):
+    def __init__(self, *args, replica: Optional[Engine] = None, **kw):
+        super().__init__(*args, **kw)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica is not None and not self._flushing and _routes_to_replica(self):
+            return self.replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def _routes_to_replica(db: RoutingSession) -> bool:
+    route = db.info.get("route")
+    if route is not None:
+        return route == ROUTE_REPLICA
+    return bool(db.info.get("read_only"))
+
+
+def reads_from_replica(db) -> bool:
+    return isinstance(db, RoutingSession) and db.replica is not None and _routes_to_replica(db)
+
+
+def fallback_to_primary(db) -> bool:
+    """Send the rest of this session's reads to the primary. False when there is
+    nothing to fall back from (no replica, or already on the primary), so
+    callers only retry when the retry can see something new."""
+    if not reads_from_replica(db):
+        return False
+    db.info["route"] = ROUTE_PRIMARY
+    return True
+
+
+@contextmanager
+def replica_reads(db) -> Iterator[None]:
+    """Route a block of reads on a read-write session to the replica (staleness
+    is harmless for the caller, e.g. an existence pre-check)."""
+    if not isinstance(db, RoutingSession) or db.replica is None:
+        yield
+        return
+    prev = db.info.get("route")
+    db.info["route"] = ROUTE_REPLICA
+    try:
+        yield
+    finally:
+        if prev is None:
+            db.info.pop("route", None)
+        else:
+            db.info["route"] = prev
+
+
+SessionLocal = sessionmaker(
+    bind=engine,
+    class_=RoutingSession,
+    replica=replica_engine,
+    autoflush=False,
+    autocommit=False,
     future=True,
 )
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+_SET_READ_ONLY = text("SELECT set_config('transaction_read_only', 'on', true)")
+_SET_DEADLINE = text(
+    "SELECT set_config('statement_timeout', :ms, true),"
+    " set_config('transaction_read_only', 'on', true)"
+)
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_read_session_limits(session, transaction, connection):
+    # One round trip per transaction; SET LOCAL semantics (is_local=true) so
+    # nothing leaks to the next checkout of a pooled connection.
+    if not session.info.get("read_only"):
+        return
+    deadline = session.info.get("deadline")
+    if deadline is None:
+        connection.execute(_SET_READ_ONLY)
+        return
+    if deadline.expired():
+        raise DeadlineExceeded("request deadline exceeded")
+    ms = max(int(deadline.remaining() * 1000), settings.STATEMENT_TIMEOUT_FLOOR_MS)
+    connection.execute(_SET_DEADLINE, {"ms": str(ms)})
+
 
 def get_db():
     db = SessionLocal()
@@ -16,3 +298,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(db: Session = Depends(get_db)) -> Session:
+    """get_db for catalog reads: read-only transactions + REQUEST_DEADLINE_SEC."""
+    db.info["read_only"] = True
+    if settings.REQUEST_DEADLINE_SEC > 0:
+        db.info["deadline"] = Deadline(settings.REQUEST_DEADLINE_SEC)
+    return db
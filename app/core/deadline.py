@@ -0,0 +1,49 @@
+"""Per-request time budget, carried on the DB session (`session.info["deadline"]`).
+
+The router's read dependency (`app.core.db.get_read_db`) starts the clock. The
+session's `after_begin` hook turns the remaining budget into
+`SET LOCAL statement_timeout` for every transaction, so repository queries are
+bounded without any repository code knowing about it, and services consult
+`session_deadline(db)` to drop optional work when the budget runs low.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The request budget ran out before the next DB transaction (→ 503)."""
+
+
+class Deadline:
+    __slots__ = ("_expires_at", "_clock")
+
+    def __init__(self, budget_sec: float, *, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._expires_at = clock() + budget_sec
+
+    def remaining(self) -> float:
+        return max(self._expires_at - self._clock(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def has(self, sec: float) -> bool:
+        return self.remaining() >= sec
+
+    def extend(self, sec: float) -> None:
+        self._expires_at += sec
+
+
+def session_deadline(db: Any) -> Optional[Deadline]:
+    info = getattr(db, "info", None)
+    d = info.get("deadline") if isinstance(info, dict) else None
+    return d if isinstance(d, Deadline) else None
+
+
+def extend_deadline(db: Any, sec: float) -> None:
+    """Long-poll routes add the client's `?wait=N` on top of the base budget."""
+    d = session_deadline(db)
+    if d is not None:
+        d.extend(sec)
@@ -0,0 +1,53 @@
+"""Server-side long-poll helper for the `/by-spotify/{id}` absorb-completion path.
+
+The writer used to poll `/albums/by-spotify/{id}` / `/artists/by-spotify/{id}`
+blindly until the 404 flipped to 200 while the worker absorbed the row. With
+`?wait=N` the request instead holds here, re-running a cheap indexed existence
+probe with exponential backoff until the row appears or N seconds pass — one
+request per sync instead of dozens.
+
+Why a probe loop and not Postgres LISTEN/NOTIFY: the worker lives in another
+repo and Neon's pooled (pgbouncer, transaction-mode) endpoint does not deliver
+notifications to a LISTENing session. A unique-index `spotify_id` lookup is a
+sub-millisecond round trip, so backoff polling is the cheap, portable choice.
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+# API Gateway hard-caps an integration at 29s; leave headroom for the final
+# read + serialization after the wait ends.
+LONGPOLL_MAX_WAIT_SEC = 20
+
+# Backoff schedule: 0.25s → 0.5s → 1s → 2s → 2s … (capped).
+_INITIAL_INTERVAL_SEC = 0.25
+_BACKOFF_FACTOR = 2.0
+_MAX_INTERVAL_SEC = 2.0
+
+
+def wait_for(
+    probe: Callable[[], bool],
+    timeout: float,
+    *,
+    sleep: Callable[[float], None] | None = None,
+    clock: Callable[[], float] | None = None,
+) -> bool:
+    """Call ``probe`` until it returns True or ``timeout`` seconds elapse.
+
+    Probes once immediately, then backs off exponentially (capped) between
+    attempts; the last sleep is clipped so we never overshoot the deadline.
+    Returns the final probe result. ``timeout <= 0`` degrades to a single probe.
+    """
+    sleep = sleep or time.sleep
+    clock = clock or time.monotonic
+    deadline = clock() + max(timeout, 0)
+    interval = _INITIAL_INTERVAL_SEC
+    while True:
+        if probe():
+            return True
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return False
+        sleep(min(interval, remaining))
+        interval = min(interval * _BACKOFF_FACTOR, _MAX_INTERVAL_SEC)
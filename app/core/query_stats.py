@@ -0,0 +1,80 @@
+"""Per-container heavy-hitters sketch of /search/unified queries.
+
+Space-Saving (Metwally et al.): at most `capacity` counters; an unseen query
+evicts the current minimum and inherits its count as an error bound. Any query
+with true frequency above N/capacity is guaranteed to be tracked, which is all
+the pre-warmer needs — traffic is dominated by a few hundred artist names.
+
+Counts are per flush interval: `drain()` hands them off (as guaranteed counts,
+count - error) and resets, and the caller adds them to `search_query_stats`.
+No lock — a Lambda container handles one event at a time.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Tuple
+
+
+def canonical_query(q: str) -> str:
+    """Trim, collapse inner whitespace, casefold. Matching is case-insensitive
+    (ILIKE / lowercased similarity), so these variants are one query."""
+    return " ".join((q or "").split()).casefold()
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int):
+        self.capacity = max(capacity, 1)
+        # q -> [count, error]
+        self._counters: Dict[str, List[int]] = {}
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.total += n
+        c = self._counters.get(key)
+        if c is not None:
+            c[0] += n
+            return
+        if len(self._counters) < self.capacity:
+            self._counters[key] = [n, 0]
+            return
+        victim = min(self._counters, key=lambda k: self._counters[k][0])
+        floor = self._counters.pop(victim)[0]
+        self._counters[key] = [floor + n, floor]
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """Highest estimated counts first (estimate = upper bound)."""
+        ranked = sorted(self._counters.items(), key=lambda kv: kv[1][0], reverse=True)
+        return [(k, c[0]) for k, c in ranked[: max(n, 0)]]
+
+    def drain(self) -> Dict[str, int]:
+        """Guaranteed (count - error) per tracked key, then reset."""
+        out = {k: c[0] - c[1] for k, c in self._counters.items() if c[0] - c[1] > 0}
+        self._counters.clear()
+        self.total = 0
+        return out
+
+
+class QueryStats:
+    """Sketch + flush clock. `record()` is on the request path, so it only
+    touches memory; flushing is the caller's job once `flush_due()`."""
+
+    def __init__(self, capacity: int, flush_interval_sec: float, *, clock=None):
+        self.sketch = SpaceSaving(capacity)
+        self.flush_interval_sec = flush_interval_sec
+        self._clock = clock or time.monotonic
+        self._last_flush = self._clock()
+
+    def record(self, q: str) -> None:
+        key = canonical_query(q)
+        if key:
+            self.sketch.add(key)
+
+    def flush_due(self) -> bool:
+        return len(self.sketch) > 0 and self._clock() - self._last_flush >= self.flush_interval_sec
+
+    def drain(self) -> Dict[str, int]:
+        self._last_flush = self._clock()
+        return self.sketch.drain()
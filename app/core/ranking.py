@@ -0,0 +1,135 @@
+"""Unified-search relevance: the literal-similarity ladder and the
+relevance/popularity blend, in Python and as a SQL expression.
+
+The repositories' stage-one queries ORDER BY `sql_blend(...)` so LIMIT/OFFSET
+cut the same slice `SearchService`'s phase-4 ranking would keep; the service
+and the offline index (app/core/search_index.py) rank with a `Ranker`. Both
+read the same ladder and the same SEARCH_RANK_*_WEIGHT settings, and explain
+reports the score the Ranker computed.
+
+`Ranker` case-folds the query once and precomputes the weighted ladder, so a
+row costs one lower() and one score; `RankColumns` holds a bucket's sort keys
+column-wise (typed arrays, filled in one pass) and selects the top k with a
+heap instead of sorting every candidate.
+"""
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import case, func
+
+from app.core.config import settings
+
+# similarity bucket → relevance. 3 = exact (case-insensitive), 2 = startswith,
+# 1 = contains; anything else (fuzzy / alias-only / expansion) is REL_FLOOR.
+REL_LADDER = {3: 1.0, 2: 0.6, 1: 0.35}
+REL_FLOOR = 0.1
+
+# RankColumns.sim for rows that are not text-ranked (expansion): scored as 0,
+# reported by explain as no similarity.
+NO_SIM = -1
+
+
+class Weights(NamedTuple):
+    relevance: float
+    popularity: float
+
+
+def current_weights() -> Weights:
+    return Weights(settings.SEARCH_RANK_RELEVANCE_WEIGHT, settings.SEARCH_RANK_POPULARITY_WEIGHT)
+
+
+class Ranker:
+    """One query's ranking context.
+
+    Score (higher first): relevance-dominant, popularity lifts near-ties.
+    Spotify popularity is already 0-100, so pop/100 is the [0,1] norm. Within
+    a path tier a very popular weaker match can edge out an obscure stronger
+    one, while a strong relevance signal still leads — with the default
+    0.7/0.3 weights an exact match never loses to a contains match (the
+    relevance gap exceeds the max popularity swing).
+    """
+
+    __slots__ = ("qq", "weights", "_rel")
+
+    def __init__(self, q: str, weights: Optional[Weights] = None):
+        self.qq = q.lower()
+        self.weights = weights or current_weights()
+        w = self.weights.relevance
+        self._rel = (w * REL_FLOOR, w * REL_LADDER[1], w * REL_LADDER[2], w * REL_LADDER[3])
+
+    def similarity(self, text: Optional[str]) -> int:
+        """Literal-similarity bucket: 3 exact, 2 startswith, 1 contains, 0 none."""
+        if not text:
+            return 0
+        n = text.lower()
+        if n == self.qq:
+            return 3
+        if n.startswith(self.qq):
+            return 2
+        if self.qq in n:
+            return 1
+        return 0
+
+    def score(self, sim: int, popularity: Optional[int]) -> float:
+        pop = popularity or 0
+        if pop < 0:
+            pop = 0
+        elif pop > 100:
+            pop = 100
+        return self._rel[sim if sim > 0 else 0] + self.weights.popularity * pop / 100.0
+
+
+class RankColumns:
+    """One bucket's sort keys, column-wise. Rows rank by tier ascending, score
+    descending, tiebreak ascending, then input order (heapq.nsmallest with a
+    key is stable)."""
+
+    __slots__ = ("tier", "sim", "score", "tiebreak")
+
+    def __init__(self) -> None:
+        self.tier = array("b")
+        self.sim = array("b")
+        self.score = array("d")
+        self.tiebreak = array("q")
+
+    def __len__(self) -> int:
+        return len(self.tier)
+
+    def append(self, tier: int, sim: int, score: float, tiebreak: int = 0) -> None:
+        self.tier.append(tier)
+        self.sim.append(sim)
+        self.score.append(score)
+        self.tiebreak.append(tiebreak)
+
+    def top_k(self, k: int) -> List[int]:
+        """Indices of the best `k` rows, best first."""
+        tier, score, tiebreak = self.tier, self.score, self.tiebreak
+
+        def key(i: int) -> tuple:
+            return (tier[i], -score[i], tiebreak[i])
+
+        n = len(tier)
+        if k >= n:
+            return sorted(range(n), key=key)
+        return heapq.nsmallest(k, range(n), key=key)
+
+
+def sql_blend(text_col, q, popularity_col):
+    """`Ranker(q).score(similarity(text_col), popularity_col)` as a SQL
+    expression, for `ORDER BY ... DESC`. Evaluated only over the rows the
+    WHERE admitted. `q` is a string, or a SQL expression (batched stage one,
+    app/repositories/literal_batch.py)."""
+    w = current_weights()
+    n = func.lower(text_col)
+    qq = q.lower() if isinstance(q, str) else func.lower(q)
+    rel = case(
+        (n == qq, REL_LADDER[3]),
+        (func.starts_with(n, qq), REL_LADDER[2]),
+        (func.strpos(n, qq) > 0, REL_LADDER[1]),
+        else_=REL_FLOOR,
+    )
+    pop = func.least(func.greatest(func.coalesce(popularity_col, 0), 0), 100)
+    return w.relevance * rel + w.popularity * pop / 100.0
@@ -0,0 +1,81 @@
+"""Per-session candidate supersets for search-as-you-type refinement.
+
+While a user types "radi" → "radio" → "radiohead", each keystroke is a new
+unified-search cache key. But a substring match for "radiohead" is also a
+substring match for "radi", so when the previous keystroke's literal phase
+fetched *every* match (not cut by the cap), the next one is answered by
+filtering and re-ranking those rows in memory (SearchService._refined_literal).
+
+Keyed by (session, bucket); a session is the client's X-Search-Session
+header. Only complete match sets are stored. Entry-count bounded (rows are
+capped at SEARCH_REFINE_SUPERSET_ROWS per bucket), TTL + LRU like the result
+cache; no lock — a Lambda container handles one event at a time.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple, Optional
+
+from app.core.cache_metrics import CacheMetrics
+
+
+class Superset(NamedTuple):
+    q: str  # case-folded query the rows match
+    rows: tuple  # every literal match of `q`, best first
+    stored_at: float
+
+
+class RefineCache:
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.timer = timer
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.size_fn = lambda: (len(self._data), 0)
+        self._data: "OrderedDict[Hashable, Superset]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Superset]:
+        e = self._data.get(key)
+        now = self.timer()
+        if e is not None and now - e.stored_at >= self.ttl:
+            del self._data[key]
+            self._count("expired")
+            e = None
+        if e is None:
+            self._count("miss")
+            return None
+        self._data.move_to_end(key)
+        if self.metrics is not None:
+            self.metrics.hit(now - e.stored_at)
+        return e
+
+    def set(self, key: Hashable, q: str, rows: list) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data.pop(key, None)
+        while len(self._data) >= self.max_entries:
+            self._data.popitem(last=False)  # least recently used
+            self._count("evicted")
+        self._data[key] = Superset(q, tuple(rows), self.timer())
+
+    def discard(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            getattr(self.metrics, event)()
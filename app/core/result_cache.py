@@ -0,0 +1,143 @@
+"""Byte-budgeted TTL + LRU cache for Pydantic response models.
+
+An entry-count bound (the old `TTLCache(maxsize=256)`) says nothing about
+memory: a 300-item `UnifiedSearchResult` with `debug` rows and an empty one
+cost the same slot. Here every entry is stored as zlib-compressed
+`model_dump_json()` bytes and charged `len(blob) + ENTRY_OVERHEAD` against
+`max_bytes`, so the container's cache footprint is bounded by configuration
+and the Lambda memory setting can be sized against it.
+
+Trade-off: a hit pays decompress + `model_validate_json` (~sub-ms for a full
+page) and returns a fresh object each time, instead of sharing one instance.
+
+No lock — a Lambda container handles one event at a time.
+"""
+from __future__ import annotations
+
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, List, NamedTuple, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.cache_metrics import CacheMetrics
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class _Entry(NamedTuple):
+    stored_at: float
+    size: int
+    blob: bytes
+
+
+class ByteBudgetCache(Generic[M]):
+    # Rough per-entry bookkeeping cost (key tuple, OrderedDict node, _Entry,
+    # bytes header) so many tiny entries can't exceed the budget unnoticed.
+    ENTRY_OVERHEAD = 256
+
+    def __init__(
+        self,
+        model: Type[M],
+        *,
+        max_bytes: int,
+        ttl: float,
+        max_entry_bytes: Optional[int] = None,
+        level: int = 1,
+        timer: Callable[[], float] = time.monotonic,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        self.model = model
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # One oversized result must not flush the whole cache to make room.
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self.level = level
+        self.timer = timer
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.size_fn = lambda: (len(self._data), self.currsize)
+        self.currsize = 0
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        e = self._data.get(key)
+        return e is not None and not self._expired(e)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._data))
+
+    def get(self, key: Hashable) -> Optional[M]:
+        e = self._data.get(key)
+        now = self.timer()
+        if e is None or self._expired(e, now):
+            if e is not None:
+                self._drop(key)
+                self._count("expired")
+            self._count("miss")
+            return None
+        self._data.move_to_end(key)
+        if self.metrics is not None:
+            self.metrics.hit(now - e.stored_at)
+        return self.model.model_validate_json(zlib.decompress(e.blob))
+
+    def set(self, key: Hashable, value: M) -> bool:
+        """Store ``value``; returns False when it exceeds max_entry_bytes (not cached)."""
+        blob = zlib.compress(value.model_dump_json().encode(), self.level)
+        size = len(blob) + self.ENTRY_OVERHEAD
+        if key in self._data:
+            self._drop(key)
+        if size > self.max_entry_bytes:
+            self._count("rejected")
+            return False
+        self.expire()
+        while self._data and self.currsize + size > self.max_bytes:
+            self._drop(next(iter(self._data)))  # least recently used
+            self._count("evicted")
+        self._data[key] = _Entry(self.timer(), size, blob)
+        self.currsize += size
+        return True
+
+    def size_of(self, key: Hashable) -> int:
+        e = self._data.get(key)
+        return e.size if e is not None else 0
+
+    def stored_at(self, key: Hashable) -> Optional[float]:
+        e = self._data.get(key)
+        return e.stored_at if e is not None else None
+
+    def expiring(self, within_sec: float) -> List[Hashable]:
+        """Live keys that expire within ``within_sec``, oldest first."""
+        now = self.timer()
+        due = [
+            (e.stored_at, k)
+            for k, e in self._data.items()
+            if not self._expired(e, now) and now - e.stored_at >= self.ttl - within_sec
+        ]
+        due.sort(key=lambda d: d[0])
+        return [k for _, k in due]
+
+    def expire(self) -> None:
+        now = self.timer()
+        for k in [k for k, e in self._data.items() if self._expired(e, now)]:
+            self._drop(k)
+            self._count("expired")
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.currsize = 0
+
+    def _expired(self, e: _Entry, now: Optional[float] = None) -> bool:
+        return (self.timer() if now is None else now) - e.stored_at >= self.ttl
+
+    def _count(self, event: str) -> None:
+        if self.metrics is not None:
+            getattr(self.metrics, event)()
+
+    def _drop(self, key: Hashable) -> None:
+        e = self._data.pop(key)
+        self.currsize -= e.size
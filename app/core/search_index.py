@@ -0,0 +1,405 @@
+"""Memory-mapped offline search index (SEARCH_INDEX_PATH).
+
+`scripts/build_search_index.py` compiles one catalog snapshot into a compact
+binary file that warm containers `mmap` read-only — shipped in the Lambda
+bundle or dropped in /tmp. `SearchService` answers the literal-match,
+decomposition and expansion phases from it (app/repositories/
+search_index_repo.py) and falls back to Postgres whenever the index cannot
+answer exactly; only the final top-N hydrate still reads the DB.
+
+Layout: a header, a section directory, then 8-byte-aligned typed arrays in
+native byte order (build and read on the same architecture). Per bucket — `ar`
+artists, `al` albums, `tr` tracks:
+
+- entities are numbered in the DB's literal-match tiebreak order (artists:
+  popularity, followers, views; albums: popularity; tracks: views,
+  created_at); matches are ranked by the query-dependent relevance blend
+  (app/core/ranking.py) first, internal id second — the repos' ORDER BY
+- `<b>.uuid` the 16-byte ids; `<b>.usort` / `<b>.uperm` the same ids sorted,
+  with their internal ids (uuid → internal id by binary search)
+- `<b>.txt` name / title string table (`ar.alias`: aliases joined by \\x1f)
+- `ar.pop` / `al.pop` popularity (-1 = NULL), `al.rd` release-date ordinal
+  (0 = NULL), `tr.al` album internal id (NO_ID = none)
+- `<b>.gk` + `<b>.g` case-folded character-bigram postings: sorted 64-bit gram
+  hashes and, per gram, ascending internal ids. Bigrams rather than trigrams
+  so two-syllable Hangul names are searchable.
+
+Relations are CSR arrays (`<rel>.o` offsets, `<rel>.i` internal ids), each
+pre-sorted the way its DB query orders: `ar_al` / `ar_tr` newest album first,
+`al_tr` by track_no, `al_ar` / `tr_ar` credits.
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import logging
+import mmap
+import struct
+import time
+import uuid
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.ranking import Ranker
+from app.domain.rows import AlbumHit, ArtistHit, TrackHit
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MSIDX001"
+_HEADER = struct.Struct("<8sId")  # magic, section count, built_at (epoch sec)
+_ENTRY = struct.Struct("<16sQQ8s")  # name, byte offset, byte length, typecode
+NO_ID = 0xFFFFFFFF
+_ALIAS_SEP = "\x1f"
+# ILIKE wildcards: Postgres would read such a query as a pattern.
+_WILDCARDS = ("%", "_")
+
+
+def grams(text: str) -> Set[str]:
+    t = text.lower()
+    return {t[i:i + 2] for i in range(len(t) - 1)}
+
+
+def _gram_key(gram: str) -> int:
+    return int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "little")
+
+
+def _desc_nulls_last(v) -> tuple:
+    if v is None:
+        return (1, 0)
+    return (0, -(v.toordinal() if isinstance(v, date) else v))
+
+
+# ---------------------------------------------------------------- build ----
+
+class _Writer:
+    def __init__(self) -> None:
+        self._sections: list = []  # (name, typecode, bytes)
+
+    def add(self, name: str, typecode: str, values: Iterable) -> None:
+        self._sections.append((name, typecode, array(typecode, values).tobytes()))
+
+    def raw(self, name: str, data: bytes) -> None:
+        self._sections.append((name, "B", data))
+
+    def strings(self, name: str, items: Iterable[str]) -> None:
+        blob = bytearray()
+        offs = [0]
+        for s in items:
+            blob += s.encode()
+            offs.append(len(blob))
+        self.add(name + ".o", "I", offs)
+        self.raw(name, bytes(blob))
+
+    def csr(self, name: str, lists: Iterable[Iterable[int]]) -> None:
+        ids = array("I")
+        offs = [0]
+        for ls in lists:
+            ids.extend(ls)
+            offs.append(len(ids))
+        self.add(name + ".o", "I", offs)
+        self._sections.append((name + ".i", "I", ids.tobytes()))
+
+    def tobytes(self, built_at: float) -> bytes:
+        head = _HEADER.pack(MAGIC, len(self._sections), built_at)
+        pos = _align(_HEADER.size + _ENTRY.size * len(self._sections))
+        entries = bytearray()
+        body = bytearray()
+        for name, typecode, data in self._sections:
+            entries += _ENTRY.pack(name.encode(), pos + len(body), len(data), typecode.encode())
+            body += data
+            body += b"\0" * (_align(len(body)) - len(body))
+        pad = b"\0" * (pos - len(head) - len(entries))
+        return head + bytes(entries) + pad + bytes(body)
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def build_index(catalog, built_at: Optional[float] = None) -> bytes:
+    """Compile a loaded `Catalog` (app/services/catalog_export_service.py)."""
+    w = _Writer()
+    artists, albums, tracks = catalog.artists, catalog.albums, catalog.tracks
+
+    # Internal ids in each bucket's literal-match ORDER BY (repos'
+    # search_rows_by_*), uuid as the deterministic tiebreak.
+    ar = sorted(artists, key=lambda i: (
+        _desc_nulls_last(artists[i][6]), _desc_nulls_last(artists[i][5]),
+        -(artists[i][9] or 0), str(i),
+    ))
+    al = sorted(albums, key=lambda i: (_desc_nulls_last(albums[i].popularity), str(i)))
+    tr = sorted(tracks, key=lambda i: (
+        -(tracks[i][6] or 0), -(tracks[i][7].timestamp() if tracks[i][7] else 0), str(i),
+    ))
+    ar_ix = {a: n for n, a in enumerate(ar)}
+    al_ix = {a: n for n, a in enumerate(al)}
+    tr_ix = {t: n for n, t in enumerate(tr)}
+
+    aliases = [tuple(s for s in (artists[i][8] or ()) if s) for i in ar]
+    _bucket(w, "ar", ar, [artists[i][1] or "" for i in ar], aliases)
+    _bucket(w, "al", al, [albums[i].title or "" for i in al])
+    _bucket(w, "tr", tr, [tracks[i][1] or "" for i in tr])
+    w.strings("ar.alias", [_ALIAS_SEP.join(a) for a in aliases])
+
+    pop = lambda v: -1 if v is None else v  # noqa: E731
+    w.add("ar.pop", "h", [pop(artists[i][6]) for i in ar])
+    w.add("al.pop", "h", [pop(albums[i].popularity) for i in al])
+    w.add("al.rd", "i", [albums[i].release_date.toordinal() if albums[i].release_date else 0 for i in al])
+    w.add("tr.al", "I", [al_ix.get(tracks[i][5], NO_ID) for i in tr])
+
+    def newest(album_n: int) -> tuple:
+        return (_desc_nulls_last(albums[al[album_n]].release_date), album_n)
+
+    w.csr("ar_al", (
+        sorted((al_ix[x] for x in catalog.albums_by_artist.get(a, ()) if x in al_ix), key=newest)
+        for a in ar
+    ))
+    track_album = {tr_ix[t]: al_ix[tracks[t][5]] for t in tr if tracks[t][5] in al_ix}
+    w.csr("ar_tr", (
+        sorted(
+            (tr_ix[t] for t in catalog.tracks_by_artist.get(a, ()) if tr_ix.get(t) in track_album),
+            key=lambda n: (newest(track_album[n]), n),
+        )
+        for a in ar
+    ))
+    w.csr("al_ar", (
+        sorted(ar_ix[x] for x in catalog.artists_by_album.get(a, ()) if x in ar_ix) for a in al
+    ))
+    by_album: Dict[int, List[int]] = {}
+    for n, album_n in track_album.items():
+        by_album.setdefault(album_n, []).append(n)
+    w.csr("al_tr", (
+        sorted(by_album.get(n, ()), key=lambda t: (tracks[tr[t]][2] is None, tracks[tr[t]][2] or 0, t))
+        for n in range(len(al))
+    ))
+    w.csr("tr_ar", (
+        sorted(ar_ix[x] for x in catalog.artists_by_track.get(t, ()) if x in ar_ix) for t in tr
+    ))
+    return w.tobytes(time.time() if built_at is None else built_at)
+
+
+def _bucket(w: _Writer, b: str, ids: list, texts: List[str], extra: Optional[list] = None) -> None:
+    w.raw(f"{b}.uuid", b"".join(i.bytes for i in ids))
+    perm = sorted(range(len(ids)), key=lambda n: ids[n].bytes)
+    w.raw(f"{b}.usort", b"".join(ids[n].bytes for n in perm))
+    w.add(f"{b}.uperm", "I", perm)
+    w.strings(f"{b}.txt", texts)
+    postings: Dict[int, List[int]] = {}
+    for n, text in enumerate(texts):
+        gs = grams(text)
+        for alias in (extra[n] if extra else ()):
+            gs |= grams(alias)
+        for g in gs:
+            postings.setdefault(_gram_key(g), []).append(n)
+    keys = sorted(postings)
+    w.add(f"{b}.gk", "Q", keys)
+    w.csr(f"{b}.g", (postings[k] for k in keys))
+
+
+# ----------------------------------------------------------------- read ----
+
+class SearchIndex:
+    def __init__(self, buf) -> None:
+        mv = memoryview(buf)
+        magic, count, self.built_at = _HEADER.unpack_from(mv, 0)
+        if magic != MAGIC:
+            raise ValueError("not a search index file")
+        self._buf = buf
+        self._s: Dict[str, memoryview] = {}
+        for k in range(count):
+            name, off, length, typecode = _ENTRY.unpack_from(mv, _HEADER.size + k * _ENTRY.size)
+            seg = mv[off:off + length]
+            typecode = typecode.rstrip(b"\0").decode()
+            self._s[name.rstrip(b"\0").decode()] = seg if typecode == "B" else seg.cast(typecode)
+        self._n = {b: len(self._s[f"{b}.uuid"]) // 16 for b in ("ar", "al", "tr")}
+
+    @classmethod
+    def open(cls, path: str) -> "SearchIndex":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def age_sec(self) -> float:
+        return time.time() - self.built_at
+
+    # -- primitives --
+
+    def _uuid(self, b: str, n: int) -> uuid.UUID:
+        return uuid.UUID(bytes=bytes(self._s[f"{b}.uuid"][n * 16:n * 16 + 16]))
+
+    def _str(self, name: str, n: int) -> str:
+        o = self._s[name + ".o"]
+        return bytes(self._s[name][o[n]:o[n + 1]]).decode()
+
+    def _list(self, name: str, n: int) -> memoryview:
+        o = self._s[name + ".o"]
+        return self._s[name + ".i"][o[n]:o[n + 1]]
+
+    def _find(self, b: str, key) -> Optional[int]:
+        raw = key.bytes if isinstance(key, uuid.UUID) else uuid.UUID(str(key)).bytes
+        us = self._s[f"{b}.usort"]
+        lo, hi = 0, self._n[b]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(us[mid * 16:mid * 16 + 16]) < raw:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n[b] and bytes(us[lo * 16:lo * 16 + 16]) == raw:
+            return self._s[f"{b}.uperm"][lo]
+        return None
+
+    def _find_all(self, b: str, keys: Iterable) -> Optional[List[int]]:
+        # None when any id postdates the build — the caller asks the DB instead.
+        out = []
+        for key in keys:
+            n = self._find(b, key)
+            if n is None:
+                return None
+            out.append(n)
+        return out
+
+    def _row(self, b: str, n: int):
+        if b == "ar":
+            alias = self._str("ar.alias", n)
+            pop = self._s["ar.pop"][n]
+            return ArtistHit(
+                self._uuid("ar", n), self._str("ar.txt", n), None if pop < 0 else pop,
+                tuple(alias.split(_ALIAS_SEP)) if alias else (),
+            )
+        if b == "al":
+            pop, rd = self._s["al.pop"][n], self._s["al.rd"][n]
+            return AlbumHit(
+                self._uuid("al", n), self._str("al.txt", n), None if pop < 0 else pop,
+                date.fromordinal(rd) if rd else None,
+            )
+        album_n = self._s["tr.al"][n]
+        album = self._row("al", album_n) if album_n != NO_ID else None
+        return TrackHit(
+            self._uuid("tr", n), self._str("tr.txt", n),
+            album.id if album else None,
+            album.popularity if album else None,
+            album.release_date if album else None,
+        )
+
+    # -- literal match --
+
+    def _matches(self, b: str, n: int, qq: str) -> bool:
+        if qq in self._str(f"{b}.txt", n).lower():
+            return True
+        return b == "ar" and qq in self._str("ar.alias", n).lower()
+
+    def _pop(self, b: str, n: int) -> Optional[int]:
+        if b == "tr":
+            n = self._s["tr.al"][n]
+            if n == NO_ID:
+                return None
+            b = "al"
+        pop = self._s[f"{b}.pop"][n]
+        return None if pop < 0 else pop
+
+    def search(self, b: str, q: str, limit: int, offset: int) -> Optional[list]:
+        """Case-insensitive substring matches (ILIKE '%q%') in the repos' order,
+        or None when the index cannot answer (query shorter than a gram,
+        wildcards)."""
+        qq = q.lower()
+        if len(qq) < 2 or any(c in qq for c in _WILDCARDS):
+            return None
+        keys = self._s[f"{b}.gk"]
+        lists = []
+        for g in grams(qq):
+            k = _gram_key(g)
+            i = bisect.bisect_left(keys, k)
+            if i == len(keys) or keys[i] != k:
+                return []
+            lists.append(self._list(f"{b}.g", i))
+        lists.sort(key=len)
+        head, rest = lists[0], lists[1:]
+        ranker = Ranker(qq)
+        ranked = []
+        for n in head:
+            if all(_contains(p, n) for p in rest) and self._matches(b, n, qq):
+                sim = ranker.similarity(self._str(f"{b}.txt", n))
+                ranked.append((-ranker.score(sim, self._pop(b, n)), n))
+        top = heapq.nsmallest(offset + limit, ranked)
+        return [self._row(b, n) for _, n in top[offset:]]
+
+    # -- relations (None: an id is not in the index) --
+
+    def rows_by_ids(self, b: str, keys: List) -> Optional[list]:
+        ns = self._find_all(b, keys)
+        return None if ns is None else [self._row(b, n) for n in ns]
+
+    def artist_albums(self, artist_id, limit: int) -> Optional[List[AlbumHit]]:
+        n = self._find("ar", artist_id)
+        return None if n is None else [self._row("al", x) for x in self._list("ar_al", n)[:limit]]
+
+    def artist_tracks(self, artist_id, limit: int) -> Optional[List[TrackHit]]:
+        n = self._find("ar", artist_id)
+        return None if n is None else [self._row("tr", x) for x in self._list("ar_tr", n)[:limit]]
+
+    def album_tracks(self, album_ids: List, limit: int) -> Optional[List[TrackHit]]:
+        # TrackRepository.list_rows_by_album_ids order: album popularity, newest
+        # album, then track_no (al_tr order).
+        ns = self._find_all("al", album_ids)
+        if ns is None:
+            return None
+        pop, rd = self._s["al.pop"], self._s["al.rd"]
+        ns = sorted(set(ns), key=lambda n: (pop[n] < 0, -pop[n], rd[n] == 0, -rd[n], n))
+        out: List[TrackHit] = []
+        for n in ns:
+            for t in self._list("al_tr", n):
+                if len(out) >= limit:
+                    return out
+                out.append(self._row("tr", t))
+        return out
+
+    def credited_artists(self, b: str, keys: List) -> Optional[List[ArtistHit]]:
+        ns = self._find_all(b, keys)
+        if ns is None:
+            return None
+        rel = "al_ar" if b == "al" else "tr_ar"
+        return [self._row("ar", a) for n in ns for a in self._list(rel, n)]
+
+    def credit_ids(self, b: str, keys: List) -> Optional[Dict[object, Set]]:
+        ns = self._find_all(b, keys)
+        if ns is None:
+            return None
+        rel = "al_ar" if b == "al" else "tr_ar"
+        out: Dict[object, Set] = {}
+        for n in ns:
+            credited = {self._uuid("ar", a) for a in self._list(rel, n)}
+            if credited:
+                out[self._uuid(b, n)] = credited
+        return out
+
+
+def _contains(sorted_ids: memoryview, n: int) -> bool:
+    i = bisect.bisect_left(sorted_ids, n)
+    return i < len(sorted_ids) and sorted_ids[i] == n
+
+
+_index: Optional[SearchIndex] = None
+_index_path: Optional[str] = None
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """The SEARCH_INDEX_PATH index, mapped once per container. None when unset,
+    unreadable, or older than SEARCH_INDEX_MAX_AGE_SEC — search then runs on
+    Postgres alone."""
+    global _index, _index_path
+    path = settings.SEARCH_INDEX_PATH
+    if not path:
+        return None
+    if path != _index_path:
+        _index_path = path
+        try:
+            _index = SearchIndex.open(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("search index %s unavailable: %s", path, e)
+            _index = None
+    if _index is None or _index.age_sec() > settings.SEARCH_INDEX_MAX_AGE_SEC:
+        return None
+    return _index
@@ -0,0 +1,119 @@
+"""Unified-search query planner: pick a match strategy from the query's shape.
+
+`plan_query` classifies the raw query by length, script and token count once,
+at the top of `SearchService._compute_unified_search`:
+
+- `spotify_id` — a Spotify id, `spotify:<type>:<id>` URI or open.spotify.com
+  URL: exact spotify_id lookups (only the named bucket when the type is known)
+- `prefix` — 1–2 Latin characters or a single Hangul syllable: `lower(name)
+  LIKE 'q%'` as a range scan on the expression indexes from
+  db/migrations/009_search_prefix_indexes.sql instead of a full-table
+  `ILIKE '%q%'`. A two-syllable Hangul query is usually a whole name or an
+  alias (방탄), so it stays a substring search.
+- `multi_token` — 2+ words: substring literal match plus the "<artist>
+  <title>" read, by full-text documents (SEARCH_FTS_ENABLED) or split
+  decomposition
+- `substring` — everything else
+
+Substring strategies admit the pg_trgm fuzzy tail (typos) when
+SEARCH_USE_PG_TRGM is on. The plan is reported by `?explain=1`.
+"""
+from __future__ import annotations
+
+import re
+from typing import NamedTuple, Optional
+
+from sqlalchemy import and_, func
+
+from app.core.config import settings
+
+PLAN_SPOTIFY_ID = "spotify_id"
+PLAN_PREFIX = "prefix"
+PLAN_MULTI_TOKEN = "multi_token"
+PLAN_SUBSTRING = "substring"
+
+# Longest query answered by the prefix strategy, in characters; Hangul
+# syllables carry more per character.
+PREFIX_MAX_CHARS = 2
+PREFIX_MAX_HANGUL_CHARS = 1
+
+_SPOTIFY_ID = r"[0-9A-Za-z]{22}"
+_SPOTIFY_REF = re.compile(
+    rf"^(?:spotify:(artist|album|track):({_SPOTIFY_ID})"
+    rf"|https?://open\.spotify\.com/(?:intl-[a-z]+/)?(artist|album|track)/({_SPOTIFY_ID})(?:[/?#].*)?"
+    rf"|({_SPOTIFY_ID}))$"
+)
+
+
+class SearchPlan(NamedTuple):
+    strategy: str
+    script: str  # "hangul" | "latin" | "mixed" | "none"
+    tokens: int
+    fuzzy: bool = False  # pg_trgm tail admitted
+    decompose: Optional[str] = None  # "fts" | "split" (multi_token only)
+    spotify_type: Optional[str] = None  # bucket named by a URI / URL
+    spotify_id: Optional[str] = None
+
+    def describe(self) -> str:
+        parts = [f"strategy={self.strategy}", f"script={self.script}", f"tokens={self.tokens}"]
+        if self.fuzzy:
+            parts.append("fuzzy=trgm")
+        if self.decompose:
+            parts.append(f"decompose={self.decompose}")
+        if self.spotify_id:
+            parts.append(f"spotify={self.spotify_type or 'any'}")
+        return " ".join(parts)
+
+
+def _is_hangul(c: str) -> bool:
+    return "가" <= c <= "힣" or "ᄀ" <= c <= "ᇿ" or "㄰" <= c <= "㆏"
+
+
+def query_script(q: str) -> str:
+    letters = [c for c in q if c.isalpha()]
+    if not letters:
+        return "none"
+    if all(_is_hangul(c) for c in letters):
+        return "hangul"
+    if all(c.isascii() for c in letters):
+        return "latin"
+    return "mixed"
+
+
+def _spotify_ref(q: str):
+    m = _SPOTIFY_REF.match(q)
+    if m is None:
+        return None
+    kind = m.group(1) or m.group(3)
+    sid = m.group(2) or m.group(4) or m.group(5)
+    # A bare 22-letter word is more likely a query than an id.
+    if kind is None and not any(c.isdigit() for c in sid):
+        return None
+    return kind, sid
+
+
+def plan_query(q: str) -> SearchPlan:
+    q = q.strip()
+    tokens = len(q.split())
+    script = query_script(q)
+    ref = _spotify_ref(q)
+    if ref is not None:
+        return SearchPlan(PLAN_SPOTIFY_ID, script, tokens, spotify_type=ref[0], spotify_id=ref[1])
+    max_prefix = PREFIX_MAX_HANGUL_CHARS if script == "hangul" else PREFIX_MAX_CHARS
+    if 0 < len(q) <= max_prefix:
+        return SearchPlan(PLAN_PREFIX, script, tokens)
+    fuzzy = settings.SEARCH_USE_PG_TRGM
+    if tokens >= 2:
+        decompose = "fts" if settings.SEARCH_FTS_ENABLED else "split"
+        return SearchPlan(PLAN_MULTI_TOKEN, script, tokens, fuzzy=fuzzy, decompose=decompose)
+    return SearchPlan(PLAN_SUBSTRING, script, tokens, fuzzy=fuzzy)
+
+
+def prefix_match(col, q: str):
+    """Case-insensitive `col LIKE 'q%'` as a half-open range over
+    `lower(col) COLLATE "C"` — the form the 009 expression indexes serve, and
+    one that stays index-usable with bound parameters (generic plans)."""
+    lo = q.lower()
+    hi = lo[:-1] + chr(ord(lo[-1]) + 1)
+    key = func.lower(col).collate("C")
+    return and_(key >= lo, key < hi)
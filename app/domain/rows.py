@@ -0,0 +1,102 @@
+"""Read-path row DTOs built from Core column projections.
+
+List endpoints only copy a handful of columns into the response models, so
+their repositories select exactly those columns and wrap each row in one of
+these NamedTuples instead of hydrating ORM entities (no identity map, no
+attribute instrumentation, no relationship loaders). The field names match the
+ORM attributes the mappers read, so `AlbumItemMapper` / `ArtistItemMapper` /
+`TrackItemMapper` take either.
+
+`scripts/bench_read_dtos.py` compares both paths.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, NamedTuple, Optional, Tuple
+
+
+class ArtistRef(NamedTuple):
+    """Credited artist on a track / album — what the primary/feat pick reads."""
+
+    id: Any
+    name: str
+    popularity: Optional[int]
+
+
+class ArtistRow(NamedTuple):
+    id: Any
+    name: str
+    spotify_id: Optional[str]
+    photo_url: Optional[str]
+    genres: Any
+    followers: Optional[int]
+    popularity: Optional[int]
+    spotify_url: Optional[str]
+    ext_refs: Optional[dict]
+
+
+class AlbumRow(NamedTuple):
+    id: Any
+    title: str
+    release_date: Optional[date]
+    cover_url: Optional[str]
+    album_type: Optional[str]
+    spotify_id: Optional[str]
+    ext_refs: Optional[dict]
+    total_tracks: Optional[int]
+    label: Optional[str]
+    popularity: Optional[int]
+    best_new: bool
+    # PRIMARY_ARTIST_COLUMNS_ENABLED (migration 006): the trigger-maintained
+    # primary artist; None when the projection does not select it.
+    primary_artist_name: Optional[str] = None
+    primary_artist_spotify_id: Optional[str] = None
+
+
+class TrackAlbumRef(NamedTuple):
+    """The album fields a track list item shows, plus its artists (primary
+    fallback when the track has no credited artists of its own)."""
+
+    title: str
+    cover_url: Optional[str]
+    release_date: Optional[date]
+    spotify_id: Optional[str]
+    artists: Tuple[ArtistRef, ...]
+
+
+class TrackRow(NamedTuple):
+    id: Any
+    title: str
+    track_no: Optional[int]
+    duration_sec: Optional[int]
+    spotify_id: Optional[str]
+    album_id: Any
+    album: Optional[TrackAlbumRef]
+    artists: Tuple[ArtistRef, ...]
+    # PRIMARY_ARTIST_COLUMNS_ENABLED (migration 006), as on AlbumRow.
+    primary_artist_name: Optional[str] = None
+
+
+# Unified-search stage-one rows served by the offline search index
+# (app/core/search_index.py) — the same fields as the repositories'
+# `_THIN_COLUMNS`, so ranking / explain read either.
+class ArtistHit(NamedTuple):
+    id: Any
+    name: str
+    popularity: Optional[int]
+    aliases: Tuple[str, ...]
+
+
+class AlbumHit(NamedTuple):
+    id: Any
+    title: str
+    popularity: Optional[int]
+    release_date: Optional[date]
+
+
+class TrackHit(NamedTuple):
+    id: Any
+    title: str
+    album_id: Any
+    album_popularity: Optional[int]
+    album_release_date: Optional[date]
@@ -72,6 +72,7 @@ class ExplainEntry(BaseModel):
     matched_field: Optional[str] = None          # "name" | "alias" | "title" | "fuzzy"
     similarity: Optional[float] = None
     popularity: Optional[int] = None
+    score: Optional[float] = None                # rank blend (SEARCH_RANK_*_WEIGHT)
 
 
 # ✅ 통합 검색 응답 (DB 1번 호출로 3섹션)
@@ -83,6 +84,35 @@ class UnifiedSearchResult(BaseModel):
     # (omitted intent) in the default response, so existing consumers are
     # unaffected — this is a purely additive contract change.
     debug: Optional[List[ExplainEntry]] = None
+    # `?explain=1` only: the query planner's pick (app/core/search_plan.py),
+    # e.g. "strategy=prefix script=latin tokens=1".
+    plan: Optional[str] = None
+    # True when the request deadline forced the optional decomposition /
+    # expansion phases to be skipped — literal matches only. Such responses are
+    # not stored in the per-process result cache.
+    partial: bool = False
+
+
+# ------- 통합 검색 일괄 (POST /unified:batch) -------
+class UnifiedSearchQuery(BaseModel):
+    """One GET /unified request's parameters, for the batch body."""
+    q: str = Field(..., min_length=1)
+    type: str = "album,artist,track"
+    limit: int = Field(20, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+    artist_offset: Optional[int] = Field(None, ge=0)
+    album_offset: Optional[int] = Field(None, ge=0)
+    track_offset: Optional[int] = Field(None, ge=0)
+    explain: bool = False
+
+
+class UnifiedSearchBatchIn(BaseModel):
+    queries: List[UnifiedSearchQuery] = Field(..., min_length=1)
+
+
+class UnifiedSearchBatchResult(BaseModel):
+    # One result per query, in request order.
+    results: List[UnifiedSearchResult] = Field(default_factory=list)
 
 
 # ------- 앨범 상세용 트랙 / 아티스트 / 앨범 -------
@@ -127,11 +157,23 @@ class AlbumDetail(BaseModel):
     meta: dict = Field(default_factory=dict)
 
 
+# ------- 흡수(absorb) 진행 상태 -------
+# by-spotify lookup 이 아직 DB 에 없는 id 를 받았고 absorb_requests 에 살아있는
+# pending 요청이 있을 때의 202 응답 바디 (ABSORB_TRACKING_ENABLED 일 때만).
+# eta_sec 는 enqueue 시각 기준 예상 남은 시간 — 프론트의 다음 poll/wait 간격 힌트.
+class AbsorbStatus(BaseModel):
+    kind: str                                    # "album" | "artist"
+    spotify_id: str
+    status: str = "pending"
+    enqueued_at: Optional[str] = None
+    eta_sec: Optional[int] = None
+
+
 # ------- 아티스트 hero (드릴인용) -------
 # FEAT-writer-lowfreq-redesign Step 3: writer 의 artist drill-in 패널 hero.
 # `status` 는 by-spotify lookup 의 ready/pending 분기를 위한 필드.
-# 현 시점에는 absorb-tracking 테이블이 없어 pending 상태를 직접 못 만들지만,
-# 스키마에는 유지해서 향후 비동기 흡수 도입 시 응답 모양만 확장하면 되게 둔다.
+# absorb_requests(migration 002) 가 켜져 있으면 by-spotify 가 흡수 대기 중인 id 에
+# status="pending" + eta_sec 를 채운 hero(202)를 돌려준다. 그 외에는 "ready" 만 발생.
 class ArtistHero(BaseModel):
     id: Optional[str] = None
     name: str
@@ -143,7 +185,8 @@ class ArtistHero(BaseModel):
     spotify_url: Optional[str] = None
     album_count: int = 0
     track_count: int = 0
-    status: str = "ready"  # "ready" | "pending" (현재 prod 에선 "ready" 만 발생)
+    status: str = "ready"  # "ready" | "pending"
+    eta_sec: Optional[int] = None  # pending 일 때만 채워짐
 
 
 # ------- 아티스트 id 목록 (정적 빌드 enumeration용) -------
@@ -1,8 +1,15 @@
 # app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError
 from mangum import Mangum  # 👈 Lambda용 어댑터
-from app.api.routers import search, albums, artists
+from app.api.routers import search, albums, artists, debug
+from app.core.cache_metrics import emit_emf_if_due
+from app.core.config import settings
+from app.core.db import db_timings
+from app.core.deadline import DeadlineExceeded
+from app.services.warmup_service import handle_warm_ping, is_warm_ping, prime_cold_start
 
 app = FastAPI(title="Music Catalog API", version="0.1.0")
 
@@ -25,6 +32,49 @@ app.add_middleware(
 app.include_router(search.router, prefix="/api/music/search", tags=["Search"])
 app.include_router(albums.router, prefix="/api/music/albums", tags=["Albums"])
 app.include_router(artists.router, prefix="/api/music/artists", tags=["Artists"])
+app.include_router(debug.router, prefix="/api/music/_debug", include_in_schema=False)
+
+# Request deadline (app/core/deadline.py): an exhausted budget or a statement
+# cancelled by `statement_timeout` is a transient overload, not a server bug —
+# answer 503 (uncached) so the client / edge may retry.
+_QUERY_CANCELED = "57014"
+
+
+def _deadline_503() -> JSONResponse:
+    return JSONResponse(status_code=503, content={"detail": "Request deadline exceeded"})
+
+
+@app.exception_handler(DeadlineExceeded)
+def _on_deadline_exceeded(request: Request, exc: DeadlineExceeded):
+    return _deadline_503()
+
+
+@app.exception_handler(OperationalError)
+def _on_operational_error(request: Request, exc: OperationalError):
+    if getattr(exc.orig, "sqlstate", None) == _QUERY_CANCELED:
+        return _deadline_503()
+    raise exc
+
+
+# Cold-start priming — runs once per container during the Lambda init phase
+# (free CPU), before the first invoke. Opt-in; best-effort (never raises).
+if settings.PRIME_ON_INIT:
+    prime_cold_start()
+
+_asgi_handler = Mangum(app)
+
 
 # 👇 Lambda가 찾을 엔트리포인트
-handler = Mangum(app)
\ No newline at end of file
+def handler(event, context):
+    # Keep-warm pings short-circuit before Mangum: no ASGI scope, no routing,
+    # no middleware — just a pool ping + near-expiry cache refresh.
+    if is_warm_ping(event):
+        return handle_warm_ping()
+    db_timings.reset()
+    try:
+        return _asgi_handler(event, context)
+    finally:
+        if settings.DB_TIMINGS_EMF:
+            db_timings.emit_emf()
+        if settings.CACHE_METRICS_EMIT_SEC > 0:
+            emit_emf_if_due(settings.CACHE_METRICS_EMIT_SEC)
@@ -5,14 +5,21 @@ from app.domain.schemas import AlbumItem
 
 class AlbumItemMapper:
     @staticmethod
-    def to_list(albums, primary_map):
+    def to_list(albums, primary_map=None):
+        # albums: AlbumRow DTOs (app/domain/rows.py) or Album entities.
         result: list[AlbumItem] = []
         for al in albums:
-            # primary_map keys are str(album_uuid) (see AlbumRepository.
-            # get_primary_artist_map). al.id is a uuid.UUID object, so look it up
-            # by str() too — a raw-UUID lookup misses every row and silently drops
-            # artist_name to None for the whole unified-search album bucket.
-            artist_name, artist_sid = (primary_map.get(str(al.id)) or (None, None))
+            if primary_map is None:
+                # PRIMARY_ARTIST_COLUMNS_ENABLED: the row carries the
+                # trigger-maintained primary artist itself.
+                artist_name = getattr(al, "primary_artist_name", None)
+                artist_sid = getattr(al, "primary_artist_spotify_id", None)
+            else:
+                # primary_map keys are str(album_uuid) (see AlbumRepository.
+                # get_primary_artist_map). al.id is a uuid.UUID object, so look it
+                # up by str() too — a raw-UUID lookup misses every row and silently
+                # drops artist_name to None for the whole unified-search album bucket.
+                artist_name, artist_sid = (primary_map.get(str(al.id)) or (None, None))
 
             ext_refs = getattr(al, "ext_refs", {}) or {}
             external_url = ext_refs.get("spotify_url")
@@ -22,6 +22,7 @@ class ArtistItemMapper:
 
     @staticmethod
     def to_list(artists):
+        # artists: ArtistRow DTOs (app/domain/rows.py) or Artist entities.
         items: list[ArtistItem] = []
         for a in artists:
             ext_refs = getattr(a, "ext_refs", {}) or {}
@@ -30,28 +30,32 @@ def _sort_artists_by_popularity(artists: list) -> list:
 class TrackItemMapper:
     @staticmethod
     def to_list(tracks) -> list[TrackItem]:
+        # tracks: TrackRow DTOs (app/domain/rows.py) or Track entities.
         out: list[TrackItem] = []
         for t in tracks:
             al = getattr(t, "album", None)
 
             # 대표 아티스트: 트랙 artists 우선(stable sort), 없으면 앨범 artists.
-            artist_name = None
-            track_artists_sorted = _sort_artists_by_popularity(
-                getattr(t, "artists", None) or []
-            )
-            if track_artists_sorted:
-                artist_name = track_artists_sorted[0].name
-            else:
-                album_artists_sorted = _sort_artists_by_popularity(
-                    getattr(al, "artists", None) or []
-                )
-                if album_artists_sorted:
-                    artist_name = album_artists_sorted[0].name
+            # PRIMARY_ARTIST_COLUMNS_ENABLED 면 트리거가 같은 규칙으로 미리 골라 둔
+            # primary_artist_name 을 그대로 사용 (정렬 없음).
+            track_artists = getattr(t, "artists", None) or []
+            artist_name = getattr(t, "primary_artist_name", None)
+            if not isinstance(artist_name, str):
+                artist_name = None
+                track_artists_sorted = _sort_artists_by_popularity(track_artists)
+                if track_artists_sorted:
+                    artist_name = track_artists_sorted[0].name
+                else:
+                    album_artists_sorted = _sort_artists_by_popularity(
+                        getattr(al, "artists", None) or []
+                    )
+                    if album_artists_sorted:
+                        artist_name = album_artists_sorted[0].name
 
             # feat: 트랙 artists 중 대표(artist_name) 제외, 알파벳 정렬, 중복 제거.
             # album_artists fallback 으로 갔다면 feat 는 빈 list (검색 응답은 album.artists 메타 미노출).
             feat_artist_names = sorted({
-                a.name for a in track_artists_sorted
+                a.name for a in track_artists
                 if getattr(a, "name", None) and a.name != artist_name
             })
 
@@ -0,0 +1,82 @@
+import logging
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Text, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# `absorb_requests` is owned by this service (db/migrations/002_absorb_requests.sql)
+# and is not part of myblog_shared_db, so it is declared here as a Core table.
+absorb_requests_table = Table(
+    "absorb_requests",
+    MetaData(),
+    Column("kind", Text, primary_key=True),
+    Column("spotify_id", Text, primary_key=True),
+    Column("state", Text, nullable=False),
+    Column("market", Text),
+    Column("attempts", Integer, nullable=False),
+    Column("enqueued_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+KIND_ALBUM = "album"
+KIND_ARTIST = "artist"
+
+STATE_PENDING = "pending"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+
+class AbsorbRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # 반환 Row: (state, enqueued_at, age_sec). age 는 DB 시계 기준으로 계산해서
+    # Lambda ↔ Neon 간 clock skew / TIMESTAMP(타임존 없음) 해석 차이를 피한다.
+    def get_status(self, kind: str, spotify_id: str) -> Optional[Row]:
+        t = absorb_requests_table
+        stmt = select(
+            t.c.state,
+            t.c.enqueued_at,
+            func.extract("epoch", func.now() - t.c.enqueued_at).label("age_sec"),
+        ).where(t.c.kind == kind, t.c.spotify_id == spotify_id)
+        return self.db.execute(stmt).first()
+
+    # 아직 처리 중(pending, TTL 이내)인 id 만 반환 — /candidates 의 재-enqueue 스킵용.
+    def get_in_flight_ids(self, kind: str, spotify_ids: Iterable[str], ttl_sec: int) -> Set[str]:
+        ids: List[str] = [i for i in spotify_ids if i]
+        if not ids:
+            return set()
+        t = absorb_requests_table
+        stmt = select(t.c.spotify_id).where(
+            t.c.kind == kind,
+            t.c.spotify_id.in_(ids),
+            t.c.state == STATE_PENDING,
+            t.c.enqueued_at > func.now() - func.make_interval(0, 0, 0, 0, 0, 0, ttl_sec),
+        )
+        return set(self.db.scalars(stmt).all())
+
+    def record_enqueued(self, kind: str, spotify_ids: Iterable[str], market: str | None) -> None:
+        rows = [
+            {"kind": kind, "spotify_id": sid, "state": STATE_PENDING, "market": market}
+            for sid in dict.fromkeys(i for i in spotify_ids if i)
+        ]
+        if not rows:
+            return
+        stmt = pg_insert(absorb_requests_table).values(rows)
+        # Re-enqueue of a lost/failed request restarts the clock; a row already
+        # 'done' is never re-enqueued (the catalog existence check filters it).
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "spotify_id"],
+            set_={
+                "state": STATE_PENDING,
+                "market": stmt.excluded.market,
+                "attempts": absorb_requests_table.c.attempts + 1,
+                "enqueued_at": func.now(),
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
@@ -1,14 +1,122 @@
 import logging
-from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 logger = logging.getLogger(__name__)
-from sqlalchemy import func, select
+from sqlalchemy import and_, false, func, literal_column, select, text
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.sql.elements import BinaryExpression
 from myblog_shared_db.models import Album, Artist, album_artists_table
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.core.config import settings
+from app.core.ranking import sql_blend
+from app.core.search_plan import prefix_match
+from app.domain.rows import AlbumRow
+from app.repositories.literal_batch import LiteralSpec, contains_pattern, literal_rows_batch
+from app.repositories.search_document_repo import fts_query, search_documents_table
+
+# Unified-search stage-one projection (rank + explain inputs only).
+_THIN_COLUMNS = (Album.id, Album.title, Album.popularity, Album.release_date)
+
+# Read-path DTO projection (app/domain/rows.py), in field order. best_new is an
+# editor column newer than some DBs' model; absent → constant false.
+_best_new = getattr(Album, "best_new", None)
+_ROW_COLUMNS = (
+    Album.id,
+    Album.title,
+    Album.release_date,
+    Album.cover_url,
+    Album.album_type,
+    Album.spotify_id,
+    Album.ext_refs,
+    Album.total_tracks,
+    Album.label,
+    Album.popularity,
+    (_best_new if _best_new is not None else false()).label("best_new"),
+)
+
+# PRIMARY_ARTIST_COLUMNS_ENABLED: the trigger-maintained primary artist
+# (db/migrations/006_primary_artist_columns.sql) rides along with the row, so
+# search needs no get_primary_artist_map round trip. Not on the shared model,
+# hence referenced by name.
+_PRIMARY_COLUMNS = (
+    literal_column("albums.primary_artist_name").label("primary_artist_name"),
+    literal_column("albums.primary_artist_spotify_id").label("primary_artist_spotify_id"),
+)
+
+
+def _row_columns() -> tuple:
+    if settings.PRIMARY_ARTIST_COLUMNS_ENABLED:
+        return _ROW_COLUMNS + _PRIMARY_COLUMNS
+    return _ROW_COLUMNS
+
+# Album detail in one statement: the AlbumDetail JSON document is built
+# server-side (json_build_object / json_agg), returned as text and parsed
+# straight into the response model — no entity graph, no second round trip.
+# - artists: album_artists, most popular first (same pick order as
+#   get_primary_artist_map)
+# - tracks: by track_no; feat_artist_names = the track's artists that are not
+#   album artists, sorted by code point (COLLATE "C", i.e. Python's sorted())
+# - best_new is read through to_jsonb(al) so DBs without the column still work
+_DETAIL_SQL = """
+SELECT json_build_object(
+  'album', json_build_object(
+    'id', al.id,
+    'title', al.title,
+    'release_date', al.release_date,
+    'cover_url', al.cover_url,
+    'album_type', al.album_type,
+    'spotify_id', al.spotify_id,
+    'external_url', al.ext_refs ->> 'spotify_url',
+    'label', al.label,
+    'best_new', COALESCE((to_jsonb(al) ->> 'best_new')::boolean, false)
+  ),
+  'artists', COALESCE((
+    SELECT json_agg(json_build_object(
+             'id', ar.id,
+             'name', ar.name,
+             'spotify_id', ar.spotify_id,
+             'photo_url', ar.photo_url,
+             'genres', COALESCE(ar.genres, '[]'::jsonb),
+             'followers_count', ar.followers,
+             'popularity', ar.popularity,
+             'spotify_url', ar.spotify_url
+           ) ORDER BY ar.popularity DESC NULLS LAST, ar.name)
+      FROM album_artists aa
+      JOIN artists ar ON ar.id = aa.artist_id
+     WHERE aa.album_id = al.id
+  ), '[]'::json),
+  'tracks', COALESCE((
+    SELECT json_agg(json_build_object(
+             'id', t.id,
+             'title', t.title,
+             'track_no', t.track_no,
+             'duration_sec', t.duration_sec,
+             'spotify_id', t.spotify_id,
+             'feat_artist_names', COALESCE((
+               SELECT json_agg(ar.name ORDER BY ar.name COLLATE "C")
+                 FROM track_artists ta
+                 JOIN artists ar ON ar.id = ta.artist_id
+                WHERE ta.track_id = t.id
+                  AND ar.name <> ''
+                  AND NOT EXISTS (
+                    SELECT 1 FROM album_artists aa
+                     WHERE aa.album_id = al.id AND aa.artist_id = ta.artist_id
+                  )
+             ), '[]'::json)
+           ) ORDER BY t.track_no NULLS LAST)
+      FROM tracks t
+     WHERE t.album_id = al.id
+  ), '[]'::json),
+  'meta', json_build_object('source', 'db')
+)::text
+FROM albums al
+WHERE {key}
+"""
+_DETAIL_BY_ID = text(_DETAIL_SQL.format(key="al.id = CAST(:key AS uuid)"))
+_DETAIL_BY_SPOTIFY_ID = text(_DETAIL_SQL.format(key="al.spotify_id = :key"))
+
 
 class AlbumRepository:
     def __init__(self, db: Session):
@@ -37,48 +145,125 @@ class AlbumRepository:
         )
         return self.db.execute(stmt).scalars().first()
 
-    def search_by_title(self, q: str, limit: int, offset: int) -> List[Album]:
-        # 필요 시 artists 미리 로딩해서 N+1 방지
-        substring_match = Album.title.ilike(f"%{q}%")
-        base = select(Album).options(selectinload(Album.artists))
+    # by-spotify long-poll probe (see app/core/longpoll.py): existence check on
+    # the unique spotify_id index — no entity load, no eager relationships.
+    def exists_by_spotify_id(self, spotify_id: str) -> bool:
+        stmt = select(Album.id).where(Album.spotify_id == spotify_id).limit(1)
+        return self.db.execute(stmt).first() is not None
+
+    def search_rows_by_title(self, q: str, limit: int, offset: int) -> List[Row]:
+        # Unified search stage one: thin rows only — relationships are hydrated
+        # for the final top-N via get_by_ids.
+        stmt, order_keys = self._literal_statement(q)
+        return list(self.db.execute(stmt.order_by(*order_keys).limit(limit).offset(offset)).all())
+
+    # Batched stage one (see ArtistRepository.search_rows_by_name_batch).
+    def search_rows_by_title_batch(self, specs: Sequence[LiteralSpec]) -> List[List[Row]]:
+        return literal_rows_batch(self.db, specs, self._literal_statement)
+
+    @staticmethod
+    def _literal_statement(q) -> tuple:
+        substring_match = Album.title.ilike(contains_pattern(q))
+        # Relevance-ranked in SQL (app/core/ranking.py), as in artist_repo.
+        relevance = sql_blend(Album.title, q, Album.popularity)
+        base = select(*_THIN_COLUMNS)
         if settings.SEARCH_USE_PG_TRGM:
-            # V12 pg_trgm fuzzy fallback (mirrors artist_repo) — substring matches
-            # rank first (tier bool), original popularity order preserved within,
-            # similarity as the fuzzy-tail signal + final tiebreaker.
+            # V12 pg_trgm fuzzy fallback (mirrors artist_repo) — fuzzy-only rows
+            # on the relevance floor, substring matches first among equal
+            # blends, similarity as the fuzzy-tail signal + final tiebreaker.
             sim = func.similarity(Album.title, q)
-            stmt = (
-                base
-                .where(substring_match | (sim >= settings.SEARCH_TRGM_THRESHOLD))
-                .order_by(
+            return (
+                base.where(substring_match | (sim >= settings.SEARCH_TRGM_THRESHOLD)),
+                (
+                    relevance.desc(),
                     substring_match.desc(),
                     Album.popularity.desc().nullslast(),
                     sim.desc().nullslast(),
-                )
-                .limit(limit)
-                .offset(offset)
+                ),
             )
-        else:
-            stmt = (
-                base
-                .where(substring_match)
-                .limit(limit)
-                .offset(offset)
-                .order_by(Album.popularity.desc().nullslast())
+        return (
+            base.where(substring_match),
+            (relevance.desc(), Album.popularity.desc().nullslast()),
+        )
+
+    # Query planner `prefix` strategy (see ArtistRepository.search_rows_by_prefix).
+    def search_rows_by_prefix(self, q: str, limit: int, offset: int) -> List[Row]:
+        stmt = (
+            select(*_THIN_COLUMNS)
+            .where(prefix_match(Album.title, q))
+            .order_by(
+                sql_blend(Album.title, q, Album.popularity).desc(),
+                Album.popularity.desc().nullslast(),
+            )
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(self.db.execute(stmt).all())
+
+    def search_rows_by_spotify_id(self, spotify_id: str) -> List[Row]:
+        stmt = select(*_THIN_COLUMNS).where(Album.spotify_id == spotify_id)
+        return list(self.db.execute(stmt).all())
+
+    # SEARCH_FTS_ENABLED: a multi-word "<artist> <title>" query as one ranked
+    # full-text query over search_documents (db/migrations/008) — every word in
+    # the title or a credited artist's name / aliases — instead of the
+    # service's per-split decomposition queries.
+    def search_rows_fts(self, q: str, limit: int) -> List[Row]:
+        doc = search_documents_table
+        tsq = fts_query(q)
+        stmt = (
+            select(*_THIN_COLUMNS)
+            .join(doc, and_(doc.c.kind == "album", doc.c.entity_id == Album.id))
+            .where(doc.c.document.op("@@")(tsq))
+            .order_by(
+                func.ts_rank(doc.c.document, tsq).desc(),
+                Album.popularity.desc().nullslast(),
             )
-        return list(self.db.execute(stmt).scalars().all())
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).all())
 
-    # BUG-19: 1-hop expansion — albums for a single matched artist, eager-loaded.
+    # BUG-19: 1-hop expansion — albums for a single matched artist (thin rows).
     # Per-artist call (not bulk) so each artist gets a bounded LIMIT individually.
-    def list_by_artist_id_simple(self, artist_id, limit: int = 50) -> List[Album]:
+    def list_rows_by_artist_id(self, artist_id, limit: int = 50) -> List[Row]:
         stmt = (
-            select(Album)
-            .options(selectinload(Album.artists))
+            select(*_THIN_COLUMNS)
             .join(album_artists_table, album_artists_table.c.album_id == Album.id)
             .where(album_artists_table.c.artist_id == artist_id)
             .order_by(Album.release_date.desc().nullslast())
             .limit(limit)
         )
-        return list(self.db.execute(stmt).scalars().all())
+        return list(self.db.execute(stmt).all())
+
+    # BUG-19 expansion: the albums of literal-matched tracks (thin rows).
+    def rows_by_ids(self, album_ids: List) -> List[Row]:
+        if not album_ids:
+            return []
+        stmt = select(*_THIN_COLUMNS).where(Album.id.in_(album_ids))
+        return list(self.db.execute(stmt).all())
+
+    # Unified search stage three: the surviving album ids as AlbumRow DTOs (the
+    # primary artist comes from the row's primary_artist_* columns, or from
+    # get_primary_artist_map while PRIMARY_ARTIST_COLUMNS_ENABLED is off).
+    def get_by_ids(self, album_ids: Iterable) -> List[AlbumRow]:
+        ids = list(album_ids)
+        if not ids:
+            return []
+        rows = self.db.execute(select(*_row_columns()).where(Album.id.in_(ids))).all()
+        return [AlbumRow(*r) for r in rows]
+
+    # Step 6 decomposition: credited artist ids per album, link table only.
+    def artist_ids_by_album_ids(self, album_ids: List) -> Dict[object, Set]:
+        if not album_ids:
+            return {}
+        rows = self.db.execute(
+            select(album_artists_table.c.album_id, album_artists_table.c.artist_id)
+            .where(album_artists_table.c.album_id.in_(album_ids))
+        ).all()
+        result: Dict[object, Set] = {}
+        for al_id, ar_id in rows:
+            result.setdefault(al_id, set()).add(ar_id)
+        return result
 
     def upsert_album_min(
         self,
@@ -126,18 +311,14 @@ class AlbumRepository:
         self.db.execute(stmt)
         self.db.flush()
 
-    # ✅ secondary 테이블로 조인해서 앨범 + 아티스트 반환
-    def get_with_artists(self, album_id: str) -> Tuple[Optional[Album], List[Artist]]:
-        album = self.get_by_id(album_id)
-        if not album:
-            return None, []
-        artists_stmt = (
-            select(Artist)
-            .join(album_artists_table, album_artists_table.c.artist_id == Artist.id)
-            .where(album_artists_table.c.album_id == album_id)
-        )
-        artists = list(self.db.execute(artists_stmt).scalars().all())
-        return album, artists
+    # 앨범 상세(AlbumDetail) 한 방 조회 — album + artists + tracks(feat 포함)를
+    # Postgres 가 JSON 한 덩어리로 조립해 반환 (AlbumDetail.model_validate_json 용).
+    # 앨범이 없으면 None.
+    def get_detail_json(self, album_id: str) -> Optional[str]:
+        return self.db.execute(_DETAIL_BY_ID, {"key": album_id}).scalar()
+
+    def get_detail_json_by_spotify_id(self, spotify_id: str) -> Optional[str]:
+        return self.db.execute(_DETAIL_BY_SPOTIFY_ID, {"key": spotify_id}).scalar()
 
     # ✅ 앨범들에 대한 '대표 아티스트'(첫 번째 아티스트) 맵 생성
     # 반환: { album_id(str): (artist_name or None, artist_spotify_id or None) }
@@ -185,10 +366,10 @@ class AlbumRepository:
         filter_expr: BinaryExpression,
         limit: int,
         offset: int,
-    ) -> Tuple[List[Album], Dict[str, tuple[str | None, str | None]]]:
+    ) -> Tuple[List[AlbumRow], Dict[str, tuple[str | None, str | None]]]:
 
         stmt = (
-            select(Album, Artist)
+            select(*_ROW_COLUMNS, Artist.name, Artist.spotify_id)
             .join(album_artists_table, album_artists_table.c.album_id == Album.id)
             .join(Artist, album_artists_table.c.artist_id == Artist.id)
             .where(filter_expr)   # ← 조건만 다름
@@ -202,13 +383,15 @@ class AlbumRepository:
 
         rows = self.db.execute(stmt).all()
 
-        albums: List[Album] = []
+        albums: List[AlbumRow] = []
         primary_map: Dict[str, tuple[str | None, str | None]] = {}
 
-        for al, ar in rows:
+        n = len(_ROW_COLUMNS)
+        for r in rows:
+            al = AlbumRow(*r[:n])
             albums.append(al)
-            if al.id not in primary_map:
-                primary_map[al.id] = (ar.name, ar.spotify_id)
+            if str(al.id) not in primary_map:
+                primary_map[str(al.id)] = (r[n], r[n + 1])
 
         return albums, primary_map
 
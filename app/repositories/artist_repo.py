@@ -1,13 +1,43 @@
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, select, text, func
-from typing import Optional, List, Dict, Tuple
-from myblog_shared_db.models import Artist, album_artists_table, track_artists_table
+from sqlalchemy import and_, exists, literal_column, or_, select, func
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import DBAPIError
+from typing import Iterable, Iterator, Optional, List, Dict, Sequence, Tuple
+from myblog_shared_db.models import Album, Artist, album_artists_table, track_artists_table
 
 from app.core.config import settings
+from app.core.ranking import sql_blend
+from app.core.search_plan import prefix_match
+from app.domain.rows import ArtistRef, ArtistRow
+from app.repositories.artist_stats_repo import artist_stats_table
+from app.repositories.literal_batch import LiteralSpec, contains_pattern, literal_rows_batch
 
 logger = logging.getLogger(__name__)
 
+# Unified-search stage-one projection: just what ranking / explain read. Full
+# `Artist` rows are hydrated only for the final top-N (`get_by_ids`).
+_THIN_COLUMNS = (
+    Artist.id,
+    Artist.name,
+    Artist.popularity,
+    literal_column("artists.aliases").label("aliases"),
+)
+
+# Read-path DTO projections (app/domain/rows.py), in field order.
+_ROW_COLUMNS = (
+    Artist.id,
+    Artist.name,
+    Artist.spotify_id,
+    Artist.photo_url,
+    Artist.genres,
+    Artist.followers,
+    Artist.popularity,
+    Artist.spotify_url,
+    Artist.ext_refs,
+)
+_REF_COLUMNS = (Artist.id, Artist.name, Artist.popularity)
+
 
 class ArtistRepository:
     def __init__(self, db: Session):
@@ -18,6 +48,11 @@ class ArtistRepository:
             select(Artist).where(Artist.spotify_id == spotify_id)
         ).scalars().first()
 
+    # by-spotify long-poll probe (see app/core/longpoll.py) — index-only check.
+    def exists_by_spotify_id(self, spotify_id: str) -> bool:
+        stmt = select(Artist.id).where(Artist.spotify_id == spotify_id).limit(1)
+        return self.db.execute(stmt).first() is not None
+
     def get_by_id(self, artist_id: str) -> Optional[Artist]:
         return self.db.execute(
             select(Artist).where(Artist.id == artist_id)
@@ -39,68 +74,214 @@ class ArtistRepository:
         ).scalar_one()
         return int(album_count or 0), int(track_count or 0)
 
-    def list_ids_with_albums(self) -> List[Tuple[str, str]]:
+    # ARTIST_STATS_ENABLED: the hero's artist + trigger-maintained counters in
+    # one primary-key read (no stats row = no links yet = 0/0).
+    def get_with_counts_by_id(self, artist_id: str) -> Optional[Tuple[Artist, int, int]]:
+        return self._with_counts(Artist.id == artist_id)
+
+    def get_with_counts_by_spotify_id(self, spotify_id: str) -> Optional[Tuple[Artist, int, int]]:
+        return self._with_counts(Artist.spotify_id == spotify_id)
+
+    def _with_counts(self, filter_expr) -> Optional[Tuple[Artist, int, int]]:
+        s = artist_stats_table
+        row = self.db.execute(
+            select(
+                Artist,
+                func.coalesce(s.c.album_count, 0),
+                func.coalesce(s.c.track_count, 0),
+            )
+            .outerjoin(s, s.c.artist_id == Artist.id)
+            .where(filter_expr)
+        ).first()
+        if row is None:
+            return None
+        artist, album_count, track_count = row
+        return artist, int(album_count), int(track_count)
+
+    def iter_ids_with_albums(
+        self,
+        *,
+        after=None,
+        since=None,
+        limit: Optional[int] = None,
+        batch: int = 1000,
+    ) -> Iterator[Tuple[str, str]]:
         # Artists with ≥1 catalog album — the set worth a /artist/[id] hub (an
         # album-less artist would render an empty hub). Used by the front's
-        # build-time getStaticPaths enumeration. group_by dedups artists that
-        # appear on multiple albums.
+        # build-time getStaticPaths enumeration.
+        # - Keyset on the primary key: `after` = last id of the previous page, so
+        #   each page is an index range scan (no GROUP BY / sort over the catalog).
+        # - `since`: only artists whose first album was absorbed after it (delta
+        #   for incremental builds; albums.created_at, migration 007 indexes).
+        # - yield_per streams from a server-side cursor instead of materializing.
+        links = album_artists_table.c
+        if since is None:
+            cond = exists().where(links.artist_id == Artist.id)
+        else:
+            newer = (
+                select(links.artist_id)
+                .join(Album, Album.id == links.album_id)
+                .where(Album.created_at > since)
+            )
+            older = (
+                exists()
+                .where(links.artist_id == Artist.id)
+                .where(links.album_id == Album.id)
+                .where(Album.created_at <= since)
+            )
+            cond = and_(Artist.id.in_(newer), ~older)
+        stmt = select(Artist.id, Artist.name).where(cond).order_by(Artist.id)
+        if after is not None:
+            stmt = stmt.where(Artist.id > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        for r in self.db.execute(stmt, execution_options={"yield_per": batch}):
+            yield str(r.id), r.name
+
+    def get_by_ids(self, artist_ids: Iterable) -> List[ArtistRow]:
+        ids = list(artist_ids)
+        if not ids:
+            return []
+        rows = self.db.execute(select(*_ROW_COLUMNS).where(Artist.id.in_(ids))).all()
+        return [ArtistRow(*r) for r in rows]
+
+    # Credited artists (id/name/popularity) per track / album, for the track
+    # list items' primary + feat pick. One query each, keyed by the owner id.
+    def refs_by_track_ids(self, track_ids: List) -> Dict[object, Tuple[ArtistRef, ...]]:
+        if not track_ids:
+            return {}
         rows = self.db.execute(
-            select(Artist.id, Artist.name)
+            select(track_artists_table.c.track_id, *_REF_COLUMNS)
+            .join(track_artists_table, track_artists_table.c.artist_id == Artist.id)
+            .where(track_artists_table.c.track_id.in_(track_ids))
+        ).all()
+        return _group_refs(rows)
+
+    def refs_by_album_ids(self, album_ids: List) -> Dict[object, Tuple[ArtistRef, ...]]:
+        if not album_ids:
+            return {}
+        rows = self.db.execute(
+            select(album_artists_table.c.album_id, *_REF_COLUMNS)
             .join(album_artists_table, album_artists_table.c.artist_id == Artist.id)
-            .group_by(Artist.id, Artist.name)
-            .order_by(Artist.name)
+            .where(album_artists_table.c.album_id.in_(album_ids))
         ).all()
-        return [(str(r.id), r.name) for r in rows]
+        return _group_refs(rows)
+
+    def search_rows_by_name(self, q: str, limit: int, offset: int) -> List[Row]:
+        stmt, order_keys = self._literal_statement(q)
+        try:
+            return list(self.db.execute(stmt.order_by(*order_keys).limit(limit).offset(offset)).all())
+        except DBAPIError:
+            # The transaction is aborted: swallowing would fail the next query
+            # with InFailedSqlTransaction. A statement_timeout cancel (57014)
+            # must also reach app/main.py's 503 handler.
+            raise
+        except Exception as e:
+            logger.error("search_rows_by_name failed for q=%r: %s", q, e, exc_info=True)
+            return []
+
+    # Batched stage one (app/repositories/literal_batch.py): the same match
+    # for many (q, limit, offset) in one statement, rows per spec.
+    def search_rows_by_name_batch(self, specs: Sequence[LiteralSpec]) -> List[List[Row]]:
+        try:
+            return literal_rows_batch(self.db, specs, self._literal_statement)
+        except DBAPIError:
+            raise  # as in search_rows_by_name
+        except Exception as e:
+            logger.error("search_rows_by_name_batch failed for %d queries: %s", len(specs), e, exc_info=True)
+            return [[] for _ in specs]
 
-    def search_by_name(self, q: str, limit: int, offset: int) -> List[Artist]:
+    @staticmethod
+    def _literal_statement(q) -> tuple:
         # Match on Artist.name (substring, case-insensitive) OR any element of the
         # MusicBrainz-populated `aliases` JSONB array. Aliases let users find
         # Korean transliterations and alternate spellings.
-        pat = f"%{q}%"
-        alias_match = text(
-            "EXISTS (SELECT 1 FROM jsonb_array_elements_text(artists.aliases) AS e WHERE e ILIKE :alias_pat)"
-        ).bindparams(alias_pat=pat)
+        pat = contains_pattern(q)
+        alias = func.jsonb_array_elements_text(literal_column("artists.aliases")).table_valued(
+            "value"
+        ).render_derived("e")
+        alias_match = exists().where(alias.c.value.ilike(pat)).correlate_except(alias)
         substring_match = or_(Artist.name.ilike(pat), alias_match)
+        # Relevance first (app/core/ranking.py: exact > startswith > contains
+        # on the name, blended with popularity) — the phase-4 order, so
+        # LIMIT/OFFSET cut the slice the service would rank highest.
+        relevance = sql_blend(Artist.name, q, Artist.popularity)
 
         if settings.SEARCH_USE_PG_TRGM:
             # V12 pg_trgm: admit a fuzzy fallback so one-edit typos that ILIKE
-            # can't span are recovered. Substring/alias matches always rank above
-            # fuzzy-only ones (tier bool first), and within the substring tier the
-            # original popularity ordering is preserved — so currently-passing
-            # queries keep their exact top-N. similarity is the final tiebreaker
-            # (and the sole within-tier signal for the fuzzy-only tail).
+            # can't span are recovered. Fuzzy-only rows sit on the relevance
+            # floor; among equal blends substring/alias matches still come
+            # first and the original popularity ordering is preserved.
+            # similarity is the final tiebreaker (and the sole within-tier
+            # signal for the fuzzy-only tail).
             sim = func.similarity(Artist.name, q)
-            stmt = (
-                select(Artist)
-                .where(or_(substring_match, sim >= settings.SEARCH_TRGM_THRESHOLD))
-                .order_by(
+            return (
+                select(*_THIN_COLUMNS).where(
+                    or_(substring_match, sim >= settings.SEARCH_TRGM_THRESHOLD)
+                ),
+                (
+                    relevance.desc(),
                     substring_match.desc(),
                     Artist.popularity.desc().nullslast(),
                     Artist.followers.desc().nullslast(),
                     Artist.views.desc(),
                     sim.desc().nullslast(),
-                )
-                .limit(limit)
-                .offset(offset)
+                ),
             )
-        else:
-            stmt = (
-                select(Artist)
-                .where(substring_match)
-                .order_by(
-                    Artist.popularity.desc().nullslast(),
-                    Artist.followers.desc().nullslast(),
-                    Artist.views.desc(),
-                )
-                .limit(limit)
-                .offset(offset)
+        return (
+            select(*_THIN_COLUMNS).where(substring_match),
+            (
+                relevance.desc(),
+                Artist.popularity.desc().nullslast(),
+                Artist.followers.desc().nullslast(),
+                Artist.views.desc(),
+            ),
+        )
+
+    # Query planner (app/core/search_plan.py) `prefix` strategy: 1–2 character
+    # queries as a name-prefix range scan on idx_artists_name_prefix
+    # (db/migrations/009) rather than a full-table substring scan. Aliases are
+    # not consulted — too short a query to be one.
+    def search_rows_by_prefix(self, q: str, limit: int, offset: int) -> List[Row]:
+        stmt = (
+            select(*_THIN_COLUMNS)
+            .where(prefix_match(Artist.name, q))
+            .order_by(
+                sql_blend(Artist.name, q, Artist.popularity).desc(),
+                Artist.popularity.desc().nullslast(),
+                Artist.followers.desc().nullslast(),
             )
-        try:
-            return list(self.db.execute(stmt).scalars().all())
-        except Exception as e:
-            logger.error("search_by_name failed for q=%r: %s", q, e, exc_info=True)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(self.db.execute(stmt).all())
+
+    # Planner `spotify_id` strategy: the exact-id row, thin.
+    def search_rows_by_spotify_id(self, spotify_id: str) -> List[Row]:
+        stmt = select(*_THIN_COLUMNS).where(Artist.spotify_id == spotify_id)
+        return list(self.db.execute(stmt).all())
+
+    # BUG-19 expansion (thin): credited artists of the matched albums / tracks,
+    # one query per bucket. Rows carry the owning album_id / track_id.
+    def rows_by_album_ids(self, album_ids: List) -> List[Row]:
+        if not album_ids:
             return []
+        stmt = (
+            select(album_artists_table.c.album_id, *_THIN_COLUMNS)
+            .join(album_artists_table, album_artists_table.c.artist_id == Artist.id)
+            .where(album_artists_table.c.album_id.in_(album_ids))
+        )
+        return list(self.db.execute(stmt).all())
 
+    def rows_by_track_ids(self, track_ids: List) -> List[Row]:
+        if not track_ids:
+            return []
+        stmt = (
+            select(track_artists_table.c.track_id, *_THIN_COLUMNS)
+            .join(track_artists_table, track_artists_table.c.artist_id == Artist.id)
+            .where(track_artists_table.c.track_id.in_(track_ids))
+        )
+        return list(self.db.execute(stmt).all())
 
     # 여러 spotify_id를 한 번에 조회
     def get_map_by_spotify_ids(self, spotify_ids: List[str]) -> Dict[str, Artist]:
@@ -147,4 +328,11 @@ class ArtistRepository:
             ext_refs=ext_refs or {},
         )
         self.db.add(ent)
-        return ent
\ No newline at end of file
+        return ent
+
+
+def _group_refs(rows) -> Dict[object, Tuple[ArtistRef, ...]]:
+    grouped: Dict[object, List[ArtistRef]] = {}
+    for owner_id, ar_id, name, popularity in rows:
+        grouped.setdefault(owner_id, []).append(ArtistRef(ar_id, name, popularity))
+    return {k: tuple(v) for k, v in grouped.items()}
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+# `artist_stats` is owned by this service (db/migrations/004_artist_stats.sql),
+# declared here as a Core table. The counters are maintained by triggers on
+# album_artists / track_artists; the service only reads them (and reconciles).
+artist_stats_table = Table(
+    "artist_stats",
+    MetaData(),
+    Column("artist_id", UUID(as_uuid=True), primary_key=True),
+    Column("album_count", Integer, nullable=False),
+    Column("track_count", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+class ArtistStatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    # Recount from the join tables and fix drifted rows; returns how many were
+    # corrected (0 = the triggers kept up). Caller commits.
+    def reconcile(self) -> int:
+        return int(self.db.execute(text("SELECT artist_stats_reconcile()")).scalar_one())
@@ -0,0 +1,61 @@
+"""Set-based unified-search stage one for a batch of queries
+(POST /search/unified:batch).
+
+The repositories build their literal-match statement from `q` as either a
+Python string (one query, bound parameters) or a column of a VALUES list
+`qs(idx, q, lim, off)`. `literal_rows_batch` runs the column form once per
+bucket as a LATERAL join — N queries in one round trip, each keeping its own
+ORDER BY / LIMIT / OFFSET — and splits the rows back per query.
+"""
+from __future__ import annotations
+
+from typing import Callable, List, Sequence, Tuple
+
+from sqlalchemy import Integer, Text, column, func, select, true, values
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+# (q, limit, offset) — one query's stage-one arguments.
+LiteralSpec = Tuple[str, int, int]
+
+
+def contains_pattern(q):
+    """`ILIKE` operand for a substring match of `q` (str or SQL expression)."""
+    if isinstance(q, str):
+        return f"%{q}%"
+    return func.concat("%", q, "%")
+
+
+def literal_rows_batch(
+    db: Session,
+    specs: Sequence[LiteralSpec],
+    build: Callable[[object], Tuple[object, tuple]],
+) -> List[List[Row]]:
+    """Run `build(q)` — (filtered select, ORDER BY keys) — for every spec in
+    one statement. Returns the rows per spec, in spec order, each list in its
+    ORDER BY order (row_number over the same keys carries it out of the
+    lateral)."""
+    if not specs:
+        return []
+    qs = values(
+        column("idx", Integer), column("q", Text), column("lim", Integer), column("off", Integer),
+        name="qs",
+    ).data([(i, q, limit, offset) for i, (q, limit, offset) in enumerate(specs)])
+    stmt, order_keys = build(qs.c.q)
+    pos = func.row_number().over(order_by=order_keys).label("batch_pos")
+    matches = (
+        stmt.add_columns(pos)
+        .order_by(pos)
+        .limit(qs.c.lim)
+        .offset(qs.c.off)
+        .lateral("m")
+    )
+    out: List[List[Row]] = [[] for _ in specs]
+    rows = db.execute(
+        select(qs.c.idx, matches)
+        .select_from(qs.join(matches, true()))
+        .order_by(qs.c.idx, matches.c.batch_pos)
+    ).all()
+    for row in rows:
+        out[row.idx].append(row)
+    return out
@@ -0,0 +1,46 @@
+from typing import Dict, List
+
+from sqlalchemy import BigInteger, Column, DateTime, MetaData, Table, Text, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+# `search_query_stats` is owned by this service
+# (db/migrations/003_search_query_stats.sql), declared here as a Core table.
+search_query_stats_table = Table(
+    "search_query_stats",
+    MetaData(),
+    Column("q", Text, primary_key=True),
+    Column("hits", BigInteger, nullable=False),
+    Column("first_seen_at", DateTime, nullable=False),
+    Column("last_seen_at", DateTime, nullable=False),
+)
+
+
+class QueryStatsRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_hits(self, counts: Dict[str, int]) -> None:
+        rows = [{"q": q, "hits": n} for q, n in counts.items() if q and n > 0]
+        if not rows:
+            return
+        t = search_query_stats_table
+        stmt = pg_insert(t).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["q"],
+            set_={"hits": t.c.hits + stmt.excluded.hits, "last_seen_at": func.now()},
+        )
+        self.db.execute(stmt)
+
+    # 최근 window_days 안에 검색된 것 중 누적 hits 상위 n 개 (canonical q).
+    def top_queries(self, n: int, window_days: int) -> List[str]:
+        if n <= 0:
+            return []
+        t = search_query_stats_table
+        stmt = (
+            select(t.c.q)
+            .where(t.c.last_seen_at > func.now() - func.make_interval(0, 0, 0, window_days))
+            .order_by(t.c.hits.desc(), t.c.q)
+            .limit(n)
+        )
+        return list(self.db.scalars(stmt).all())
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, MetaData, Table, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+
+# `search_documents` is owned by this service (db/migrations/008_search_documents.sql),
+# declared here as a Core table: one tsvector per album / track — title (A),
+# credited artists' names and aliases (B), a track's album title (C) — kept
+# current by triggers. Album and track repos join it for SEARCH_FTS_ENABLED.
+search_documents_table = Table(
+    "search_documents",
+    MetaData(),
+    Column("kind", Text, primary_key=True),
+    Column("entity_id", UUID(as_uuid=True), primary_key=True),
+    Column("document", TSVECTOR, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def fts_query(q: str):
+    # Every query word must match (plainto_tsquery ANDs them); Hangul words
+    # become their bigrams, as in the documents.
+    return func.plainto_tsquery("simple", func.search_hangul_bigrams(q))
@@ -0,0 +1,109 @@
+"""Offline-search-index-backed stand-ins for the catalog repositories
+(SEARCH_INDEX_PATH, app/core/search_index.py).
+
+SearchService wraps its repositories in these when an index is mapped. Each
+overrides only the stage-one / expansion reads unified search makes: it
+answers from the index when the index can answer exactly, and otherwise calls
+the wrapped DB repository — which also serves every other method (the top-N
+hydrate, writes) through __getattr__.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Sequence, Set
+
+from app.core.config import settings
+from app.core.search_index import SearchIndex
+
+
+def _complete(hits, limit: int) -> bool:
+    # Index hits are the substring matches in DB order. They are the answer
+    # unless they may be incomplete: none at all (the row may postdate the
+    # build), or a short page that pg_trgm would extend with a fuzzy tail.
+    if not hits:
+        return False
+    return len(hits) >= limit or not settings.SEARCH_USE_PG_TRGM
+
+
+def _search_batch(index: SearchIndex, kind: str, specs: Sequence, db_batch: Callable) -> List[list]:
+    # Per spec as the single-query methods decide; the misses go to the DB
+    # in one batched statement.
+    out = [index.search(kind, q, limit, offset) for q, limit, offset in specs]
+    misses = [i for i, (hits, spec) in enumerate(zip(out, specs)) if not _complete(hits, spec[1])]
+    if misses:
+        for i, rows in zip(misses, db_batch([specs[i] for i in misses])):
+            out[i] = rows
+    return out
+
+
+class _IndexBacked:
+    def __init__(self, index: SearchIndex, db_repo) -> None:
+        self.index = index
+        self.db_repo = db_repo
+
+    def __getattr__(self, name):
+        return getattr(self.db_repo, name)
+
+
+class IndexedArtistRepository(_IndexBacked):
+    def search_rows_by_name(self, q: str, limit: int, offset: int) -> list:
+        hits = self.index.search("ar", q, limit, offset)
+        if _complete(hits, limit):
+            return hits
+        return self.db_repo.search_rows_by_name(q, limit, offset)
+
+    def search_rows_by_name_batch(self, specs: Sequence) -> List[list]:
+        return _search_batch(self.index, "ar", specs, self.db_repo.search_rows_by_name_batch)
+
+    def rows_by_album_ids(self, album_ids: List) -> list:
+        hits = self.index.credited_artists("al", album_ids)
+        return self.db_repo.rows_by_album_ids(album_ids) if hits is None else hits
+
+    def rows_by_track_ids(self, track_ids: List) -> list:
+        hits = self.index.credited_artists("tr", track_ids)
+        return self.db_repo.rows_by_track_ids(track_ids) if hits is None else hits
+
+
+class IndexedAlbumRepository(_IndexBacked):
+    def search_rows_by_title(self, q: str, limit: int, offset: int) -> list:
+        hits = self.index.search("al", q, limit, offset)
+        if _complete(hits, limit):
+            return hits
+        return self.db_repo.search_rows_by_title(q, limit, offset)
+
+    def search_rows_by_title_batch(self, specs: Sequence) -> List[list]:
+        return _search_batch(self.index, "al", specs, self.db_repo.search_rows_by_title_batch)
+
+    def list_rows_by_artist_id(self, artist_id, limit: int = 50) -> list:
+        hits = self.index.artist_albums(artist_id, limit)
+        return self.db_repo.list_rows_by_artist_id(artist_id, limit=limit) if hits is None else hits
+
+    def rows_by_ids(self, album_ids: List) -> list:
+        hits = self.index.rows_by_ids("al", album_ids)
+        return self.db_repo.rows_by_ids(album_ids) if hits is None else hits
+
+    def artist_ids_by_album_ids(self, album_ids: List) -> Dict[object, Set]:
+        credits = self.index.credit_ids("al", album_ids)
+        return self.db_repo.artist_ids_by_album_ids(album_ids) if credits is None else credits
+
+
+class IndexedTrackRepository(_IndexBacked):
+    def search_rows_by_title(self, q: str, limit: int, offset: int) -> list:
+        hits = self.index.search("tr", q, limit, offset)
+        if _complete(hits, limit):
+            return hits
+        return self.db_repo.search_rows_by_title(q, limit, offset)
+
+    def search_rows_by_title_batch(self, specs: Sequence) -> List[list]:
+        return _search_batch(self.index, "tr", specs, self.db_repo.search_rows_by_title_batch)
+
+    def list_rows_by_artist_id(self, artist_id, limit: int = 50) -> list:
+        hits = self.index.artist_tracks(artist_id, limit)
+        return self.db_repo.list_rows_by_artist_id(artist_id, limit=limit) if hits is None else hits
+
+    def list_rows_by_album_ids(self, album_ids: List, limit: int) -> list:
+        hits = self.index.album_tracks(album_ids, limit)
+        return self.db_repo.list_rows_by_album_ids(album_ids, limit) if hits is None else hits
+
+    def artist_ids_by_track_ids(self, track_ids: List) -> Dict[object, Set]:
+        credits = self.index.credit_ids("tr", track_ids)
+        return self.db_repo.artist_ids_by_track_ids(track_ids) if credits is None else credits
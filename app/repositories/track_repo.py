@@ -1,12 +1,69 @@
 from __future__ import annotations
 
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import func, select
-from typing import Iterable, List
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, and_, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from typing import Dict, Iterable, List, Optional, Sequence, Set
 
 from myblog_shared_db.models import Track, Album, track_artists_table
 from app.repositories.artist_repo import ArtistRepository
 from app.core.config import settings
+from app.core.ranking import sql_blend
+from app.core.search_plan import prefix_match
+from app.domain.rows import TrackAlbumRef, TrackRow
+from app.repositories.literal_batch import LiteralSpec, contains_pattern, literal_rows_batch
+from app.repositories.search_document_repo import fts_query, search_documents_table
+
+# Unified-search stage-one projection. Tracks have no popularity column, so
+# ranking reads the album's popularity / release_date (outer join: a track row
+# without its album still ranks, as 0 popularity).
+_THIN_COLUMNS = (
+    Track.id,
+    Track.title,
+    Track.album_id,
+    Album.popularity.label("album_popularity"),
+    Album.release_date.label("album_release_date"),
+)
+
+# `artist_top_tracks` is a materialized view owned by this service
+# (db/migrations/005_artist_top_tracks.sql), declared here as a Core table:
+# each artist's top TOP_TRACKS_DEPTH tracks in list_top_tracks_by_artist order.
+artist_top_tracks_table = Table(
+    "artist_top_tracks",
+    MetaData(),
+    Column("artist_id", UUID(as_uuid=True), primary_key=True),
+    Column("rank", Integer, primary_key=True),
+    Column("track_id", UUID(as_uuid=True), nullable=False),
+    Column("refreshed_at", DateTime(timezone=True), nullable=False),
+)
+TOP_TRACKS_DEPTH = 50
+
+# Read-path DTO projection (app/domain/rows.py): the track columns plus the
+# album fields a list item shows; credited artists are attached by _to_rows.
+_ROW_COLUMNS = (
+    Track.id,
+    Track.title,
+    Track.track_no,
+    Track.duration_sec,
+    Track.spotify_id,
+    Track.album_id,
+    Album.title,
+    Album.cover_url,
+    Album.release_date,
+    Album.spotify_id,
+)
+
+# PRIMARY_ARTIST_COLUMNS_ENABLED (db/migrations/006_primary_artist_columns.sql):
+# the trigger-maintained primary artist, album fallback included — so _to_rows
+# skips the album-artists query and the mapper skips its popularity sort.
+_PRIMARY_COLUMNS = (literal_column("tracks.primary_artist_name").label("primary_artist_name"),)
+
+
+def _row_columns() -> tuple:
+    if settings.PRIMARY_ARTIST_COLUMNS_ENABLED:
+        return _ROW_COLUMNS + _PRIMARY_COLUMNS
+    return _ROW_COLUMNS
 
 
 class TrackRepository:
@@ -14,82 +71,108 @@ class TrackRepository:
         self.db = db
         self.artist_repo = artist_repo
 
-    def get_by_album(self, album_id: str) -> List[Track]:
-        return list(
-            self.db.execute(
-                select(Track)
-                .options(selectinload(Track.artists))
-                .where(Track.album_id == album_id)
-                .order_by(Track.track_no.asc().nullslast())
-            )
-            .scalars()
-            .all()
-        )
+    # ✅ 추가: title 기반 트랙 검색(DB) — unified search stage one (thin rows)
+    def search_rows_by_title(self, q: str, limit: int, offset: int) -> List[Row]:
+        stmt, order_keys = self._literal_statement(q)
+        return list(self.db.execute(stmt.order_by(*order_keys).limit(limit).offset(offset)).all())
 
-    # ✅ 추가: title 기반 트랙 검색(DB)
-    def search_by_title(self, q: str, limit: int, offset: int) -> List[Track]:
-        substring_match = Track.title.ilike(f"%{q}%")
-        base = select(Track).options(
-            selectinload(Track.album).selectinload(Album.artists),  # album_title/cover + 대표 artist용
-            selectinload(Track.artists),                            # track artist 우선
-        )
+    # Batched stage one (see ArtistRepository.search_rows_by_name_batch).
+    def search_rows_by_title_batch(self, specs: Sequence[LiteralSpec]) -> List[List[Row]]:
+        return literal_rows_batch(self.db, specs, self._literal_statement)
+
+    @staticmethod
+    def _literal_statement(q) -> tuple:
+        substring_match = Track.title.ilike(contains_pattern(q))
+        # Relevance-ranked in SQL (app/core/ranking.py), blended with the
+        # album's popularity as _rank_tracks does.
+        relevance = sql_blend(Track.title, q, Album.popularity)
+        base = select(*_THIN_COLUMNS).outerjoin(Album, Track.album_id == Album.id)
         if settings.SEARCH_USE_PG_TRGM:
-            # V12 pg_trgm fuzzy fallback (mirrors artist/album repos) — substring
-            # matches first, original views/created_at order preserved within,
-            # similarity as the fuzzy-tail signal + final tiebreaker.
+            # V12 pg_trgm fuzzy fallback (mirrors artist/album repos) — fuzzy-only
+            # rows on the relevance floor, substring matches first among equal
+            # blends, original views/created_at order within, similarity as the
+            # fuzzy-tail signal + final tiebreaker.
             sim = func.similarity(Track.title, q)
-            stmt = (
-                base
-                .where(substring_match | (sim >= settings.SEARCH_TRGM_THRESHOLD))
-                .order_by(
+            return (
+                base.where(substring_match | (sim >= settings.SEARCH_TRGM_THRESHOLD)),
+                (
+                    relevance.desc(),
                     substring_match.desc(),
                     Track.views.desc(),
                     Track.created_at.desc(),
                     sim.desc().nullslast(),
-                )
-                .limit(limit)
-                .offset(offset)
+                ),
             )
-        else:
-            stmt = (
-                base
-                .where(substring_match)
-                .order_by(Track.views.desc(), Track.created_at.desc())
-                .limit(limit)
-                .offset(offset)
+        return (
+            base.where(substring_match),
+            (relevance.desc(), Track.views.desc(), Track.created_at.desc()),
+        )
+
+    # Query planner `prefix` strategy (see ArtistRepository.search_rows_by_prefix).
+    def search_rows_by_prefix(self, q: str, limit: int, offset: int) -> List[Row]:
+        stmt = (
+            select(*_THIN_COLUMNS)
+            .outerjoin(Album, Track.album_id == Album.id)
+            .where(prefix_match(Track.title, q))
+            .order_by(
+                sql_blend(Track.title, q, Album.popularity).desc(),
+                Track.views.desc(),
+                Track.created_at.desc(),
             )
-        return list(self.db.execute(stmt).scalars().all())
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(self.db.execute(stmt).all())
+
+    def search_rows_by_spotify_id(self, spotify_id: str) -> List[Row]:
+        stmt = (
+            select(*_THIN_COLUMNS)
+            .outerjoin(Album, Track.album_id == Album.id)
+            .where(Track.spotify_id == spotify_id)
+        )
+        return list(self.db.execute(stmt).all())
+
+    # SEARCH_FTS_ENABLED: as AlbumRepository.search_rows_fts; a track's
+    # document also carries its album's artists and title.
+    def search_rows_fts(self, q: str, limit: int) -> List[Row]:
+        doc = search_documents_table
+        tsq = fts_query(q)
+        stmt = (
+            select(*_THIN_COLUMNS)
+            .join(doc, and_(doc.c.kind == "track", doc.c.entity_id == Track.id))
+            .outerjoin(Album, Track.album_id == Album.id)
+            .where(doc.c.document.op("@@")(tsq))
+            .order_by(
+                func.ts_rank(doc.c.document, tsq).desc(),
+                Album.popularity.desc().nullslast(),
+                Track.views.desc(),
+            )
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).all())
 
     # BUG-19 expansion: tracks for a single matched artist, capped at LIMIT
     # at the SQL layer per Q2 (default 50, "not post-fetch"), ordered by
     # Album.release_date DESC NULLS LAST (no Track.popularity column today).
-    def list_by_artist_id(self, artist_id, limit: int = 50) -> List[Track]:
+    def list_rows_by_artist_id(self, artist_id, limit: int = 50) -> List[Row]:
         stmt = (
-            select(Track)
-            .options(
-                selectinload(Track.album).selectinload(Album.artists),
-                selectinload(Track.artists),
-            )
+            select(*_THIN_COLUMNS)
             .join(track_artists_table, track_artists_table.c.track_id == Track.id)
             .join(Album, Track.album_id == Album.id)
             .where(track_artists_table.c.artist_id == artist_id)
             .order_by(Album.release_date.desc().nullslast())
             .limit(limit)
         )
-        return list(self.db.execute(stmt).scalars().all())
+        return list(self.db.execute(stmt).all())
 
     # FEAT-writer-lowfreq-redesign Step 3: top-tracks for the artist drill-in.
     # Ordering, per RFC: views DESC → albums.popularity DESC NULLS LAST →
     # albums.release_date DESC NULLS LAST → track_no ASC (stable).
     # Covers cold-catalog case where views=0 and popularity flat — newest album wins.
     # Selects across every album the artist credits on (track_artists join).
-    def list_top_tracks_by_artist(self, artist_id, limit: int = 10) -> List[Track]:
+    def list_top_tracks_by_artist(self, artist_id, limit: int = 10) -> List[TrackRow]:
         stmt = (
-            select(Track)
-            .options(
-                selectinload(Track.album).selectinload(Album.artists),
-                selectinload(Track.artists),
-            )
+            select(*_row_columns())
             .join(track_artists_table, track_artists_table.c.track_id == Track.id)
             .join(Album, Track.album_id == Album.id)
             .where(track_artists_table.c.artist_id == artist_id)
@@ -101,23 +184,107 @@ class TrackRepository:
             )
             .limit(limit)
         )
-        return list(self.db.execute(stmt).scalars().all())
+        return self._to_rows(self.db.execute(stmt).all())
+
+    # Same list from the artist_top_tracks materialized view: an index range scan
+    # on (artist_id, rank). None — caller falls back to the live query — when the
+    # view holds nothing for the artist (absorbed after the last refresh) or was
+    # refreshed more than `max_age_sec` ago (DB clock, like absorb_repo).
+    def list_top_tracks_materialized(
+        self, artist_id, limit: int, max_age_sec: float
+    ) -> Optional[List[TrackRow]]:
+        mv = artist_top_tracks_table
+        age_sec = func.extract("epoch", func.now() - mv.c.refreshed_at)
+        stmt = (
+            select(*_row_columns(), age_sec)
+            .select_from(mv)
+            .join(Track, Track.id == mv.c.track_id)
+            .join(Album, Track.album_id == Album.id)
+            .where(mv.c.artist_id == artist_id, mv.c.rank <= limit)
+            .order_by(mv.c.rank)
+        )
+        rows = self.db.execute(stmt).all()
+        if not rows or rows[0][-1] > max_age_sec:
+            return None
+        return self._to_rows([r[:-1] for r in rows])
 
-    # BUG-19 expansion: tracks for matched album ids, bulk-loaded.
-    # Used when an album literal-matched and we need its tracks for the track bucket.
-    def list_by_album_ids(self, album_ids: List) -> List[Track]:
+    # BUG-19 expansion: tracks for matched album ids, one bulk query. Ordered
+    # the way expansion tracks rank (album popularity, then newest album), so
+    # the SQL LIMIT keeps exactly the rows that could survive the final trim.
+    def list_rows_by_album_ids(self, album_ids: List, limit: int) -> List[Row]:
         if not album_ids:
             return []
         stmt = (
-            select(Track)
-            .options(
-                selectinload(Track.album).selectinload(Album.artists),
-                selectinload(Track.artists),
-            )
+            select(*_THIN_COLUMNS)
+            .join(Album, Track.album_id == Album.id)
             .where(Track.album_id.in_(album_ids))
-            .order_by(Track.track_no.asc().nullslast())
+            .order_by(
+                Album.popularity.desc().nullslast(),
+                Album.release_date.desc().nullslast(),
+                Track.track_no.asc().nullslast(),
+            )
+            .limit(limit)
         )
-        return list(self.db.execute(stmt).scalars().all())
+        return list(self.db.execute(stmt).all())
+
+    # Unified search stage three: the surviving track ids as TrackRow DTOs.
+    def get_by_ids(self, track_ids: Iterable) -> List[TrackRow]:
+        ids = list(track_ids)
+        if not ids:
+            return []
+        stmt = (
+            select(*_row_columns())
+            .outerjoin(Album, Track.album_id == Album.id)
+            .where(Track.id.in_(ids))
+        )
+        return self._to_rows(self.db.execute(stmt).all())
+
+    def refresh_top_tracks(self) -> None:
+        # CONCURRENTLY: readers keep the previous snapshot during the rebuild.
+        self.db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY artist_top_tracks"))
+
+    def _to_rows(self, rows) -> List[TrackRow]:
+        """Attach credited artists: one query for the tracks' own artists, and
+        one for album artists of only those tracks that have none (the mapper's
+        primary-artist fallback) — instead of selectinload-ing both graphs.
+        Rows that carry primary_artist_name already have the fallback resolved,
+        so the album-artists query is skipped."""
+        if not rows:
+            return []
+        n = len(_ROW_COLUMNS)
+        has_primary = len(rows[0]) > n
+        track_refs = self.artist_repo.refs_by_track_ids([r[0] for r in rows])
+        album_refs = {} if has_primary else self.artist_repo.refs_by_album_ids(
+            list({r[5] for r in rows if r[0] not in track_refs and r[6] is not None})
+        )
+        out: List[TrackRow] = []
+        for r in rows:
+            t_id, title, track_no, dur, spid, al_id, al_title, al_cover, al_rd, al_spid = r[:n]
+            primary = r[n] if has_primary else None
+            album = (
+                TrackAlbumRef(al_title, al_cover, al_rd, al_spid, album_refs.get(al_id, ()))
+                if al_title is not None
+                else None
+            )
+            out.append(
+                TrackRow(
+                    t_id, title, track_no, dur, spid, al_id, album, track_refs.get(t_id, ()), primary
+                )
+            )
+        return out
+
+    # Step 6 decomposition: credited artist ids per track, link table only.
+    def artist_ids_by_track_ids(self, track_ids: List) -> Dict[object, Set]:
+        if not track_ids:
+            return {}
+        rows = self.db.execute(
+            select(track_artists_table.c.track_id, track_artists_table.c.artist_id)
+            .where(track_artists_table.c.track_id.in_(track_ids))
+        ).all()
+        result: Dict[object, Set] = {}
+        for t_id, ar_id in rows:
+            result.setdefault(t_id, set()).add(ar_id)
+        return result
 
     def upsert_tracks_with_artists_db_only(
         self,
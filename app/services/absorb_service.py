@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.schemas import AbsorbStatus
+from app.repositories.absorb_repo import STATE_FAILED, STATE_PENDING, AbsorbRepository
+
+
+class AbsorbService:
+    """Read/write side of `absorb_requests` (db/migrations/002).
+
+    Every method is a no-op / None while ABSORB_TRACKING_ENABLED is off, so
+    callers don't need their own flag checks and the pre-migration behaviour
+    (404 until the row exists, enqueue every missing id) is unchanged.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = AbsorbRepository(db)
+
+    def pending_status(self, kind: str, spotify_id: str) -> Optional[AbsorbStatus]:
+        """A live pending request → AbsorbStatus with an ETA; anything else
+        (unknown, done, failed, or pending past the in-flight TTL) → None."""
+        if not settings.ABSORB_TRACKING_ENABLED:
+            return None
+        row = self.repo.get_status(kind, spotify_id)
+        if row is None or row.state != STATE_PENDING:
+            return None
+        age = float(row.age_sec or 0)
+        if age > settings.ABSORB_INFLIGHT_TTL_SEC:
+            return None
+        return AbsorbStatus(
+            kind=kind,
+            spotify_id=spotify_id,
+            status=STATE_PENDING,
+            enqueued_at=row.enqueued_at.isoformat() if row.enqueued_at else None,
+            eta_sec=max(1, int(settings.ABSORB_ETA_SEC - age)),
+        )
+
+    def is_failed(self, kind: str, spotify_id: str) -> bool:
+        if not settings.ABSORB_TRACKING_ENABLED:
+            return False
+        row = self.repo.get_status(kind, spotify_id)
+        return row is not None and row.state == STATE_FAILED
+
+    def drop_in_flight(self, kind: str, spotify_ids: List[str]) -> List[str]:
+        """Filter out ids whose absorb is already pending (within the TTL),
+        preserving input order."""
+        if not settings.ABSORB_TRACKING_ENABLED or not spotify_ids:
+            return spotify_ids
+        in_flight = self.repo.get_in_flight_ids(kind, spotify_ids, settings.ABSORB_INFLIGHT_TTL_SEC)
+        return [i for i in spotify_ids if i not in in_flight]
+
+    def record_enqueued(self, kind: str, spotify_ids: Iterable[str], market: Optional[str]) -> None:
+        if not settings.ABSORB_TRACKING_ENABLED:
+            return
+        self.repo.record_enqueued(kind, spotify_ids, market)
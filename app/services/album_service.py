@@ -1,73 +1,62 @@
+import uuid
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.core.db import fallback_to_primary
+from app.core.longpoll import wait_for
 from app.repositories.album_repo import AlbumRepository
-from app.repositories.artist_repo import ArtistRepository
-from app.repositories.track_repo import TrackRepository
-from app.domain.schemas import AlbumDetail, AlbumOut, ArtistOut, TrackOut
+from app.repositories.absorb_repo import KIND_ALBUM
+from app.services.absorb_service import AbsorbService
+from app.domain.schemas import AbsorbStatus, AlbumDetail
 
 
 class AlbumService:
     def __init__(self, db: Session):
         self.db = db
         self.albums = AlbumRepository(db)
-        self.artists = ArtistRepository(db)
-        self.tracks = TrackRepository(db, self.artists)
+        self.absorb = AbsorbService(db)
 
     def get_album_detail(self, album_id: str) -> AlbumDetail:
-        al, artists = self.albums.get_with_artists(album_id)
-        if not al:
+        try:
+            uuid.UUID(album_id)
+        except ValueError:
+            # Not a UUID → can't be a row; don't let Postgres reject the cast.
             raise HTTPException(status_code=404, detail="album not found in DB")
-
-        tracks = self.tracks.get_by_album(al.id)
-        album_artist_ids = {a.id for a in artists}
-
-        return AlbumDetail(
-            album=AlbumOut(
-                id=str(al.id),
-                title=al.title,
-                release_date=al.release_date.isoformat() if al.release_date else None,
-                cover_url=al.cover_url,
-                album_type=al.album_type,
-                spotify_id=al.spotify_id,
-                external_url=(al.ext_refs or {}).get("spotify_url"),
-                label=al.label,
-                best_new=bool(getattr(al, "best_new", False)),
-            ),
-            artists=[
-                ArtistOut(
-                    id=str(a.id),
-                    name=a.name,
-                    spotify_id=a.spotify_id,
-                    photo_url=a.photo_url,
-                    genres=a.genres or [],
-                    followers_count=a.followers,
-                    popularity=a.popularity,
-                    spotify_url=a.spotify_url,
-                )
-                for a in artists
-            ],
-            tracks=[
-                TrackOut(
-                    id=str(t.id),
-                    title=t.title,
-                    track_no=t.track_no,
-                    duration_sec=t.duration_sec,
-                    spotify_id=t.spotify_id,
-                    feat_artist_names=sorted(
-                        ta.name for ta in (t.artists or [])
-                        if ta.id not in album_artist_ids and ta.name
-                    ),
-                )
-                for t in tracks
-            ],
-            meta={"source": "db"},
-        )
-    
+        doc = self.albums.get_detail_json(album_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail="album not found in DB")
+        return AlbumDetail.model_validate_json(doc)
 
     def get_album_detail_by_spotify(self, spotify_id: str) -> AlbumDetail:
-        al = self.albums.get_by_spotify_id(spotify_id)
-        if not al:
+        doc = self.albums.get_detail_json_by_spotify_id(spotify_id)
+        if doc is None and fallback_to_primary(self.db):
+            # Replica miss may just be lag behind the worker's write.
+            doc = self.albums.get_detail_json_by_spotify_id(spotify_id)
+        if doc is None:
             raise HTTPException(status_code=404, detail="album not found in DB")
+        return AlbumDetail.model_validate_json(doc)
+
+    def wait_until_absorbed(self, spotify_id: str, wait: float) -> bool:
+        """`?wait=N` long-poll: block until the worker has written the album row
+        or `wait` seconds pass. The caller then runs the normal lookup, which
+        404s if the row still isn't there. Polls the primary — that's where the
+        worker writes, so replica lag can't stretch the wait."""
+        fallback_to_primary(self.db)
+
+        def probe() -> bool:
+            found = self.albums.exists_by_spotify_id(spotify_id)
+            if not found:
+                # A failed absorb will never produce the row — stop waiting.
+                if self.absorb.is_failed(KIND_ALBUM, spotify_id):
+                    return True
+                # Close the read transaction between probes so the session
+                # doesn't sit idle-in-transaction while we sleep.
+                self.db.rollback()
+            return found
+
+        return wait_for(probe, wait)
 
-        # 내부 UUID로 기존 로직 재사용
-        return self.get_album_detail(str(al.id))
\ No newline at end of file
+    def get_absorb_status(self, spotify_id: str) -> Optional[AbsorbStatus]:
+        # by-spotify miss → is the worker still absorbing it? (None = plain 404)
+        return self.absorb.pending_status(KIND_ALBUM, spotify_id)
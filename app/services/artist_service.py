@@ -1,12 +1,18 @@
 # app/services/artist_service.py
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import DETAIL_MAX_AGE_SEC
+from app.core.config import settings
+from app.core.db import fallback_to_primary
+from app.core.longpoll import wait_for
 from app.repositories.album_repo import AlbumRepository
 from app.repositories.artist_repo import ArtistRepository
-from app.repositories.track_repo import TrackRepository
-from app.domain.schemas import ArtistHero, ArtistIdItem, SearchResult, TrackItem
+from app.repositories.track_repo import TOP_TRACKS_DEPTH, TrackRepository
+from app.repositories.absorb_repo import KIND_ARTIST
+from app.services.absorb_service import AbsorbService
+from app.domain.schemas import AbsorbStatus, ArtistHero, SearchResult, TrackItem
 from app.mappers.album_mapper import AlbumItemMapper
 from app.mappers.track_mapper import TrackItemMapper
 
@@ -25,6 +31,7 @@ class ArtistService:
         # need the extra repos and lazily construct them when omitted.
         self.artist_repo = artist_repo or ArtistRepository(db)
         self.track_repo = track_repo or TrackRepository(db, self.artist_repo)
+        self.absorb = AbsorbService(db)
 
     def list_albums_by_artist(
         self,
@@ -44,34 +51,90 @@ class ArtistService:
     # ----- FEAT-writer-lowfreq-redesign Step 3 -----
 
     def get_hero_by_id(self, artist_id: str) -> Optional[ArtistHero]:
+        if settings.ARTIST_STATS_ENABLED:
+            return self._to_hero_with_counts(self.artist_repo.get_with_counts_by_id(artist_id))
         a = self.artist_repo.get_by_id(artist_id)
         if not a:
             return None
         return self._to_hero(a)
 
     def get_hero_by_spotify_id(self, spotify_id: str) -> Optional[ArtistHero]:
-        # No absorb-tracking table exists yet — the by-spotify endpoint
-        # collapses to "row exists → ready, else 404." Frontend polls 404 until
-        # the worker writes the row. Schema keeps `status` so adding a real
-        # pending shape later doesn't break the contract.
-        a = self.artist_repo.get_by_spotify_id(spotify_id)
-        if not a:
+        # Row exists → ready hero. A miss is resolved by the router via
+        # get_pending_hero (absorb_requests) → 202 pending, else 404.
+        lookup = (
+            self.artist_repo.get_with_counts_by_spotify_id
+            if settings.ARTIST_STATS_ENABLED
+            else self.artist_repo.get_by_spotify_id
+        )
+        found = lookup(spotify_id)
+        if not found and fallback_to_primary(self.db):
+            # Replica miss may just be lag behind the worker's write.
+            found = lookup(spotify_id)
+        if not found:
             return None
-        return self._to_hero(a)
+        if settings.ARTIST_STATS_ENABLED:
+            return self._to_hero_with_counts(found)
+        return self._to_hero(found)
+
+    def wait_until_absorbed(self, spotify_id: str, wait: float) -> bool:
+        # `?wait=N` long-poll (app/core/longpoll.py) — same contract as
+        # AlbumService.wait_until_absorbed (polls the primary).
+        fallback_to_primary(self.db)
+
+        def probe() -> bool:
+            found = self.artist_repo.exists_by_spotify_id(spotify_id)
+            if not found:
+                if self.absorb.is_failed(KIND_ARTIST, spotify_id):
+                    return True
+                self.db.rollback()
+            return found
+
+        return wait_for(probe, wait)
+
+    def get_pending_hero(self, spotify_id: str) -> Optional[ArtistHero]:
+        """`status="pending"` hero for an artist the worker is still absorbing
+        (absorb_requests), or None when there's no live request → 404."""
+        pending: Optional[AbsorbStatus] = self.absorb.pending_status(KIND_ARTIST, spotify_id)
+        if pending is None:
+            return None
+        # Nothing but the spotify id is known until the worker writes the row.
+        return ArtistHero(
+            name="",
+            spotify_id=spotify_id,
+            status="pending",
+            eta_sec=pending.eta_sec,
+        )
 
     def list_top_tracks(self, *, artist_id: str, limit: int) -> list[TrackItem]:
-        tracks = self.track_repo.list_top_tracks_by_artist(artist_id, limit=limit)
+        tracks = None
+        if settings.TOP_TRACKS_MATVIEW_ENABLED and limit <= TOP_TRACKS_DEPTH:
+            # Served from the view only while it is fresher than what the edge
+            # may cache anyway (DETAIL_CACHE_CONTROL max-age).
+            tracks = self.track_repo.list_top_tracks_materialized(
+                artist_id, limit, max_age_sec=DETAIL_MAX_AGE_SEC
+            )
+        if tracks is None:
+            tracks = self.track_repo.list_top_tracks_by_artist(artist_id, limit=limit)
         return TrackItemMapper.to_list(tracks)
 
-    def list_artist_ids(self) -> list[ArtistIdItem]:
-        # Catalog-artist id list for the front's build-time /artist/[id] enumeration.
-        return [
-            ArtistIdItem(id=i, name=n)
-            for i, n in self.artist_repo.list_ids_with_albums()
-        ]
+    def iter_artist_ids(
+        self, *, after=None, since=None, limit: Optional[int] = None
+    ) -> Iterator[Tuple[str, str]]:
+        # Catalog-artist (id, name) pairs for the front's build-time /artist/[id]
+        # enumeration, streamed — the router encodes them without an
+        # ArtistIdItem per row.
+        return self.artist_repo.iter_ids_with_albums(after=after, since=since, limit=limit)
 
-    def _to_hero(self, a) -> ArtistHero:
-        album_count, track_count = self.artist_repo.count_albums_and_tracks(str(a.id))
+    def _to_hero_with_counts(self, found) -> Optional[ArtistHero]:
+        if not found:
+            return None
+        a, album_count, track_count = found
+        return self._to_hero(a, (album_count, track_count))
+
+    def _to_hero(self, a, counts: Optional[tuple] = None) -> ArtistHero:
+        album_count, track_count = (
+            counts if counts is not None else self.artist_repo.count_albums_and_tracks(str(a.id))
+        )
         return ArtistHero(
             id=str(a.id),
             name=a.name,
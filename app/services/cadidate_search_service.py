@@ -1,10 +1,15 @@
 import logging
 from typing import Any, Dict, List, Optional, Set
 from app.clients.spotify_client import spotify
+from app.core.config import settings
+from app.core.db import replica_reads
 
 logger = logging.getLogger(__name__)
 from app.clients.sqs_client import SqsClient
 from app.repositories.album_repo import AlbumRepository
+from app.repositories.artist_repo import ArtistRepository
+from app.repositories.absorb_repo import KIND_ALBUM, KIND_ARTIST
+from app.services.absorb_service import AbsorbService
 from sqlalchemy.orm import Session
 
 ALLOWED_TYPES: Set[str] = {"album", "artist", "track"}
@@ -15,7 +20,10 @@ class CandidateSearchService:
     def __init__(self, sqs: SqsClient, db: Session, default_market: str = "KR") -> None:
         self.sqs = sqs
         self.default_market = default_market
+        self.db = db
         self.album_repo = AlbumRepository(db)
+        self.artist_repo = ArtistRepository(db)
+        self.absorb = AbsorbService(db)
 
     # ---------- 외부 API ----------
     def search_candidates(
@@ -60,16 +68,39 @@ class CandidateSearchService:
         try:
             album_ids = self._collect_album_ids(out)
             if album_ids:
-                existing_ids = self.album_repo.get_existing_spotify_ids(album_ids)
+                # Existence pre-check on the replica: a lagging "missing" only
+                # re-enqueues an album the worker upserts idempotently.
+                with replica_reads(self.db):
+                    existing_ids = self.album_repo.get_existing_spotify_ids(album_ids)
                 new_ids = [id_ for id_ in album_ids if id_ not in existing_ids]
+                # absorb_requests: 이미 처리 중인 id 는 다시 보내지 않음 (flag off 면 그대로)
+                new_ids = self.absorb.drop_in_flight(KIND_ALBUM, new_ids)
                 if new_ids:
-                    self.sqs.enqueue_album_sync(new_ids, market or self.default_market)
+                    mkt = market or self.default_market
+                    self.sqs.enqueue_album_sync(new_ids, mkt)
+                    self._record_absorb(out, new_ids, mkt)
         except Exception as e:
             logger.error("SQS enqueue failed: %s", e, exc_info=True)
 
         return out
 
     # ---------- 내부 유틸 ----------
+    def _record_absorb(self, out: Dict[str, Any], album_ids: List[str], market: str) -> None:
+        """Enqueue 된 앨범 + 그 앨범들의 (아직 DB 에 없는) 대표 아티스트를 pending 으로
+        기록 — by-spotify 가 404 대신 pending/ETA 를 답할 수 있게. 실패해도 검색 응답은 그대로."""
+        if not settings.ABSORB_TRACKING_ENABLED:
+            return
+        try:
+            artist_ids = self._collect_artist_ids(out, set(album_ids))
+            with replica_reads(self.db):
+                known = set(self.artist_repo.get_map_by_spotify_ids(artist_ids)) if artist_ids else set()
+            self.absorb.record_enqueued(KIND_ALBUM, album_ids, market)
+            self.absorb.record_enqueued(KIND_ARTIST, [a for a in artist_ids if a not in known], market)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error("absorb_requests record failed: %s", e, exc_info=True)
+
     def _normalize_types(self, typ: str) -> List[str]:
         raw = [t.strip().lower() for t in (typ or "").split(",") if t.strip()]
         # 허용된 것만 남기고, 입력 순서 유지 + 중복 제거
@@ -170,4 +201,29 @@ class CandidateSearchService:
                 seen.add(sid)
                 ordered.append(sid)
 
+        return ordered
+
+    @staticmethod
+    def _collect_artist_ids(out: Dict[str, Any], album_ids: Set[str]) -> List[str]:
+        # enqueue 된 앨범에 딸린 대표 아티스트 spotify id (입력 순서 보존 + 중복 제거)
+        ordered: List[str] = []
+        seen: set[str] = set()
+
+        for a in (out.get("albums") or []):
+            if (a or {}).get("spotify_id") not in album_ids:
+                continue
+            sid = a.get("artist_spotify_id")
+            if sid and sid not in seen:
+                seen.add(sid)
+                ordered.append(sid)
+
+        for t in (out.get("tracks") or []):
+            alb = (t or {}).get("album") or {}
+            if (alb.get("spotify_id") or alb.get("id")) not in album_ids:
+                continue
+            sid = t.get("artist_spotify_id")
+            if sid and sid not in seen:
+                seen.add(sid)
+                ordered.append(sid)
+
         return ordered
\ No newline at end of file
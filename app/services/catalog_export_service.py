@@ -0,0 +1,230 @@
+"""Bulk catalog export for static builds (scripts/export_catalog.py).
+
+The front's build used to enumerate `/artists/ids` and then call the hero,
+albums and top-tracks endpoints once per artist hub. Here the whole catalog —
+artists, albums, tracks and both link tables — is streamed in one read-only
+snapshot with `COPY (SELECT ...) TO STDOUT` (no per-row protocol overhead, no
+ORM), indexed in memory, and every hub is assembled from it with the same
+mappers and orderings the endpoints use, so a hub file is byte-for-byte what
+the API would have answered:
+
+    <out>/artists/ids.json          same items as GET /artists/ids
+    <out>/artists/<artist_id>.json  {"hero", "albums", "top_tracks"}
+
+`write_hubs` fans the artists out over forked worker processes; the loaded
+`Catalog` is inherited copy-on-write, never pickled.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.domain.rows import AlbumRow, ArtistRef, TrackAlbumRef, TrackRow
+from app.domain.schemas import ArtistHero, SearchResult
+from app.mappers.album_mapper import AlbumItemMapper
+from app.mappers.track_mapper import TrackItemMapper
+
+# Hub page sizes = the endpoints' defaults (/artists/{id}/albums, /top-tracks).
+HUB_ALBUMS_LIMIT = 20
+HUB_TOP_TRACKS_LIMIT = 10
+
+# (COPY statement, column types for psycopg's COPY row loader). Column order is
+# what Catalog.add_* unpack.
+COPY_SOURCES: Dict[str, Tuple[str, List[str]]] = {
+    "artists": (
+        "COPY (SELECT id, name, spotify_id, photo_url, genres, followers, popularity,"
+        " spotify_url, aliases, views FROM artists) TO STDOUT",
+        ["uuid", "text", "text", "text", "jsonb", "int8", "int4", "text", "jsonb", "int4"],
+    ),
+    "albums": (
+        "COPY (SELECT id, title, release_date, cover_url, album_type, spotify_id, ext_refs,"
+        " total_tracks, label, popularity,"
+        " COALESCE((to_jsonb(al) ->> 'best_new')::boolean, false)"
+        " FROM albums al) TO STDOUT",
+        ["uuid", "text", "date", "text", "text", "text", "jsonb", "int4", "text", "int4", "bool"],
+    ),
+    "album_artists": (
+        "COPY (SELECT album_id, artist_id FROM album_artists) TO STDOUT",
+        ["uuid", "uuid"],
+    ),
+    "tracks": (
+        "COPY (SELECT id, title, track_no, duration_sec, spotify_id, album_id, views,"
+        " created_at FROM tracks) TO STDOUT",
+        ["uuid", "text", "int4", "int4", "text", "uuid", "int4", "timestamp"],
+    ),
+    "track_artists": (
+        "COPY (SELECT track_id, artist_id FROM track_artists) TO STDOUT",
+        ["uuid", "uuid"],
+    ),
+}
+
+
+def _desc_nulls_last(v) -> tuple:
+    # Sort-key half for `v DESC NULLS LAST` (ints / dates).
+    if v is None:
+        return (1, 0)
+    return (0, -(v.toordinal() if hasattr(v, "toordinal") else v))
+
+
+class Catalog:
+    """The exported tables, indexed by id and by link in both directions. Also
+    the input of the offline search index (app/core/search_index.py)."""
+
+    def __init__(self) -> None:
+        self.artists: Dict[object, tuple] = {}
+        self.albums: Dict[object, AlbumRow] = {}
+        self.tracks: Dict[object, tuple] = {}
+        self.albums_by_artist: Dict[object, List] = {}
+        self.artists_by_album: Dict[object, List] = {}
+        self.tracks_by_artist: Dict[object, List] = {}
+        self.artists_by_track: Dict[object, List] = {}
+
+    def add_rows(self, source: str, rows: Iterable[tuple]) -> None:
+        if source == "artists":
+            for r in rows:
+                self.artists[r[0]] = r
+        elif source == "albums":
+            for r in rows:
+                self.albums[r[0]] = AlbumRow(*r)
+        elif source == "tracks":
+            for r in rows:
+                self.tracks[r[0]] = r
+        elif source == "album_artists":
+            for album_id, artist_id in rows:
+                self.albums_by_artist.setdefault(artist_id, []).append(album_id)
+                self.artists_by_album.setdefault(album_id, []).append(artist_id)
+        elif source == "track_artists":
+            for track_id, artist_id in rows:
+                self.tracks_by_artist.setdefault(artist_id, []).append(track_id)
+                self.artists_by_track.setdefault(track_id, []).append(artist_id)
+        else:
+            raise ValueError(f"unknown export source: {source}")
+
+    def hub_artist_ids(self) -> List:
+        # Artists with ≥1 album, in /artists/ids order (artist id).
+        return sorted((a for a in self.albums_by_artist if a in self.artists), key=str)
+
+    def _refs(self, artist_ids: Iterable) -> Tuple[ArtistRef, ...]:
+        out = []
+        for a_id in artist_ids:
+            a = self.artists.get(a_id)
+            if a is not None:
+                out.append(ArtistRef(a[0], a[1], a[6]))
+        return tuple(out)
+
+    def hero(self, artist_id) -> ArtistHero:
+        a_id, name, spid, photo, genres, followers, popularity, url = self.artists[artist_id][:8]
+        return ArtistHero(
+            id=str(a_id),
+            name=name,
+            spotify_id=spid,
+            photo_url=photo,
+            genres=list(genres or []),
+            followers=followers,
+            popularity=popularity,
+            spotify_url=url,
+            album_count=len(self.albums_by_artist.get(artist_id, ())),
+            track_count=len(self.tracks_by_artist.get(artist_id, ())),
+            status="ready",
+        )
+
+    def albums_page(self, artist_id, limit: int = HUB_ALBUMS_LIMIT) -> SearchResult:
+        # AlbumRepository.list_by_artistId_artist: popularity, then newest.
+        albums = [self.albums[i] for i in self.albums_by_artist.get(artist_id, ()) if i in self.albums]
+        albums.sort(key=lambda al: (_desc_nulls_last(al.popularity), _desc_nulls_last(al.release_date)))
+        albums = albums[:limit]
+        a = self.artists[artist_id]
+        primary_map = {str(al.id): (a[1], a[2]) for al in albums}
+        return SearchResult(type="album", items=AlbumItemMapper.to_list(albums, primary_map))
+
+    def top_tracks(self, artist_id, limit: int = HUB_TOP_TRACKS_LIMIT) -> list:
+        # TrackRepository.list_top_tracks_by_artist ordering.
+        ranked = []
+        for t_id in self.tracks_by_artist.get(artist_id, ()):
+            t = self.tracks.get(t_id)
+            al = self.albums.get(t[5]) if t is not None else None
+            if al is None:
+                continue
+            ranked.append((
+                (-(t[6] or 0), _desc_nulls_last(al.popularity), _desc_nulls_last(al.release_date),
+                 t[2] is None, t[2] or 0),
+                t,
+                al,
+            ))
+        ranked.sort(key=lambda x: x[0])
+        rows: List[TrackRow] = []
+        for _, t, al in ranked[:limit]:
+            t_id, title, track_no, dur, spid, al_id = t[:6]
+            own = self._refs(self.artists_by_track.get(t_id, ()))
+            album_refs = () if own else self._refs(self.artists_by_album.get(al_id, ()))
+            album = TrackAlbumRef(al.title, al.cover_url, al.release_date, al.spotify_id, album_refs)
+            rows.append(TrackRow(t_id, title, track_no, dur, spid, al_id, album, own))
+        return TrackItemMapper.to_list(rows)
+
+    def hub(self, artist_id) -> dict:
+        return {
+            "hero": self.hero(artist_id).model_dump(mode="json"),
+            "albums": self.albums_page(artist_id).model_dump(mode="json"),
+            "top_tracks": [t.model_dump(mode="json") for t in self.top_tracks(artist_id)],
+        }
+
+
+def load_catalog(conn) -> Catalog:
+    """Stream every COPY_SOURCES table over one psycopg connection, inside a
+    single REPEATABLE READ snapshot so links never point past the rows."""
+    catalog = Catalog()
+    with conn.cursor() as cur:
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        for source, (sql, types) in COPY_SOURCES.items():
+            with cur.copy(sql) as copy:
+                copy.set_types(types)
+                catalog.add_rows(source, copy.rows())
+    conn.rollback()
+    return catalog
+
+
+def _dump(path: str, doc) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+# Set in the parent before forking; workers read the inherited copy.
+_CATALOG: Optional[Catalog] = None
+
+
+def _write_chunk(args: Tuple[str, list]) -> int:
+    out_dir, artist_ids = args
+    for artist_id in artist_ids:
+        _dump(os.path.join(out_dir, f"{artist_id}.json"), _CATALOG.hub(artist_id))
+    return len(artist_ids)
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def write_hubs(catalog: Catalog, out: str, workers: int = 0, chunk: int = 200) -> int:
+    """Write ids.json and one hub file per artist; returns the hub count.
+    `workers` <= 1 writes in-process."""
+    global _CATALOG
+    out_dir = os.path.join(out, "artists")
+    os.makedirs(out_dir, exist_ok=True)
+    ids = catalog.hub_artist_ids()
+    _dump(
+        os.path.join(out_dir, "ids.json"),
+        [{"id": str(i), "name": catalog.artists[i][1]} for i in ids],
+    )
+    _CATALOG = catalog
+    try:
+        tasks = [(out_dir, c) for c in _chunks(ids, chunk)]
+        if workers <= 1:
+            return sum(map(_write_chunk, tasks))
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            return sum(pool.imap_unordered(_write_chunk, tasks))
+    finally:
+        _CATALOG = None
@@ -0,0 +1,58 @@
+"""Query-frequency telemetry for /search/unified (QUERY_STATS_ENABLED).
+
+The router records every validated query into the container's heavy-hitters
+sketch; once QUERY_STATS_FLUSH_SEC has passed, the per-interval counts are
+added to `search_query_stats` (db/migrations/003) on a session of their own,
+so a telemetry failure can never roll back or fail a search. Cold-start
+priming and the warm ping read the global top back via `top_queries()`.
+"""
+from __future__ import annotations
+
+import logging
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.query_stats import QueryStats
+from app.repositories.query_stats_repo import QueryStatsRepository
+
+logger = logging.getLogger(__name__)
+
+query_stats = QueryStats(settings.QUERY_STATS_CAPACITY, settings.QUERY_STATS_FLUSH_SEC)
+
+
+def record_query(q: str) -> bool:
+    """Count ``q``; returns True when a flush is due (caller schedules it)."""
+    if not settings.QUERY_STATS_ENABLED:
+        return False
+    query_stats.record(q)
+    return query_stats.flush_due()
+
+
+def flush_query_stats() -> int:
+    """Add the drained interval counts to the table. Best-effort: on failure the
+    interval is dropped and logged. Returns how many queries were written."""
+    if not settings.QUERY_STATS_ENABLED:
+        return 0
+    counts = query_stats.drain()
+    if not counts:
+        return 0
+    db = SessionLocal()
+    try:
+        QueryStatsRepository(db).add_hits(counts)
+        db.commit()
+        return len(counts)
+    except Exception as e:
+        db.rollback()
+        logger.warning("query stats flush failed (%d queries dropped): %s", len(counts), e)
+        return 0
+    finally:
+        db.close()
+
+
+def top_queries(db: Session, n: int) -> List[str]:
+    if not settings.QUERY_STATS_ENABLED:
+        return []
+    return QueryStatsRepository(db).top_queries(n, settings.QUERY_STATS_WINDOW_DAYS)
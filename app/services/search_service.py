@@ -1,13 +1,34 @@
 from __future__ import annotations
 
-from typing import Set, Tuple
+from typing import Callable, Sequence, Set, Tuple
 
-from cachetools import TTLCache
 from sqlalchemy.orm import Session
 
+from app.core.cache_metrics import register as register_cache_metrics
+from app.core.config import settings
+from app.core.deadline import Deadline, session_deadline
+from app.core.query_stats import canonical_query
+from app.core.ranking import NO_SIM, Ranker, RankColumns
+from app.core.refine_cache import RefineCache
+from app.core.result_cache import ByteBudgetCache
+from app.core.search_index import get_search_index
+from app.core.search_plan import (
+    PLAN_MULTI_TOKEN,
+    PLAN_PREFIX,
+    PLAN_SPOTIFY_ID,
+    PLAN_SUBSTRING,
+    SearchPlan,
+    plan_query,
+)
+
 from app.repositories.artist_repo import ArtistRepository
 from app.repositories.album_repo import AlbumRepository
 from app.repositories.track_repo import TrackRepository
+from app.repositories.search_index_repo import (
+    IndexedAlbumRepository,
+    IndexedArtistRepository,
+    IndexedTrackRepository,
+)
 
 from app.domain.schemas import ExplainEntry, UnifiedSearchResult
 
@@ -22,16 +43,35 @@ ALLOWED_TYPES: Set[str] = {"album", "artist", "track"}
 # a recent identical search instead of re-hitting Neon. Bounded + short TTL; the
 # staleness budget is minutes (owner-accepted), so no active invalidation. Not
 # shared across containers; no lock needed — a Lambda container handles one event
-# at a time. Caches the immutable UnifiedSearchResult (never mutated downstream).
+# at a time. Bounded in bytes (SEARCH_CACHE_MAX_BYTES), not entries: results are
+# stored compressed and decoded on hit, so every hit returns a fresh object.
 _UNIFIED_TTL_SEC = 60
-_UNIFIED_CACHE_MAXSIZE = 256
-_unified_cache: TTLCache = TTLCache(maxsize=_UNIFIED_CACHE_MAXSIZE, ttl=_UNIFIED_TTL_SEC)
+_unified_cache: ByteBudgetCache[UnifiedSearchResult] = ByteBudgetCache(
+    UnifiedSearchResult,
+    max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+    ttl=_UNIFIED_TTL_SEC,
+    metrics=register_cache_metrics("unified_search"),
+)
+
+# Search-as-you-type candidate supersets (app/core/refine_cache.py), keyed by
+# (X-Search-Session, bucket). Same staleness budget as the result cache.
+_REFINE_TTL_SEC = 60
+_refine_cache = RefineCache(
+    max_entries=settings.SEARCH_REFINE_MAX_ENTRIES,
+    ttl=_REFINE_TTL_SEC,
+    metrics=register_cache_metrics("search_refine"),
+)
+# ILIKE wildcards: such a query is a pattern, not a plain substring.
+_LIKE_WILDCARDS = ("%", "_")
 
 # Path labels for the merge/dedup phase. Ranking precedence:
 #   decomposed (most precise multi-token read) > literal > expansion.
 PATH_DECOMPOSED = "decomposed"
 PATH_LITERAL = "literal"
 PATH_EXPANSION = "expansion"
+# Path tier = the first rank key, a hard gate (lower first): a popular but
+# unrelated expansion row never outranks a text match.
+_PATH_TIER = {PATH_DECOMPOSED: -1, PATH_LITERAL: 0, PATH_EXPANSION: 1}
 
 # Per-artist cap on the artist→tracks expansion query (BUG-19 Q2).
 ARTIST_TRACKS_EXPANSION_CAP = 50
@@ -73,51 +113,19 @@ def _decomposition_splits(tokens: list[str]) -> list[tuple[str, str]]:
     return splits[:DECOMP_MAX_SPLITS]
 
 
-def _similarity(name: str | None, q: str) -> int:
-    """Cheap literal-similarity score used to rank within the literal-path slice.
-
-    3 = exact (case-insensitive), 2 = startswith, 1 = contains, 0 = none.
-    Computed in Python on the already-trimmed literal result set rather than
-    pushed into SQL — keeps the search_by_* queries simple and the set is small.
-    """
-    if not name:
-        return 0
-    n = name.lower()
-    qq = q.lower()
-    if n == qq:
-        return 3
-    if n.startswith(qq):
-        return 2
-    if qq in n:
-        return 1
-    return 0
-
-
-# Continuous relevance ladder from the coarse 0-3 _similarity bucket, so the
-# blend below distinguishes exact/startswith/contains rather than treating them
-# as one tier. Higher = more relevant.
-_REL_LADDER = {3: 1.0, 2: 0.6, 1: 0.35}
-
-
-def _blend(sim: int, popularity: int | None) -> float:
-    """Blended rank score (higher first): relevance-dominant, popularity lifts
-    near-ties. relevance weight 0.7, popularity weight 0.3; Spotify popularity is
-    already 0-100, so pop/100 is the [0,1] norm. Within a path tier this lets a
-    very popular weaker match edge out an obscure stronger one, while a strong
-    relevance signal still leads (an exact match can never lose to a contains
-    match — the 0.7 gap exceeds the max 0.3 popularity swing).
-    """
-    rel = _REL_LADDER.get(sim, 0.1)
-    pop = min(max(popularity or 0, 0), 100) / 100.0
-    return 0.7 * rel + 0.3 * pop
-
-
 class SearchService:
     def __init__(self, db: Session):
         self.db = db
         self.artist_repo = ArtistRepository(db)
         self.album_repo = AlbumRepository(db)
         self.track_repo = TrackRepository(db, self.artist_repo)
+        index = get_search_index()
+        if index is not None:
+            # Offline index (SEARCH_INDEX_PATH): phases 1–5 read the mmap'd
+            # file, Postgres only on misses; the hydrate stays on the DB repos.
+            self.artist_repo = IndexedArtistRepository(index, self.artist_repo)
+            self.album_repo = IndexedAlbumRepository(index, self.album_repo)
+            self.track_repo = IndexedTrackRepository(index, self.track_repo)
 
     def unified_search(
         self,
@@ -130,42 +138,94 @@ class SearchService:
         album_offset: int | None = None,
         track_offset: int | None = None,
         explain: bool = False,
+        session: str | None = None,
     ) -> UnifiedSearchResult:
         """Cache-fronted entry point (FEAT-music-edge-cache Step 5).
 
         Returns a recent identical result from the per-process TTL cache when the
         container is warm; otherwise computes and stores it. The key is the
         resolved argument tuple (so ``types=None`` and ``types=ALLOWED_TYPES``
-        collapse to one entry). The DB session is intentionally NOT in the key —
-        a cached result is a DB-state snapshot bounded by the TTL.
+        collapse to one entry, as do case / whitespace variants of ``q`` — the
+        result is computed for the caller's ``q``, whitespace-collapsed: Spotify
+        ids are case-sensitive). The DB session is intentionally NOT in the key —
+        a cached result is a DB-state snapshot bounded by the TTL. Neither is
+        the refinement `session`: it changes how a result is computed, not
+        the result.
         """
-        wanted = types if types is not None else ALLOWED_TYPES
-        key = (
-            q,
-            tuple(sorted(wanted)),
-            limit,
-            offset,
-            artist_offset,
-            album_offset,
-            track_offset,
-            explain,
-        )
-        hit = _unified_cache.get(key)
-        if hit is not None:
-            return hit
-        result = self._compute_unified_search(
+        key = _cache_key(
             q=q,
+            types=types,
             limit=limit,
             offset=offset,
-            types=types,
             artist_offset=artist_offset,
             album_offset=album_offset,
             track_offset=track_offset,
             explain=explain,
         )
-        _unified_cache[key] = result
+        hit = _unified_cache.get(key)
+        if hit is not None:
+            return hit
+        result = self._compute_unified_search(**_cache_key_kwargs(key), session=session)
+        # A deadline-trimmed result must not be served to the next request,
+        # which may well have the budget for the full answer.
+        if not result.partial:
+            _unified_cache.set(key, result)
         return result
 
+    def unified_search_batch(self, queries: Sequence[dict]) -> list[UnifiedSearchResult]:
+        """POST /search/unified:batch — `unified_search` for each query (its
+        keyword arguments as a dict), results in request order.
+
+        One session for all of them. Cached and repeated queries are answered
+        once; for the rest, every bucket's literal phase runs for the whole
+        batch as one statement (app/repositories/literal_batch.py), and the
+        repositories are memoized for the batch, so expansions and hydrates
+        that overlap between queries (one artist's tracks, say) are read once.
+
+        Each query gets its own REQUEST_DEADLINE_SEC budget, as it would on
+        GET /unified: on one shared budget, the tail of a long batch would be
+        computed literal-only (`partial`) and never cached.
+        """
+        keys = [_cache_key(**qd) for qd in queries]
+        results: dict = {}
+        todo = []
+        for key in dict.fromkeys(keys):
+            hit = _unified_cache.get(key)
+            if hit is not None:
+                results[key] = hit
+            else:
+                todo.append(key)
+        if todo:
+            repos = self.artist_repo, self.album_repo, self.track_repo
+            self.artist_repo, self.album_repo, self.track_repo = (_BatchMemo(r) for r in repos)
+            deadline = session_deadline(self.db)
+            try:
+                self._prefetch_literals(todo)
+                for key in todo:
+                    if deadline is not None:
+                        self.db.info["deadline"] = Deadline(settings.REQUEST_DEADLINE_SEC)
+                    result = self._compute_unified_search(**_cache_key_kwargs(key))
+                    if not result.partial:
+                        _unified_cache.set(key, result)
+                    results[key] = result
+            finally:
+                self.artist_repo, self.album_repo, self.track_repo = repos
+                if deadline is not None:
+                    self.db.info["deadline"] = deadline
+        return [results[key] for key in keys]
+
+    def refresh_expiring(self, *, within_sec: float, max_entries: int) -> int:
+        """Warm-ping hook: recompute cached results that expire within
+        ``within_sec`` (oldest first, at most ``max_entries``) so hot queries
+        never fall out of a warm container. Returns how many were refreshed."""
+        refreshed = 0
+        for key in _unified_cache.expiring(within_sec)[:max_entries]:
+            result = self._compute_unified_search(**_cache_key_kwargs(key))
+            if not result.partial:
+                _unified_cache.set(key, result)
+                refreshed += 1
+        return refreshed
+
     def _compute_unified_search(
         self,
         *,
@@ -177,8 +237,9 @@ class SearchService:
         album_offset: int | None = None,
         track_offset: int | None = None,
         explain: bool = False,
+        session: str | None = None,
     ) -> UnifiedSearchResult:
-        """BUG-19: literal match → 1-hop expansion → cross-bucket dedup →
+        """BUG-19: plan → literal match → 1-hop expansion → cross-bucket dedup →
         path-dependent ranking → per-bucket trim. See `docs/rfcs/BUG-19-*`.
         """
         wanted = types if types is not None else ALLOWED_TYPES
@@ -189,15 +250,30 @@ class SearchService:
         al_off = album_offset if album_offset is not None else offset
         t_off = track_offset if track_offset is not None else offset
 
+        # Request deadline (get_read_db): literal match is the answer; the
+        # decomposition / expansion phases are refinements and are dropped —
+        # flagging the result `partial` — when too little budget is left.
+        deadline = session_deadline(self.db)
+        partial = False
+
+        def optional_phase() -> bool:
+            nonlocal partial
+            if deadline is None or deadline.has(settings.SEARCH_OPTIONAL_PHASE_MIN_SEC):
+                return True
+            partial = True
+            return False
+
+        # Late materialization: phases 1–5 run on thin Core rows (id, title/name,
+        # popularity, release_date — see the repos' `_THIN_COLUMNS`); only the
+        # final top-`limit` per bucket is hydrated into read DTOs (phase 6,
+        # app/domain/rows.py).
+
+        # ---- Phase 0: pick the match strategy from the query's shape ----
+        plan = plan_query(q)
+
         # ---- Phase 1: literal match per requested bucket ----
-        literal_artists = (
-            self.artist_repo.search_by_name(q, limit, a_off) if "artist" in wanted else []
-        )
-        literal_albums = (
-            self.album_repo.search_by_title(q, limit, al_off) if "album" in wanted else []
-        )
-        literal_tracks = (
-            self.track_repo.search_by_title(q, limit, t_off) if "track" in wanted else []
+        plan, literal_artists, literal_albums, literal_tracks = self._literal_match(
+            plan, q, wanted, limit, (a_off, al_off, t_off), session
         )
 
         # ---- Phase 1.5: structured multi-token decomposition (Step 6 / A2) ----
@@ -207,52 +283,65 @@ class SearchService:
         # artist_part. This is a higher-precision read of "<artist> <title>"
         # queries than the whole-string fuzzy match, which dilutes similarity
         # with the artist token. Decomposed rows rank above literal/expansion.
-        decomp_albums, decomp_album_sim = self._decompose(
+        # SEARCH_FTS_ENABLED answers the same read with one full-text query
+        # per bucket instead of enumerating splits.
+        multi = plan.strategy == PLAN_MULTI_TOKEN
+        decompose = self._match_documents if plan.decompose == "fts" else self._decompose
+        decomp_albums, decomp_album_sim = decompose(
             q, "album", limit
-        ) if "album" in wanted else ([], {})
-        decomp_tracks, decomp_track_sim = self._decompose(
+        ) if multi and "album" in wanted and optional_phase() else ([], {})
+        decomp_tracks, decomp_track_sim = decompose(
             q, "track", limit
-        ) if "track" in wanted else ([], {})
+        ) if multi and "track" in wanted and optional_phase() else ([], {})
 
         # ---- Phase 2: 1-hop expansion (strictly 1, no transitive walks) ----
+        # Every hop is a query of its own now (nothing is eager-loaded on the
+        # literal rows), so the whole phase sits behind the deadline gate.
         exp_artists: list = []
         exp_albums: list = []
         exp_tracks: list = []
+        expand = optional_phase()
 
         # artist match → that artist's albums + tracks
-        if "album" in wanted:
+        if "album" in wanted and expand:
             for ar in literal_artists[:EXPANSION_LITERAL_ARTIST_CAP]:
                 exp_albums.extend(
-                    self.album_repo.list_by_artist_id_simple(
+                    self.album_repo.list_rows_by_artist_id(
                         ar.id, limit=ARTIST_ALBUMS_EXPANSION_CAP
                     )
                 )
-        if "track" in wanted:
+        if "track" in wanted and expand:
             for ar in literal_artists[:EXPANSION_LITERAL_ARTIST_CAP]:
                 exp_tracks.extend(
-                    self.track_repo.list_by_artist_id(
+                    self.track_repo.list_rows_by_artist_id(
                         ar.id, limit=ARTIST_TRACKS_EXPANSION_CAP
                     )
                 )
 
-        # album match → that album's tracks + artists
-        if "track" in wanted and literal_albums:
+        # album match → that album's tracks + artists. Album-expansion tracks
+        # come back in expansion rank order, so `limit` of them is enough.
+        if "track" in wanted and literal_albums and expand:
             exp_tracks.extend(
-                self.track_repo.list_by_album_ids([al.id for al in literal_albums])
+                self.track_repo.list_rows_by_album_ids(
+                    [al.id for al in literal_albums], limit
+                )
+            )
+        if "artist" in wanted and literal_albums and expand:
+            exp_artists.extend(
+                self.artist_repo.rows_by_album_ids([al.id for al in literal_albums])
             )
-        if "artist" in wanted:
-            for al in literal_albums:
-                # eager-loaded by album_repo.search_by_title — no query here
-                exp_artists.extend(al.artists or [])
 
         # track match → that track's album + artists
-        if "album" in wanted:
-            for t in literal_tracks:
-                if t.album is not None:
-                    exp_albums.append(t.album)
-        if "artist" in wanted:
-            for t in literal_tracks:
-                exp_artists.extend(t.artists or [])
+        if "album" in wanted and literal_tracks and expand:
+            album_ids = list(dict.fromkeys(
+                t.album_id for t in literal_tracks if t.album_id is not None
+            ))
+            by_id = {al.id: al for al in self.album_repo.rows_by_ids(album_ids)}
+            exp_albums.extend(by_id[i] for i in album_ids if i in by_id)
+        if "artist" in wanted and literal_tracks and expand:
+            exp_artists.extend(
+                self.artist_repo.rows_by_track_ids([t.id for t in literal_tracks])
+            )
 
         # ---- Phase 3: merge & dedup, retaining the strongest path ----
         # Group order = path precedence: first occurrence of an id wins, so a row
@@ -272,37 +361,173 @@ class SearchService:
             (exp_tracks, PATH_EXPANSION),
         )
 
-        # ---- Phase 4: rank per bucket per the path-dependent rules ----
-        ranked_artists = _rank_artists(artists_merged, artist_path, q)
-        ranked_albums = _rank_albums(albums_merged, album_path, q, decomp_album_sim)
-        ranked_tracks = _rank_tracks(tracks_merged, track_path, q, decomp_track_sim)
+        # ---- Phases 4–5: rank per bucket per the path-dependent rules and keep
+        # the top `limit` (singular `limit` applies per bucket this step) ----
+        ranker = Ranker(q)
+        ranked_artists, artist_keys = _rank("artist", artists_merged, artist_path, ranker, limit)
+        ranked_albums, album_keys = _rank(
+            "album", albums_merged, album_path, ranker, limit, decomp_album_sim
+        )
+        ranked_tracks, track_keys = _rank(
+            "track", tracks_merged, track_path, ranker, limit, decomp_track_sim
+        )
 
-        # ---- Phase 5: trim — singular `limit` applies per bucket this step ----
-        ranked_artists = ranked_artists[:limit]
-        ranked_albums = ranked_albums[:limit]
-        ranked_tracks = ranked_tracks[:limit]
+        # ---- Phase 6: hydrate only the survivors, one batched load per bucket ----
+        ranked_artists, artists = _hydrate(ranked_artists, self.artist_repo.get_by_ids)
+        ranked_albums, albums = _hydrate(ranked_albums, self.album_repo.get_by_ids)
+        ranked_tracks, tracks = _hydrate(ranked_tracks, self.track_repo.get_by_ids)
 
-        # primary_map covers only the final album rows actually being returned
-        primary_map = self._primary_map_for(ranked_albums)
+        # primary_map covers only the final album rows actually being returned;
+        # with the denormalized columns the rows already carry it (None → mapper
+        # reads primary_artist_* off each row).
+        primary_map = None
+        if not settings.PRIMARY_ARTIST_COLUMNS_ENABLED:
+            primary_map = self._primary_map_for(albums)
 
         # Step 7 (E1): per-row ranking debug, only when explicitly requested.
         debug = None
         if explain:
             debug = (
-                _explain_rows("artist", ranked_artists, artist_path, q, {})
-                + _explain_rows("album", ranked_albums, album_path, q, decomp_album_sim)
-                + _explain_rows("track", ranked_tracks, track_path, q, decomp_track_sim)
+                _explain_rows("artist", ranked_artists, artist_path, ranker.qq, artist_keys)
+                + _explain_rows("album", ranked_albums, album_path, ranker.qq, album_keys)
+                + _explain_rows("track", ranked_tracks, track_path, ranker.qq, track_keys)
             )
 
         return UnifiedSearchResult(
-            artists=ArtistItemMapper.to_list(ranked_artists),
-            albums=AlbumItemMapper.to_list(ranked_albums, primary_map),
-            tracks=TrackItemMapper.to_list(ranked_tracks),
+            artists=ArtistItemMapper.to_list(artists),
+            albums=AlbumItemMapper.to_list(albums, primary_map),
+            tracks=TrackItemMapper.to_list(tracks),
             debug=debug,
+            plan=plan.describe() if explain else None,
+            partial=partial,
         )
 
     # ---------------- 내부 전용 ---------------- #
 
+    def _literal_match(
+        self,
+        plan: SearchPlan,
+        q: str,
+        wanted: Set[str],
+        limit: int,
+        offsets: tuple,
+        session: str | None = None,
+    ) -> Tuple[SearchPlan, list, list, list]:
+        """Phase 1 per the plan: (plan actually used, artists, albums, tracks)."""
+        a_off, al_off, t_off = offsets
+        if plan.strategy == PLAN_SPOTIFY_ID:
+            def exact(bucket: str, repo, off: int) -> list:
+                if bucket not in wanted or plan.spotify_type not in (None, bucket):
+                    return []
+                return repo.search_rows_by_spotify_id(plan.spotify_id)
+
+            rows = (
+                exact("artist", self.artist_repo, a_off),
+                exact("album", self.album_repo, al_off),
+                exact("track", self.track_repo, t_off),
+            )
+            # A bare id that matches nothing may just be a 22-letter word:
+            # search it as text. A typed URI / URL never is.
+            if any(rows) or plan.spotify_type is not None:
+                return (plan, rows[0][a_off:], rows[1][al_off:], rows[2][t_off:])
+            plan = plan._replace(strategy=PLAN_SUBSTRING, fuzzy=settings.SEARCH_USE_PG_TRGM)
+
+        if plan.strategy == PLAN_PREFIX:
+            qq = q.strip()
+            return (
+                plan,
+                self.artist_repo.search_rows_by_prefix(qq, limit, a_off) if "artist" in wanted else [],
+                self.album_repo.search_rows_by_prefix(qq, limit, al_off) if "album" in wanted else [],
+                self.track_repo.search_rows_by_prefix(qq, limit, t_off) if "track" in wanted else [],
+            )
+        if (
+            session
+            and settings.SEARCH_REFINE_MAX_ENTRIES > 0
+            and not plan.fuzzy
+            and not any(c in q for c in _LIKE_WILDCARDS)
+        ):
+            def refined(bucket: str, fetch, off: int) -> list:
+                return self._refined_literal(session, bucket, q, limit, off, fetch)
+
+            return (
+                plan,
+                refined("artist", self.artist_repo.search_rows_by_name, a_off) if "artist" in wanted else [],
+                refined("album", self.album_repo.search_rows_by_title, al_off) if "album" in wanted else [],
+                refined("track", self.track_repo.search_rows_by_title, t_off) if "track" in wanted else [],
+            )
+        return (
+            plan,
+            self.artist_repo.search_rows_by_name(q, limit, a_off) if "artist" in wanted else [],
+            self.album_repo.search_rows_by_title(q, limit, al_off) if "album" in wanted else [],
+            self.track_repo.search_rows_by_title(q, limit, t_off) if "track" in wanted else [],
+        )
+
+    def _refined_literal(
+        self, session: str, bucket: str, q: str, limit: int, offset: int, fetch: Callable
+    ) -> list:
+        """Search-as-you-type phase 1 for one bucket.
+
+        When the session's kept superset was fetched for a query that `q`
+        extends, `q`'s matches are a subset of it: filter and re-rank in
+        memory (the SQL ORDER BY's blend; ties keep the superset's order).
+        Otherwise fetch up to SEARCH_REFINE_SUPERSET_ROWS matches in one query,
+        answer from them, and keep them — unless the cap truncated them, then
+        nothing is kept and the next keystroke goes to the DB again.
+        """
+        key = (session, bucket)
+        qq = q.lower()
+        cap = settings.SEARCH_REFINE_SUPERSET_ROWS
+        prev = _refine_cache.get(key)
+        if prev is not None and prev.q in qq:
+            text_attr, pop_attr = _RANK_ATTRS[bucket]
+            ranker = Ranker(q)
+            rows = [r for r in prev.rows if _literal_hit(bucket, r, qq)]
+            cols = RankColumns()
+            for r in rows:
+                sim = ranker.similarity(getattr(r, text_attr, None))
+                cols.append(0, sim, ranker.score(sim, getattr(r, pop_attr, None)))
+            rows = [rows[i] for i in cols.top_k(len(rows))]
+        elif offset + limit > cap:
+            return fetch(q, limit, offset)
+        else:
+            rows = fetch(q, cap + 1, 0)
+            if len(rows) > cap:
+                _refine_cache.discard(key)
+                return rows[offset:offset + limit]
+        _refine_cache.set(key, qq, rows)
+        return rows[offset:offset + limit]
+
+    def _prefetch_literals(self, keys: list) -> None:
+        """Batch phase 1: the substring reads the batch's queries will make —
+        their literal match and the split decomposition's artist / title
+        matches — one statement per bucket, seeded into the `_BatchMemo`s so
+        `_literal_match` / `_decompose` find them. Other strategies (prefix,
+        spotify id) are indexed point reads and run per query."""
+        specs: dict = {"artist": [], "album": [], "track": []}
+        for key in keys:
+            kw = _cache_key_kwargs(key)
+            q, limit, plan = kw["q"], kw["limit"], plan_query(kw["q"])
+            if plan.strategy not in (PLAN_SUBSTRING, PLAN_MULTI_TOKEN):
+                continue
+            for bucket in kw["types"]:
+                off = kw[f"{bucket}_offset"]
+                specs[bucket].append((q, limit, kw["offset"] if off is None else off))
+            tokens = q.split()
+            decomposed = {"album", "track"} & kw["types"]
+            if plan.decompose == "split" and decomposed and len(tokens) <= DECOMP_MAX_TOKENS:
+                for artist_part, title_part in _decomposition_splits(tokens):
+                    specs["artist"].append((artist_part, DECOMP_ARTIST_CANDIDATES, 0))
+                    for bucket in decomposed:
+                        specs[bucket].append((title_part, limit, 0))
+        for bucket, repo, name in (
+            ("artist", self.artist_repo, "search_rows_by_name"),
+            ("album", self.album_repo, "search_rows_by_title"),
+            ("track", self.track_repo, "search_rows_by_title"),
+        ):
+            todo = list(dict.fromkeys(specs[bucket]))
+            if todo:
+                repo.seed(name, todo, getattr(repo.repo, f"{name}_batch")(todo))
+
     def _primary_map_for(self, albums: list) -> dict[str, tuple[str | None, str | None]]:
         if not albums:
             return {}
@@ -312,7 +537,7 @@ class SearchService:
     def _decompose(self, q: str, bucket: str, limit: int) -> Tuple[list, dict]:
         """Step 6 (A2): structured decomposition of a 2–3 token query.
 
-        Returns (rows, sim_map) where rows are album/track entities reached by
+        Returns (rows, sim_map) where rows are thin album/track rows reached by
         intersecting a title-token match with an artist-token match, and
         sim_map[id] is the literal similarity of the row's title against the
         *title_part* (not the whole query) — used to rank decomposed rows. For
@@ -325,35 +550,178 @@ class SearchService:
         rows: list = []
         sim_map: dict = {}
         for artist_part, title_part in _decomposition_splits(tokens):
+            title_ranker = Ranker(title_part)
             artist_ids = {
                 ar.id
-                for ar in self.artist_repo.search_by_name(
+                for ar in self.artist_repo.search_rows_by_name(
                     artist_part, DECOMP_ARTIST_CANDIDATES, 0
                 )
             }
             if not artist_ids:
                 continue
             if bucket == "album":
-                for al in self.album_repo.search_by_title(title_part, limit, 0):
-                    if al.id in sim_map:
-                        continue
-                    if any(a.id in artist_ids for a in (al.artists or [])):
+                hits = [
+                    al for al in self.album_repo.search_rows_by_title(title_part, limit, 0)
+                    if al.id not in sim_map
+                ]
+                credits = self.album_repo.artist_ids_by_album_ids([al.id for al in hits])
+                for al in hits:
+                    if credits.get(al.id, set()) & artist_ids:
                         rows.append(al)
-                        sim_map[al.id] = _similarity(al.title, title_part)
+                        sim_map[al.id] = title_ranker.similarity(al.title)
             else:  # track
-                for t in self.track_repo.search_by_title(title_part, limit, 0):
-                    if t.id in sim_map:
-                        continue
-                    credited = {a.id for a in (t.artists or [])}
-                    credited |= {
-                        a.id for a in (getattr(t.album, "artists", None) or [])
-                    }
+                hits = [
+                    t for t in self.track_repo.search_rows_by_title(title_part, limit, 0)
+                    if t.id not in sim_map
+                ]
+                track_credits = self.track_repo.artist_ids_by_track_ids([t.id for t in hits])
+                album_credits = self.album_repo.artist_ids_by_album_ids(
+                    list({t.album_id for t in hits if t.album_id is not None})
+                )
+                for t in hits:
+                    credited = track_credits.get(t.id, set()) | album_credits.get(t.album_id, set())
                     if credited & artist_ids:
                         rows.append(t)
-                        sim_map[t.id] = _similarity(t.title, title_part)
+                        sim_map[t.id] = title_ranker.similarity(t.title)
+        return rows, sim_map
+
+    def _match_documents(self, q: str, bucket: str, limit: int) -> Tuple[list, dict]:
+        """SEARCH_FTS_ENABLED counterpart of `_decompose`, same contract.
+
+        One ranked query over search_documents (title + credited artists'
+        names and aliases, db/migrations/008) for any query of 2+ tokens:
+        the artist / title split is resolved by the document, not by one
+        query pair per candidate split. sim_map[id] is the best literal
+        similarity of the title against the whole query or a split's
+        title_part — computed in memory — so an exact title still scores 3.
+        """
+        tokens = q.split()
+        if len(tokens) < DECOMP_MIN_TOKENS:
+            return [], {}
+        repo = self.album_repo if bucket == "album" else self.track_repo
+        rows = repo.search_rows_fts(q, limit)
+        rankers = [Ranker(q)] + [Ranker(title) for _, title in _decomposition_splits(tokens)]
+        sim_map = {r.id: max(rk.similarity(r.title) for rk in rankers) for r in rows}
         return rows, sim_map
 
 
+def _cache_key(
+    *,
+    q: str,
+    limit: int,
+    offset: int,
+    types: Set[str] | None = None,
+    artist_offset: int | None = None,
+    album_offset: int | None = None,
+    track_offset: int | None = None,
+    explain: bool = False,
+) -> tuple:
+    """unified_search's result-cache key: its resolved arguments, with `q` in
+    the canonical form query stats record (and the pre-warmer computes) —
+    "Radiohead" and "radiohead " are one entry. The key carries the caller's
+    `q` for computing; see _SearchKey."""
+    wanted = types if types is not None else ALLOWED_TYPES
+    fields = (
+        canonical_query(q),
+        tuple(sorted(wanted)),
+        limit,
+        offset,
+        artist_offset,
+        album_offset,
+        track_offset,
+        explain,
+    )
+    return _SearchKey(fields, " ".join(q.split()))
+
+
+class _SearchKey(tuple):
+    """A unified_search cache key: hashes and compares as its tuple (canonical
+    `q` first), and keeps the `q` it was made from, whitespace-collapsed.
+    Results are computed for that `q`, never the casefolded one — a Spotify
+    id is case-sensitive, and casefold rewrites text ("Straße" → "strasse")."""
+
+    q: str
+
+    def __new__(cls, fields: tuple, q: str) -> "_SearchKey":
+        key = super().__new__(cls, fields)
+        key.q = q
+        return key
+
+
+def _cache_key_kwargs(key: _SearchKey) -> dict:
+    """Inverse of the unified_search cache key → _compute_unified_search kwargs."""
+    _, wanted, limit, offset, artist_offset, album_offset, track_offset, explain = key
+    return {
+        "q": key.q,
+        "types": set(wanted),
+        "limit": limit,
+        "offset": offset,
+        "artist_offset": artist_offset,
+        "album_offset": album_offset,
+        "track_offset": track_offset,
+        "explain": explain,
+    }
+
+
+class _BatchMemo:
+    """A repository for the length of one unified-search batch: each read is
+    memoized by its arguments, `get_by_ids` per id. Rows are immutable, so the
+    queries of a batch can share them; everything else passes through."""
+
+    _MEMOIZED = frozenset({
+        "search_rows_by_name",
+        "search_rows_by_title",
+        "search_rows_by_prefix",
+        "search_rows_by_spotify_id",
+        "search_rows_fts",
+        "list_rows_by_artist_id",
+        "list_rows_by_album_ids",
+        "rows_by_album_ids",
+        "rows_by_track_ids",
+        "rows_by_ids",
+        "artist_ids_by_album_ids",
+        "artist_ids_by_track_ids",
+    })
+
+    def __init__(self, repo) -> None:
+        self.repo = repo
+        self._calls: dict = {}
+        self._by_id: dict = {}
+
+    def seed(self, name: str, specs: list, results: list) -> None:
+        """Record `name(*spec)` → result for reads already made in bulk."""
+        for spec, rows in zip(specs, results):
+            self._calls[(name, tuple(spec), ())] = rows
+
+    def get_by_ids(self, ids) -> list:
+        ids = list(ids)
+        missing = [i for i in dict.fromkeys(ids) if i not in self._by_id]
+        if missing:
+            loaded = {e.id: e for e in self.repo.get_by_ids(missing)}
+            for i in missing:
+                self._by_id[i] = loaded.get(i)  # None: gone since the thin read
+        return [self._by_id[i] for i in ids if self._by_id[i] is not None]
+
+    def __getattr__(self, name):
+        method = getattr(self.repo, name)
+        if name not in self._MEMOIZED:
+            return method
+
+        def memoized(*args, **kwargs):
+            key = (name, _hashable(args), tuple(sorted((k, _hashable(v)) for k, v in kwargs.items())))
+            if key not in self._calls:
+                self._calls[key] = method(*args, **kwargs)
+            return self._calls[key]
+
+        return memoized
+
+
+def _hashable(v):
+    if isinstance(v, (list, tuple)):
+        return tuple(_hashable(x) for x in v)
+    return v
+
+
 def _merge_paths(*groups: Tuple[list, str]) -> Tuple[list, dict]:
     """Merge several (rows, path_label) groups keyed by `.id`, first occurrence
     wins. Groups are passed in precedence order (strongest path first), so a row
@@ -373,13 +741,26 @@ def _merge_paths(*groups: Tuple[list, str]) -> Tuple[list, dict]:
     return out, path
 
 
-def _matched_field(bucket: str, row, q: str, path: str) -> str | None:
-    """Best-effort label of *why* a row matched, for `?explain=1` triage."""
+def _hydrate(rows: list, load: Callable[[list], list]) -> Tuple[list, list]:
+    """Load the read DTOs for ranked thin rows in one batch, in ranked order.
+
+    Returns (rows, entities) aligned index by index; a row deleted between the
+    thin read and the hydrate drops out of both.
+    """
+    if not rows:
+        return [], []
+    by_id = {e.id: e for e in load([r.id for r in rows])}
+    kept = [r for r in rows if r.id in by_id]
+    return kept, [by_id[r.id] for r in kept]
+
+
+def _matched_field(bucket: str, row, qq: str, path: str) -> str | None:
+    """Best-effort label of *why* a row matched, for `?explain=1` triage.
+    `qq` is the case-folded query."""
     if path == PATH_EXPANSION:
         return None  # reached via a relation, not a direct text match
     if path == PATH_DECOMPOSED:
         return "title"
-    qq = q.lower()
     if bucket == "artist":
         name = (getattr(row, "name", "") or "").lower()
         if qq in name:
@@ -392,89 +773,84 @@ def _matched_field(bucket: str, row, q: str, path: str) -> str | None:
     return "title" if qq in title else "fuzzy"
 
 
-def _explain_rows(bucket: str, rows: list, path: dict, q: str, decomp_sim: dict) -> list:
+def _explain_rows(bucket: str, rows: list, path: dict, qq: str, keys: dict) -> list:
     """Build ExplainEntry rows for one bucket, aligned to the returned order.
 
-    `similarity` is the service-layer signal actually used to rank the row:
-    the decomposition score for decomposed rows, the literal bucket score for
-    literal rows, and None for expansion rows (relation-derived, not text-ranked).
+    `similarity` / `score` are the rank keys `_rank` computed for the row:
+    the decomposition bucket for decomposed rows, the literal bucket for
+    literal rows, and no similarity for expansion rows (relation-derived, not
+    text-ranked); `score` is the weighted blend.
     """
     out: list = []
     for i, row in enumerate(rows):
         rid = row.id
         p = path.get(rid) or PATH_EXPANSION
-        text = getattr(row, "name", None) if bucket == "artist" else getattr(row, "title", None)
-        if p == PATH_DECOMPOSED:
-            sim = decomp_sim.get(rid)
-        elif p == PATH_LITERAL:
-            sim = _similarity(text, q)
-        else:
-            sim = None
+        sim, score = keys.get(rid, (NO_SIM, None))
         out.append(
             ExplainEntry(
                 bucket=bucket,
                 id=str(rid),
                 rank=i + 1,
                 path=p,
-                matched_field=_matched_field(bucket, row, q, p),
-                similarity=float(sim) if sim is not None else None,
+                matched_field=_matched_field(bucket, row, qq, p),
+                similarity=float(sim) if sim != NO_SIM else None,
                 popularity=getattr(row, "popularity", None),
+                score=score,
             )
         )
     return out
 
 
-def _rank_artists(rows: list, path: dict, q: str) -> list:
-    """Literal rows first (by the relevance+popularity blend), then expansion-only
-    rows (by popularity). The path tier stays a hard gate so a popular but
-    unrelated expansion artist never outranks a literal name match.
-    """
-    def key(a):
-        is_literal = path.get(a.id) == PATH_LITERAL
-        pop = getattr(a, "popularity", None)
-        if is_literal:
-            sim = _similarity(getattr(a, "name", None), q)
-            return (0, -_blend(sim, pop))
-        return (1, -_blend(0, pop))
-    return sorted(rows, key=key)
+# Per bucket: the thin-row attribute similarity is measured on, and the
+# popularity blended in (tracks inherit their album's).
+_RANK_ATTRS = {
+    "artist": ("name", "popularity"),
+    "album": ("title", "popularity"),
+    "track": ("title", "album_popularity"),
+}
 
 
-def _rank_albums(rows: list, path: dict, q: str, decomp_sim: dict | None = None) -> list:
-    decomp_sim = decomp_sim or {}
+def _literal_hit(bucket: str, row, qq: str) -> bool:
+    """In-memory `ILIKE '%q%'` of a thin row — what the literal queries match
+    (artists: name or an alias). `qq` is the case-folded query."""
+    if bucket == "artist":
+        if qq in (getattr(row, "name", "") or "").lower():
+            return True
+        return any(qq in (a or "").lower() for a in getattr(row, "aliases", None) or ())
+    return qq in (getattr(row, "title", "") or "").lower()
 
-    def key(al):
-        p = path.get(al.id)
-        pop = getattr(al, "popularity", None)
-        if p == PATH_DECOMPOSED:
-            # Top tier: similarity is against the title_part, so an exact
-            # title-token match (e.g. "Proof" in "방탄소년단 Proof") scores 3.
-            return (-1, -_blend(decomp_sim.get(al.id, 0), pop))
-        if p == PATH_LITERAL:
-            sim = _similarity(getattr(al, "title", None), q)
-            return (0, -_blend(sim, pop))
-        return (1, -_blend(0, pop))
-    return sorted(rows, key=key)
-
-
-def _rank_tracks(rows: list, path: dict, q: str, decomp_sim: dict | None = None) -> list:
-    """`Track` has no popularity column, so tracks inherit their `Album.popularity`
-    for the relevance+popularity blend (no schema/worker change). Path-tiered:
+
+def _rank(
+    bucket: str, rows: list, path: dict, ranker: Ranker, k: int, decomp_sim: dict | None = None
+) -> Tuple[list, dict]:
+    """Phases 4–5 for one bucket: the top `k` merged rows, best first, plus
+    each kept row's (similarity, score) by id for explain.
+
+    One pass fills the bucket's RankColumns (path tier, similarity, blend,
+    tiebreak); a heap selects the top k. Path-tiered:
     - decomposed (Step 6) → similarity to the title_part (top tier)
-    - literal title match → similarity to query
-    - expansion (via artist or album) → album popularity, newest album as tiebreak
+    - literal match → similarity of the name / title to the query
+    - expansion (via a relation) → popularity alone; tracks break ties newest
+      album first
+    `Track` has no popularity column, so tracks inherit their `Album.popularity`
+    — carried on the thin track row as `album_popularity` / `album_release_date`.
     """
     decomp_sim = decomp_sim or {}
-
-    def key(t):
-        p = path.get(t.id)
-        # tracks have no own popularity → inherit the album's (loaded for these rows)
-        pop = getattr(getattr(t, "album", None), "popularity", None)
+    is_track = bucket == "track"
+    text_attr, pop_attr = _RANK_ATTRS[bucket]
+    cols = RankColumns()
+    for row in rows:
+        p = path.get(row.id) or PATH_EXPANSION
+        tiebreak = 0
         if p == PATH_DECOMPOSED:
-            return (-1, -_blend(decomp_sim.get(t.id, 0), pop), 0)
-        if p == PATH_LITERAL:
-            sim = _similarity(getattr(t, "title", None), q)
-            return (0, -_blend(sim, pop), 0)
-        # expansion: album-popularity blend, then newest album first as a tiebreak.
-        rd = getattr(getattr(t, "album", None), "release_date", None)
-        return (1, -_blend(0, pop), -(rd.toordinal() if rd is not None else 0))
-    return sorted(rows, key=key)
+            sim = decomp_sim.get(row.id, 0)
+        elif p == PATH_LITERAL:
+            sim = ranker.similarity(getattr(row, text_attr, None))
+        else:
+            sim = NO_SIM
+            if is_track:
+                rd = getattr(row, "album_release_date", None)
+                tiebreak = -rd.toordinal() if rd is not None else 0
+        cols.append(_PATH_TIER[p], sim, ranker.score(sim, getattr(row, pop_attr, None)), tiebreak)
+    top = cols.top_k(k)
+    return [rows[i] for i in top], {rows[i].id: (cols.sim[i], cols.score[i]) for i in top}
@@ -0,0 +1,253 @@
+"""Lambda cold-start priming (PRIME_ON_INIT).
+
+`app/main.py` runs `prime_cold_start()` at import time, i.e. during the Lambda
+init phase, whose CPU is not billed and not throttled to the memory setting.
+Everything done here would otherwise be paid by the first real request:
+
+1. Response serializers — validate + dump one representative
+   `UnifiedSearchResult` / `AlbumDetail` so Pydantic's validator/serializer
+   paths for every nested item model are exercised once.
+2. Pool connect — check out one pooled connection (TLS + auth handshake with
+   Neon) and return it to the pool warm.
+3. Statement compilation — execute every repository read statement once with
+   sentinel arguments and `limit=0`, inside a read-only transaction that is
+   rolled back. Execution is what populates the engine's compiled cache (keyed
+   on statement structure, not bound values), and `LIMIT 0` / a sentinel-id
+   index probe keeps each statement's DB cost at ~nothing.
+4. Optionally, precompute popular queries into the unified-search cache: the
+   configured PRIME_QUERIES first, then the global top from
+   `search_query_stats` (QUERY_STATS_ENABLED).
+
+Priming is strictly best-effort: any failure is logged and swallowed — a
+container that fails to prime is slower on its first request, never broken.
+
+`handle_warm_ping()` is the per-invoke counterpart: the Lambda handler routes
+scheduled keep-warm events here instead of through Mangum/FastAPI. It also
+flushes this container's query counts and tops the cache up with the current
+most-searched queries (cache hits for those already warm).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.cache_metrics import emit_emf
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.domain.schemas import (
+    AlbumDetail,
+    AlbumItem,
+    AlbumOut,
+    ArtistHero,
+    ArtistItem,
+    ArtistOut,
+    ExplainEntry,
+    TrackItem,
+    TrackOut,
+    UnifiedSearchResult,
+)
+from app.repositories.absorb_repo import KIND_ALBUM, AbsorbRepository
+from app.repositories.album_repo import AlbumRepository
+from app.repositories.artist_repo import ArtistRepository
+from app.repositories.track_repo import TrackRepository
+from app.services.query_stats_service import flush_query_stats, top_queries
+from app.services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+# Never matches a real row: nil UUID / an impossible spotify id.
+_SENTINEL_ID = "00000000-0000-0000-0000-000000000000"
+_SENTINEL_SPOTIFY_ID = "~prime~"
+_SENTINEL_Q = "~prime~"
+
+# Front default for /search/unified (router defaults) — preloaded entries must
+# share the cache key of a real default request to be hit.
+_PRIME_SEARCH_LIMIT = 20
+
+
+def prime_cold_start() -> None:
+    started = time.perf_counter()
+    _timed("serializers", _prime_serializers)
+    db = SessionLocal()
+    try:
+        if _timed("statements", lambda: _prime_statements(db)):
+            queries = popular_queries(db)
+            if queries:
+                _timed("queries", lambda: preload_queries(db, queries, started))
+    finally:
+        db.close()
+    logger.info("cold-start priming done in %.1fms", (time.perf_counter() - started) * 1000)
+
+
+def is_warm_ping(event: Any) -> bool:
+    """Keep-warm event shapes: an EventBridge schedule rule (default input),
+    serverless-plugin-warmup, or a custom `{"warmer": true}` input. HTTP events
+    (API Gateway / Function URL) always carry `requestContext` and never match."""
+    if not isinstance(event, dict) or "requestContext" in event:
+        return False
+    if event.get("warmer") is True:
+        return True
+    source = event.get("source")
+    if source == "serverless-plugin-warmup":
+        return True
+    return source == "aws.events" and event.get("detail-type") == "Scheduled Event"
+
+
+def handle_warm_ping() -> dict:
+    """Ping the pooled connection (keeps Neon's side of the TLS session alive)
+    and refresh unified-search entries close to expiry. Never raises — a failed
+    ping just means the next real request reconnects."""
+    started = time.perf_counter()
+    out = {"warm": True, "db": False, "refreshed": 0, "preloaded": 0}
+    out["flushed"] = flush_query_stats()
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        out["db"] = True
+        out["refreshed"] = SearchService(db).refresh_expiring(
+            within_sec=settings.WARM_REFRESH_WITHIN_SEC,
+            max_entries=settings.WARM_REFRESH_MAX,
+        )
+        if settings.QUERY_STATS_ENABLED:
+            queries = top_queries(db, settings.PRIME_TOP_N)
+            out["preloaded"] = preload_queries(db, queries, started)
+    except Exception as e:
+        logger.warning("warm ping failed: %s", e)
+    finally:
+        db.rollback()
+        db.close()
+    out["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("warm ping %s", out)
+    emit_emf()
+    return out
+
+
+def popular_queries(db: Session) -> List[str]:
+    """PRIME_QUERIES, then the recorded top queries, deduped, capped at
+    PRIME_TOP_N. A stats read failure degrades to the configured list."""
+    configured = parse_prime_queries(settings.PRIME_QUERIES, settings.PRIME_TOP_N)
+    try:
+        recorded = top_queries(db, settings.PRIME_TOP_N)
+    except Exception as e:
+        db.rollback()
+        logger.warning("query stats read failed: %s", e)
+        recorded = []
+    return list(dict.fromkeys(configured + recorded))[: max(settings.PRIME_TOP_N, 0)]
+
+
+def parse_prime_queries(raw: str, top_n: int) -> List[str]:
+    seen: dict = {}
+    for q in (raw or "").split(","):
+        q = q.strip()
+        if q:
+            seen.setdefault(q, None)
+    return list(seen)[: max(top_n, 0)]
+
+
+def preload_queries(db: Session, queries: List[str], started: float) -> int:
+    """Compute `queries` into the unified-search cache with the front's default
+    arguments. Stops early once PRIME_BUDGET_SEC (measured from ``started``)
+    is spent. Returns how many were computed."""
+    svc = SearchService(db)
+    done = 0
+    for q in queries:
+        if time.perf_counter() - started > settings.PRIME_BUDGET_SEC:
+            logger.info("prime budget spent after %d/%d queries", done, len(queries))
+            break
+        try:
+            svc.unified_search(q=q, limit=_PRIME_SEARCH_LIMIT, offset=0)
+            done += 1
+        except Exception as e:
+            db.rollback()
+            logger.warning("prime query %r failed: %s", q, e)
+    db.rollback()
+    return done
+
+
+def _timed(label: str, fn: Callable[[], None]) -> bool:
+    t0 = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        logger.warning("cold-start priming step %r failed: %s", label, e, exc_info=True)
+        return False
+    logger.info("cold-start priming %s: %.1fms", label, (time.perf_counter() - t0) * 1000)
+    return True
+
+
+def _prime_serializers() -> None:
+    track = TrackItem(id=_SENTINEL_ID, title="", album_id=_SENTINEL_ID, feat_artist_names=[""])
+    unified = UnifiedSearchResult(
+        artists=[ArtistItem(id=_SENTINEL_ID, name="", genres=[""])],
+        albums=[AlbumItem(id=_SENTINEL_ID, title="")],
+        tracks=[track],
+        debug=[ExplainEntry(bucket="artist", id=_SENTINEL_ID, rank=1, path="literal")],
+    )
+    detail = AlbumDetail(
+        album=AlbumOut(id=_SENTINEL_ID, title=""),
+        artists=[ArtistOut(id=_SENTINEL_ID, name="")],
+        tracks=[TrackOut(id=_SENTINEL_ID, title="")],
+    )
+    for model in (unified, detail, ArtistHero(name=""), track):
+        # Round-trip both the dict path (FastAPI response validation) and the
+        # JSON path, so every nested validator/serializer has run once.
+        type(model).model_validate(model.model_dump())
+        model.model_dump_json()
+
+
+def _prime_statements(db: Session) -> None:
+    # Read-only + rolled back: nothing here can write, even by accident.
+    db.execute(text("SET TRANSACTION READ ONLY"))
+    try:
+        artists = ArtistRepository(db)
+        albums = AlbumRepository(db)
+        tracks = TrackRepository(db, artists)
+
+        artists.exists_by_spotify_id(_SENTINEL_SPOTIFY_ID)
+        artists.get_by_spotify_id(_SENTINEL_SPOTIFY_ID)
+        artists.get_by_id(_SENTINEL_ID)
+        artists.count_albums_and_tracks(_SENTINEL_ID)
+        if settings.ARTIST_STATS_ENABLED:
+            artists.get_with_counts_by_id(_SENTINEL_ID)
+            artists.get_with_counts_by_spotify_id(_SENTINEL_SPOTIFY_ID)
+        artists.search_rows_by_name(_SENTINEL_Q, 0, 0)
+        artists.rows_by_album_ids([_SENTINEL_ID])
+        artists.rows_by_track_ids([_SENTINEL_ID])
+        artists.get_by_ids([_SENTINEL_ID])
+        artists.refs_by_track_ids([_SENTINEL_ID])
+        artists.refs_by_album_ids([_SENTINEL_ID])
+        artists.get_map_by_spotify_ids([_SENTINEL_SPOTIFY_ID])
+
+        albums.exists_by_spotify_id(_SENTINEL_SPOTIFY_ID)
+        albums.get_detail_json(_SENTINEL_ID)
+        albums.get_detail_json_by_spotify_id(_SENTINEL_SPOTIFY_ID)
+        albums.get_by_spotify_id(_SENTINEL_SPOTIFY_ID)
+        albums.search_rows_by_title(_SENTINEL_Q, 0, 0)
+        albums.list_rows_by_artist_id(_SENTINEL_ID, limit=0)
+        albums.rows_by_ids([_SENTINEL_ID])
+        albums.get_by_ids([_SENTINEL_ID])
+        albums.artist_ids_by_album_ids([_SENTINEL_ID])
+        if not settings.PRIMARY_ARTIST_COLUMNS_ENABLED:
+            albums.get_primary_artist_map([_SENTINEL_ID])
+        albums.get_existing_spotify_ids([_SENTINEL_SPOTIFY_ID])
+        albums.list_by_artistId_artist(artist_id=_SENTINEL_ID, limit=0, offset=0)
+        albums.list_by_spotify_artist(spotify_id=_SENTINEL_SPOTIFY_ID, limit=0, offset=0)
+
+        tracks.search_rows_by_title(_SENTINEL_Q, 0, 0)
+        tracks.list_rows_by_artist_id(_SENTINEL_ID, limit=0)
+        tracks.list_top_tracks_by_artist(_SENTINEL_ID, limit=0)
+        if settings.TOP_TRACKS_MATVIEW_ENABLED:
+            tracks.list_top_tracks_materialized(_SENTINEL_ID, 0, max_age_sec=0)
+        tracks.list_rows_by_album_ids([_SENTINEL_ID], 0)
+        tracks.get_by_ids([_SENTINEL_ID])
+        tracks.artist_ids_by_track_ids([_SENTINEL_ID])
+
+        if settings.ABSORB_TRACKING_ENABLED:
+            AbsorbRepository(db).get_status(KIND_ALBUM, _SENTINEL_SPOTIFY_ID)
+    finally:
+        # Ends the transaction; the connection goes back to the pool warm.
+        db.rollback()
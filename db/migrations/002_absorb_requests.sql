@@ -0,0 +1,60 @@
+-- Migration: 002_absorb_requests
+-- Purpose:   Absorb-tracking table so by-spotify lookups can answer "pending"
+--            (with an ETA) instead of a blind 404, and /candidates can skip
+--            re-enqueueing spotify ids that are already in flight.
+-- Covers:    myblog_music ABSORB_TRACKING_ENABLED (default off until applied)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Lifecycle:
+--   - myblog_music (/search/candidates) UPSERTs a row per enqueued album id —
+--     and per not-yet-absorbed primary artist of those albums — with
+--     state='pending'.
+--   - The triggers below flip a row to 'done' as soon as the worker INSERTs the
+--     matching albums/artists row, so the worker needs no code change for the
+--     happy path.
+--   - On a permanent failure the worker marks the row explicitly:
+--       UPDATE absorb_requests SET state = 'failed', updated_at = NOW()
+--        WHERE kind = 'album' AND spotify_id = ANY(:ids);
+--
+-- Notes:
+--   - Idempotent: re-running is safe.
+--   - Flip ABSORB_TRACKING_ENABLED=true only after this has been applied.
+
+CREATE TABLE IF NOT EXISTS absorb_requests (
+  kind TEXT NOT NULL,
+  spotify_id TEXT NOT NULL,
+  state TEXT NOT NULL DEFAULT 'pending',
+  market TEXT,
+  attempts INT NOT NULL DEFAULT 1,
+  enqueued_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (kind, spotify_id),
+  CONSTRAINT chk_absorb_requests_kind CHECK (kind IN ('album', 'artist')),
+  CONSTRAINT chk_absorb_requests_state CHECK (state IN ('pending', 'done', 'failed'))
+);
+
+-- Small hot set: only in-flight rows are ever scanned by the enqueue filter.
+CREATE INDEX IF NOT EXISTS idx_absorb_requests_pending
+  ON absorb_requests (enqueued_at)
+  WHERE state = 'pending';
+
+CREATE OR REPLACE FUNCTION absorb_requests_mark_done() RETURNS trigger AS $$
+BEGIN
+  UPDATE absorb_requests
+     SET state = 'done', updated_at = NOW()
+   WHERE kind = TG_ARGV[0]
+     AND spotify_id = NEW.spotify_id
+     AND state <> 'done';
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_albums_absorb_done ON albums;
+CREATE TRIGGER trg_albums_absorb_done
+  AFTER INSERT ON albums
+  FOR EACH ROW EXECUTE FUNCTION absorb_requests_mark_done('album');
+
+DROP TRIGGER IF EXISTS trg_artists_absorb_done ON artists;
+CREATE TRIGGER trg_artists_absorb_done
+  AFTER INSERT ON artists
+  FOR EACH ROW EXECUTE FUNCTION absorb_requests_mark_done('artist');
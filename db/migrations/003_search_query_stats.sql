@@ -0,0 +1,30 @@
+-- Migration: 003_search_query_stats
+-- Purpose:   Per-query hit counts for /search/unified, so a cold container can
+--            precompute the queries that actually dominate traffic instead of
+--            starting with an empty unified-search cache.
+-- Covers:    myblog_music QUERY_STATS_ENABLED (default off until applied)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Lifecycle:
+--   - Each container keeps a bounded heavy-hitters sketch (app/core/query_stats.py)
+--     of canonical queries (trimmed, whitespace-collapsed, casefolded) and
+--     periodically UPSERTs its per-interval counts here (hits += delta).
+--   - Cold-start priming and the scheduled warm ping read the top rows seen
+--     within QUERY_STATS_WINDOW_DAYS.
+--   - Rows are never deleted by the service; prune long-idle ones at will:
+--       DELETE FROM search_query_stats WHERE last_seen_at < NOW() - INTERVAL '90 days';
+--
+-- Notes:
+--   - Idempotent: re-running is safe.
+--   - Flip QUERY_STATS_ENABLED=true only after this has been applied.
+
+CREATE TABLE IF NOT EXISTS search_query_stats (
+  q TEXT PRIMARY KEY,
+  hits BIGINT NOT NULL DEFAULT 0,
+  first_seen_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  last_seen_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Top-N read: recent window ordered by hits.
+CREATE INDEX IF NOT EXISTS idx_search_query_stats_hits
+  ON search_query_stats (hits DESC, last_seen_at);
@@ -0,0 +1,118 @@
+-- Migration: 004_artist_stats
+-- Purpose:   Per-artist album/track counters maintained by triggers, so the
+--            artist hero is one primary-key read instead of two COUNT(*) scans
+--            over album_artists / track_artists on every view.
+-- Covers:    myblog_music ARTIST_STATS_ENABLED (default off until applied)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Lifecycle:
+--   - Statement-level triggers on album_artists / track_artists apply the
+--     per-artist delta of each INSERT / DELETE statement (transition tables —
+--     one upsert per statement, not per link row). The worker needs no change.
+--   - An artist without any link row has no stats row; readers treat it as 0/0.
+--   - artist_stats_reconcile() recomputes the counters from the join tables and
+--     fixes any drift (TRUNCATE, link-row UPDATEs, manual edits); it returns the
+--     number of rows it corrected. Run it on a schedule:
+--       python scripts/reconcile_artist_stats.py
+--
+-- Notes:
+--   - Idempotent: re-running is safe (it also re-runs the backfill).
+--   - Apply in one transaction (psql -1 -f ...): the triggers exist before the
+--     backfill, and the backfill's share lock holds off concurrent link writes.
+--   - Flip ARTIST_STATS_ENABLED=true only after this has been applied.
+
+CREATE TABLE IF NOT EXISTS artist_stats (
+  artist_id UUID PRIMARY KEY REFERENCES artists(id) ON DELETE CASCADE,
+  album_count INT NOT NULL DEFAULT 0,
+  track_count INT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION artist_stats_apply() RETURNS trigger AS $$
+-- TG_ARGV[0]: 'album' | 'track' — which counter the link table feeds.
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO artist_stats AS s (artist_id, album_count, track_count)
+    SELECT artist_id,
+           CASE WHEN TG_ARGV[0] = 'album' THEN count(*) ELSE 0 END,
+           CASE WHEN TG_ARGV[0] = 'track' THEN count(*) ELSE 0 END
+      FROM changed
+     GROUP BY artist_id
+    ON CONFLICT (artist_id) DO UPDATE
+       SET album_count = s.album_count + EXCLUDED.album_count,
+           track_count = s.track_count + EXCLUDED.track_count,
+           updated_at = NOW();
+  ELSE
+    -- Never below zero: a drifted counter must not fail the worker's write.
+    UPDATE artist_stats s
+       SET album_count = GREATEST(s.album_count - CASE WHEN TG_ARGV[0] = 'album' THEN d.n ELSE 0 END, 0),
+           track_count = GREATEST(s.track_count - CASE WHEN TG_ARGV[0] = 'track' THEN d.n ELSE 0 END, 0),
+           updated_at = NOW()
+      FROM (SELECT artist_id, count(*) AS n FROM changed GROUP BY artist_id) d
+     WHERE s.artist_id = d.artist_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_album_artists_stats_ins ON album_artists;
+CREATE TRIGGER trg_album_artists_stats_ins
+  AFTER INSERT ON album_artists
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION artist_stats_apply('album');
+
+DROP TRIGGER IF EXISTS trg_album_artists_stats_del ON album_artists;
+CREATE TRIGGER trg_album_artists_stats_del
+  AFTER DELETE ON album_artists
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION artist_stats_apply('album');
+
+DROP TRIGGER IF EXISTS trg_track_artists_stats_ins ON track_artists;
+CREATE TRIGGER trg_track_artists_stats_ins
+  AFTER INSERT ON track_artists
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION artist_stats_apply('track');
+
+DROP TRIGGER IF EXISTS trg_track_artists_stats_del ON track_artists;
+CREATE TRIGGER trg_track_artists_stats_del
+  AFTER DELETE ON track_artists
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION artist_stats_apply('track');
+
+CREATE OR REPLACE FUNCTION artist_stats_reconcile() RETURNS integer AS $$
+DECLARE
+  fixed integer;
+BEGIN
+  -- Readers proceed; link writes wait until the recount commits, so no
+  -- trigger delta can land between the count and the overwrite.
+  LOCK TABLE album_artists, track_artists IN SHARE MODE;
+  WITH truth AS (
+    SELECT a.id AS artist_id,
+           COALESCE(al.n, 0) AS album_count,
+           COALESCE(tr.n, 0) AS track_count
+      FROM artists a
+      LEFT JOIN (SELECT artist_id, count(*)::int AS n FROM album_artists GROUP BY artist_id) al
+        ON al.artist_id = a.id
+      LEFT JOIN (SELECT artist_id, count(*)::int AS n FROM track_artists GROUP BY artist_id) tr
+        ON tr.artist_id = a.id
+  ), fixed_rows AS (
+    INSERT INTO artist_stats AS s (artist_id, album_count, track_count)
+    SELECT t.artist_id, t.album_count, t.track_count
+      FROM truth t
+      LEFT JOIN artist_stats cur ON cur.artist_id = t.artist_id
+     WHERE (cur.artist_id IS NULL AND (t.album_count > 0 OR t.track_count > 0))
+        OR cur.album_count <> t.album_count
+        OR cur.track_count <> t.track_count
+    ON CONFLICT (artist_id) DO UPDATE
+       SET album_count = EXCLUDED.album_count,
+           track_count = EXCLUDED.track_count,
+           updated_at = NOW()
+    RETURNING 1
+  )
+  SELECT count(*) INTO fixed FROM fixed_rows;
+  RETURN fixed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill (and the reconcile path from here on).
+SELECT artist_stats_reconcile();
@@ -0,0 +1,53 @@
+-- Migration: 005_artist_top_tracks
+-- Purpose:   Precomputed per-artist top-50 track ranking for the artist drill-in
+--            (GET /artists/{id}/top-tracks), read with an index range scan on
+--            (artist_id, rank) instead of joining track_artists → tracks → albums
+--            and sorting on every request.
+-- Covers:    myblog_music TOP_TRACKS_MATVIEW_ENABLED (default off until applied)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Lifecycle:
+--   - Ranking = TrackRepository.list_top_tracks_by_artist: views DESC →
+--     albums.popularity DESC NULLS LAST → albums.release_date DESC NULLS LAST →
+--     track_no ASC (track id as the final, deterministic tiebreak).
+--   - Refresh at least every 5 minutes (the DETAIL_CACHE_CONTROL max-age), e.g.
+--     from the same EventBridge schedule as the warm ping:
+--       python scripts/refresh_artist_top_tracks.py
+--     CONCURRENTLY keeps the view readable during the refresh (needs the unique
+--     index below).
+--   - Every row carries the refresh time. The endpoint serves from the view
+--     only while it is younger than the max-age (and has rows for the artist);
+--     otherwise it falls back to the live query, so a stalled refresh job costs
+--     latency, never staleness.
+--
+-- Notes:
+--   - Idempotent: re-running is safe (the view is only created once; refresh it
+--     after changing the ranking by dropping and re-applying).
+--   - Flip TOP_TRACKS_MATVIEW_ENABLED=true only after this has been applied.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS artist_top_tracks AS
+SELECT ranked.artist_id,
+       ranked.rank,
+       ranked.track_id,
+       NOW() AS refreshed_at
+  FROM (
+    SELECT ta.artist_id,
+           ta.track_id,
+           row_number() OVER (
+             PARTITION BY ta.artist_id
+             ORDER BY t.views DESC,
+                      al.popularity DESC NULLS LAST,
+                      al.release_date DESC NULLS LAST,
+                      t.track_no ASC NULLS LAST,
+                      t.id
+           )::int AS rank
+      FROM track_artists ta
+      JOIN tracks t ON t.id = ta.track_id
+      JOIN albums al ON al.id = t.album_id
+  ) ranked
+ WHERE ranked.rank <= 50
+WITH DATA;
+
+-- Range-scan read path + required by REFRESH ... CONCURRENTLY.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_artist_top_tracks_artist_rank
+  ON artist_top_tracks (artist_id, rank);
@@ -0,0 +1,194 @@
+-- Migration: 006_primary_artist_columns
+-- Purpose:   Store the BUG-19 "stable primary artist" on albums and tracks
+--            (primary_artist_id / _name / _spotify_id), so list and search
+--            responses read it as plain columns instead of a per-request
+--            primary-artist join (albums) or a per-row popularity sort over the
+--            credited artists (tracks).
+-- Covers:    myblog_music PRIMARY_ARTIST_COLUMNS_ENABLED (default off until applied)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Lifecycle:
+--   - Pick = most popular credited artist, ties by name in code-point order
+--     (popularity DESC NULLS LAST, name COLLATE "C") — the order
+--     TrackItemMapper's _sort_artists_by_popularity applies in Python.
+--     albums: from album_artists. tracks: from track_artists, falling back to
+--     the album's artists when the track credits none.
+--   - Maintained by triggers: statement-level on album_artists / track_artists
+--     INSERT / DELETE (transition tables — one recompute per statement, for the
+--     touched albums/tracks only), row-level on artists when name, spotify_id
+--     or popularity changes, and row-level on tracks INSERT / UPDATE OF
+--     album_id (a track credited to nobody takes its album's pick, and may be
+--     inserted after — or moved away from — that album's links). The worker
+--     needs no change.
+--   - primary_artist_refresh_albums(ids) / primary_artist_refresh_tracks(ids)
+--     only write rows whose pick changed. Passing every id (as the backfill
+--     below does) repairs drift after TRUNCATE or link-row UPDATEs.
+--
+-- Notes:
+--   - Idempotent: re-running is safe (it also re-runs the backfill).
+--   - Apply in one transaction (psql -1 -f ...): the triggers exist before the
+--     backfill runs.
+--   - Flip PRIMARY_ARTIST_COLUMNS_ENABLED=true only after this has been applied.
+
+ALTER TABLE albums
+  ADD COLUMN IF NOT EXISTS primary_artist_id UUID,
+  ADD COLUMN IF NOT EXISTS primary_artist_name TEXT,
+  ADD COLUMN IF NOT EXISTS primary_artist_spotify_id TEXT;
+
+ALTER TABLE tracks
+  ADD COLUMN IF NOT EXISTS primary_artist_id UUID,
+  ADD COLUMN IF NOT EXISTS primary_artist_name TEXT,
+  ADD COLUMN IF NOT EXISTS primary_artist_spotify_id TEXT;
+
+CREATE OR REPLACE FUNCTION primary_artist_refresh_albums(ids UUID[]) RETURNS void AS $$
+BEGIN
+  UPDATE albums al
+     SET primary_artist_id = p.id,
+         primary_artist_name = p.name,
+         primary_artist_spotify_id = p.spotify_id
+    FROM (
+      SELECT a.id AS album_id, pick.id, pick.name, pick.spotify_id
+        FROM albums a
+        LEFT JOIN LATERAL (
+          SELECT ar.id, ar.name, ar.spotify_id
+            FROM album_artists aa
+            JOIN artists ar ON ar.id = aa.artist_id
+           WHERE aa.album_id = a.id
+           ORDER BY ar.popularity DESC NULLS LAST, ar.name COLLATE "C"
+           LIMIT 1
+        ) pick ON true
+       WHERE a.id = ANY(ids)
+    ) p
+   WHERE al.id = p.album_id
+     AND (al.primary_artist_id, al.primary_artist_name, al.primary_artist_spotify_id)
+         IS DISTINCT FROM (p.id, p.name, p.spotify_id);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION primary_artist_refresh_tracks(ids UUID[]) RETURNS void AS $$
+BEGIN
+  UPDATE tracks tr
+     SET primary_artist_id = p.id,
+         primary_artist_name = p.name,
+         primary_artist_spotify_id = p.spotify_id
+    FROM (
+      SELECT t.id AS track_id,
+             COALESCE(own.id, fb.id) AS id,
+             CASE WHEN own.id IS NOT NULL THEN own.name ELSE fb.name END AS name,
+             CASE WHEN own.id IS NOT NULL THEN own.spotify_id ELSE fb.spotify_id END AS spotify_id
+        FROM tracks t
+        LEFT JOIN LATERAL (
+          SELECT ar.id, ar.name, ar.spotify_id
+            FROM track_artists ta
+            JOIN artists ar ON ar.id = ta.artist_id
+           WHERE ta.track_id = t.id
+           ORDER BY ar.popularity DESC NULLS LAST, ar.name COLLATE "C"
+           LIMIT 1
+        ) own ON true
+        LEFT JOIN LATERAL (
+          SELECT ar.id, ar.name, ar.spotify_id
+            FROM album_artists aa
+            JOIN artists ar ON ar.id = aa.artist_id
+           WHERE aa.album_id = t.album_id
+           ORDER BY ar.popularity DESC NULLS LAST, ar.name COLLATE "C"
+           LIMIT 1
+        ) fb ON own.id IS NULL
+       WHERE t.id = ANY(ids)
+    ) p
+   WHERE tr.id = p.track_id
+     AND (tr.primary_artist_id, tr.primary_artist_name, tr.primary_artist_spotify_id)
+         IS DISTINCT FROM (p.id, p.name, p.spotify_id);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION primary_artist_on_album_link() RETURNS trigger AS $$
+BEGIN
+  PERFORM primary_artist_refresh_albums(ARRAY(SELECT DISTINCT album_id FROM changed));
+  -- Tracks of those albums may use the album's artists as their fallback.
+  PERFORM primary_artist_refresh_tracks(ARRAY(
+    SELECT t.id FROM tracks t WHERE t.album_id IN (SELECT album_id FROM changed)
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION primary_artist_on_track_link() RETURNS trigger AS $$
+BEGIN
+  PERFORM primary_artist_refresh_tracks(ARRAY(SELECT DISTINCT track_id FROM changed));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION primary_artist_on_track() RETURNS trigger AS $$
+BEGIN
+  PERFORM primary_artist_refresh_tracks(ARRAY[NEW.id]);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION primary_artist_on_artist() RETURNS trigger AS $$
+BEGIN
+  PERFORM primary_artist_refresh_albums(ARRAY(
+    SELECT album_id FROM album_artists WHERE artist_id = NEW.id
+  ));
+  PERFORM primary_artist_refresh_tracks(ARRAY(
+    SELECT track_id FROM track_artists WHERE artist_id = NEW.id
+    UNION
+    SELECT t.id FROM tracks t
+      JOIN album_artists aa ON aa.album_id = t.album_id
+     WHERE aa.artist_id = NEW.id
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_album_artists_primary_ins ON album_artists;
+CREATE TRIGGER trg_album_artists_primary_ins
+  AFTER INSERT ON album_artists
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION primary_artist_on_album_link();
+
+DROP TRIGGER IF EXISTS trg_album_artists_primary_del ON album_artists;
+CREATE TRIGGER trg_album_artists_primary_del
+  AFTER DELETE ON album_artists
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION primary_artist_on_album_link();
+
+DROP TRIGGER IF EXISTS trg_track_artists_primary_ins ON track_artists;
+CREATE TRIGGER trg_track_artists_primary_ins
+  AFTER INSERT ON track_artists
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION primary_artist_on_track_link();
+
+DROP TRIGGER IF EXISTS trg_track_artists_primary_del ON track_artists;
+CREATE TRIGGER trg_track_artists_primary_del
+  AFTER DELETE ON track_artists
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION primary_artist_on_track_link();
+
+DROP TRIGGER IF EXISTS trg_tracks_primary_ins ON tracks;
+CREATE TRIGGER trg_tracks_primary_ins
+  AFTER INSERT ON tracks
+  FOR EACH ROW EXECUTE FUNCTION primary_artist_on_track();
+
+-- Only album_id: the refresh's own UPDATE of the primary_artist_* columns
+-- must not re-fire it.
+DROP TRIGGER IF EXISTS trg_tracks_primary_upd ON tracks;
+CREATE TRIGGER trg_tracks_primary_upd
+  AFTER UPDATE OF album_id ON tracks
+  FOR EACH ROW
+  WHEN (OLD.album_id IS DISTINCT FROM NEW.album_id)
+  EXECUTE FUNCTION primary_artist_on_track();
+
+-- A popularity refresh can change the pick; skip no-op updates.
+DROP TRIGGER IF EXISTS trg_artists_primary_upd ON artists;
+CREATE TRIGGER trg_artists_primary_upd
+  AFTER UPDATE OF name, spotify_id, popularity ON artists
+  FOR EACH ROW
+  WHEN ((OLD.name, OLD.spotify_id, OLD.popularity)
+        IS DISTINCT FROM (NEW.name, NEW.spotify_id, NEW.popularity))
+  EXECUTE FUNCTION primary_artist_on_artist();
+
+-- Backfill (and the drift-repair path from here on).
+SELECT primary_artist_refresh_albums(ARRAY(SELECT id FROM albums));
+SELECT primary_artist_refresh_tracks(ARRAY(SELECT id FROM tracks));
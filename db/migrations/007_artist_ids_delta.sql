@@ -0,0 +1,19 @@
+-- Migration: 007_artist_ids_delta
+-- Purpose:   Indexes for the incremental catalog-artist enumeration
+--            (GET /artists/ids?since=...): find albums absorbed after a
+--            timestamp, then check each of their artists for an older album.
+-- Covers:    myblog_music /artists/ids delta mode (works without it, but scans)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Notes:
+--   - CONCURRENTLY cannot run inside a transaction block — run this file
+--     without -1 / BEGIN.
+--   - Idempotent: re-running is safe.
+--   - album_artists' primary key leads with album_id, so lookups by artist
+--     (this, and the artist album lists) had no index of their own.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_albums_created_at
+  ON albums (created_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_album_artists_artist_id
+  ON album_artists (artist_id);
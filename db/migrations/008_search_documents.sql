@@ -0,0 +1,250 @@
+-- Migration: 008_search_documents
+-- Purpose:   One precomputed full-text document per album and per track —
+--            its title plus its credited artists' names and aliases (tracks:
+--            plus the album title) as a tsvector under a GIN index — so a
+--            multi-word "<artist> <title>" query is one ranked @@ / ts_rank
+--            query instead of 2-3 queries per enumerated (artist, title) split.
+-- Covers:    myblog_music SEARCH_FTS_ENABLED (default off until applied)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Lifecycle:
+--   - Text config 'simple' (lowercase, no stemming / stop words: names and
+--     titles are not prose), plus every run of Hangul syllables as overlapping
+--     bigrams — '방탄소년단' is also '방탄 탄소 소년 년단' — so a query word
+--     that is part of a Hangul word matches. The service builds its tsquery
+--     with the same search_hangul_bigrams().
+--   - Weights: A the title, B credited artists (tracks: their own credits and
+--     the album's), C the album title of a track.
+--   - Maintained by triggers: row-level on albums / tracks (title, album_id,
+--     delete) and on artists when name or aliases change; statement-level on
+--     album_artists / track_artists INSERT / DELETE (transition tables). The
+--     worker needs no change.
+--   - search_documents_refresh_albums(ids) / _tracks(ids) rebuild the given
+--     documents and only write changed ones. Passing every id (as the backfill
+--     below does) repairs drift after TRUNCATE or link-row UPDATEs.
+--
+-- Notes:
+--   - Idempotent: re-running is safe (it also re-runs the backfill).
+--   - Apply in one transaction (psql -1 -f ...): the triggers exist before the
+--     backfill runs.
+--   - Flip SEARCH_FTS_ENABLED=true only after this has been applied.
+
+CREATE TABLE IF NOT EXISTS search_documents (
+  kind TEXT NOT NULL CHECK (kind IN ('album', 'track')),
+  entity_id UUID NOT NULL,
+  document TSVECTOR NOT NULL,
+  updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (kind, entity_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_documents_document
+  ON search_documents USING GIN (document);
+
+-- Hangul syllable runs of 2+ → their bigrams, space-separated; other text as is.
+CREATE OR REPLACE FUNCTION search_hangul_bigrams(t TEXT) RETURNS TEXT AS $$
+DECLARE
+  run TEXT;
+  res TEXT := '';
+BEGIN
+  FOR run IN SELECT (regexp_matches(coalesce(t, ''), '[가-힣]+|[^가-힣]+', 'g'))[1] LOOP
+    IF char_length(run) >= 2 AND run ~ '^[가-힣]+$' THEN
+      FOR i IN 1 .. char_length(run) - 1 LOOP
+        res := res || ' ' || substr(run, i, 2);
+      END LOOP;
+      res := res || ' ';
+    ELSE
+      res := res || run;
+    END IF;
+  END LOOP;
+  RETURN res;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION search_document_part(t TEXT, w "char") RETURNS TSVECTOR AS $$
+  SELECT setweight(
+    to_tsvector('simple', coalesce(t, '')) || to_tsvector('simple', search_hangul_bigrams(t)),
+    w
+  );
+$$ LANGUAGE sql IMMUTABLE;
+
+-- An artist's name and aliases (MusicBrainz JSONB array) as one text.
+CREATE OR REPLACE FUNCTION search_artist_text(name TEXT, aliases JSONB) RETURNS TEXT AS $$
+  SELECT concat_ws(' ', name, CASE WHEN jsonb_typeof(aliases) = 'array' THEN
+    (SELECT string_agg(e, ' ') FROM jsonb_array_elements_text(aliases) AS e)
+  END);
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION search_documents_refresh_albums(ids UUID[]) RETURNS void AS $$
+BEGIN
+  INSERT INTO search_documents AS d (kind, entity_id, document)
+  SELECT 'album', a.id,
+         search_document_part(a.title, 'A') || search_document_part(cr.names, 'B')
+    FROM albums a
+    LEFT JOIN LATERAL (
+      SELECT string_agg(search_artist_text(ar.name, ar.aliases), ' ') AS names
+        FROM album_artists aa
+        JOIN artists ar ON ar.id = aa.artist_id
+       WHERE aa.album_id = a.id
+    ) cr ON true
+   WHERE a.id = ANY(ids)
+  ON CONFLICT (kind, entity_id) DO UPDATE
+     SET document = EXCLUDED.document, updated_at = NOW()
+   WHERE d.document IS DISTINCT FROM EXCLUDED.document;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_refresh_tracks(ids UUID[]) RETURNS void AS $$
+BEGIN
+  INSERT INTO search_documents AS d (kind, entity_id, document)
+  SELECT 'track', t.id,
+         search_document_part(t.title, 'A')
+           || search_document_part(cr.names, 'B')
+           || search_document_part(al.title, 'C')
+    FROM tracks t
+    LEFT JOIN albums al ON al.id = t.album_id
+    LEFT JOIN LATERAL (
+      SELECT string_agg(search_artist_text(ar.name, ar.aliases), ' ') AS names
+        FROM artists ar
+       WHERE ar.id IN (
+         SELECT ta.artist_id FROM track_artists ta WHERE ta.track_id = t.id
+         UNION
+         SELECT aa.artist_id FROM album_artists aa WHERE aa.album_id = t.album_id
+       )
+    ) cr ON true
+   WHERE t.id = ANY(ids)
+  ON CONFLICT (kind, entity_id) DO UPDATE
+     SET document = EXCLUDED.document, updated_at = NOW()
+   WHERE d.document IS DISTINCT FROM EXCLUDED.document;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_on_album() RETURNS trigger AS $$
+BEGIN
+  PERFORM search_documents_refresh_albums(ARRAY[NEW.id]);
+  IF TG_OP = 'UPDATE' THEN
+    -- The album title is part of its tracks' documents.
+    PERFORM search_documents_refresh_tracks(ARRAY(
+      SELECT t.id FROM tracks t WHERE t.album_id = NEW.id
+    ));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_on_track() RETURNS trigger AS $$
+BEGIN
+  PERFORM search_documents_refresh_tracks(ARRAY[NEW.id]);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_on_delete() RETURNS trigger AS $$
+-- TG_ARGV[0]: 'album' | 'track'
+BEGIN
+  DELETE FROM search_documents WHERE kind = TG_ARGV[0] AND entity_id = OLD.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_on_album_link() RETURNS trigger AS $$
+BEGIN
+  PERFORM search_documents_refresh_albums(ARRAY(SELECT DISTINCT album_id FROM changed));
+  -- A track's document carries its album's artists too.
+  PERFORM search_documents_refresh_tracks(ARRAY(
+    SELECT t.id FROM tracks t WHERE t.album_id IN (SELECT album_id FROM changed)
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_on_track_link() RETURNS trigger AS $$
+BEGIN
+  PERFORM search_documents_refresh_tracks(ARRAY(SELECT DISTINCT track_id FROM changed));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION search_documents_on_artist() RETURNS trigger AS $$
+BEGIN
+  PERFORM search_documents_refresh_albums(ARRAY(
+    SELECT album_id FROM album_artists WHERE artist_id = NEW.id
+  ));
+  PERFORM search_documents_refresh_tracks(ARRAY(
+    SELECT track_id FROM track_artists WHERE artist_id = NEW.id
+    UNION
+    SELECT t.id FROM tracks t
+      JOIN album_artists aa ON aa.album_id = t.album_id
+     WHERE aa.artist_id = NEW.id
+  ));
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_albums_searchdoc_ins ON albums;
+CREATE TRIGGER trg_albums_searchdoc_ins
+  AFTER INSERT ON albums
+  FOR EACH ROW EXECUTE FUNCTION search_documents_on_album();
+
+DROP TRIGGER IF EXISTS trg_albums_searchdoc_upd ON albums;
+CREATE TRIGGER trg_albums_searchdoc_upd
+  AFTER UPDATE OF title ON albums
+  FOR EACH ROW
+  WHEN (OLD.title IS DISTINCT FROM NEW.title)
+  EXECUTE FUNCTION search_documents_on_album();
+
+DROP TRIGGER IF EXISTS trg_albums_searchdoc_del ON albums;
+CREATE TRIGGER trg_albums_searchdoc_del
+  AFTER DELETE ON albums
+  FOR EACH ROW EXECUTE FUNCTION search_documents_on_delete('album');
+
+DROP TRIGGER IF EXISTS trg_tracks_searchdoc_ins ON tracks;
+CREATE TRIGGER trg_tracks_searchdoc_ins
+  AFTER INSERT ON tracks
+  FOR EACH ROW EXECUTE FUNCTION search_documents_on_track();
+
+DROP TRIGGER IF EXISTS trg_tracks_searchdoc_upd ON tracks;
+CREATE TRIGGER trg_tracks_searchdoc_upd
+  AFTER UPDATE OF title, album_id ON tracks
+  FOR EACH ROW
+  WHEN ((OLD.title, OLD.album_id) IS DISTINCT FROM (NEW.title, NEW.album_id))
+  EXECUTE FUNCTION search_documents_on_track();
+
+DROP TRIGGER IF EXISTS trg_tracks_searchdoc_del ON tracks;
+CREATE TRIGGER trg_tracks_searchdoc_del
+  AFTER DELETE ON tracks
+  FOR EACH ROW EXECUTE FUNCTION search_documents_on_delete('track');
+
+DROP TRIGGER IF EXISTS trg_album_artists_searchdoc_ins ON album_artists;
+CREATE TRIGGER trg_album_artists_searchdoc_ins
+  AFTER INSERT ON album_artists
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION search_documents_on_album_link();
+
+DROP TRIGGER IF EXISTS trg_album_artists_searchdoc_del ON album_artists;
+CREATE TRIGGER trg_album_artists_searchdoc_del
+  AFTER DELETE ON album_artists
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION search_documents_on_album_link();
+
+DROP TRIGGER IF EXISTS trg_track_artists_searchdoc_ins ON track_artists;
+CREATE TRIGGER trg_track_artists_searchdoc_ins
+  AFTER INSERT ON track_artists
+  REFERENCING NEW TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION search_documents_on_track_link();
+
+DROP TRIGGER IF EXISTS trg_track_artists_searchdoc_del ON track_artists;
+CREATE TRIGGER trg_track_artists_searchdoc_del
+  AFTER DELETE ON track_artists
+  REFERENCING OLD TABLE AS changed
+  FOR EACH STATEMENT EXECUTE FUNCTION search_documents_on_track_link();
+
+DROP TRIGGER IF EXISTS trg_artists_searchdoc_upd ON artists;
+CREATE TRIGGER trg_artists_searchdoc_upd
+  AFTER UPDATE OF name, aliases ON artists
+  FOR EACH ROW
+  WHEN ((OLD.name, OLD.aliases) IS DISTINCT FROM (NEW.name, NEW.aliases))
+  EXECUTE FUNCTION search_documents_on_artist();
+
+-- Backfill (and the drift-repair path from here on).
+SELECT search_documents_refresh_albums(ARRAY(SELECT id FROM albums));
+SELECT search_documents_refresh_tracks(ARRAY(SELECT id FROM tracks));
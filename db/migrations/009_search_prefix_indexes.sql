@@ -0,0 +1,25 @@
+-- Migration: 009_search_prefix_indexes
+-- Purpose:   Expression indexes for the search planner's `prefix` strategy
+--            (app/core/search_plan.py): 1–2 character queries match
+--            lower(name / title) by prefix as a btree range scan instead of a
+--            full-table ILIKE '%q%'.
+-- Covers:    myblog_music unified search, prefix strategy (works without it,
+--            but scans)
+-- Canonical: mirror into docs/contracts/schema.sql (myblog-workspace repo)
+--
+-- Notes:
+--   - COLLATE "C": code-point order, so the service's [q, q⁺) range equals
+--     LIKE 'q%' regardless of the database collation. The queries use the
+--     identical expression (lower(col) COLLATE "C").
+--   - CONCURRENTLY cannot run inside a transaction block — run this file
+--     without -1 / BEGIN.
+--   - Idempotent: re-running is safe.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_artists_name_prefix
+  ON artists ((lower(name) COLLATE "C"));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_albums_title_prefix
+  ON albums ((lower(title) COLLATE "C"));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tracks_title_prefix
+  ON tracks ((lower(title) COLLATE "C"));
@@ -0,0 +1,143 @@
+"""Benchmark read-path DTOs (app/domain/rows.py) against ORM entity hydration.
+
+For each list shape the read endpoints serve — artists, albums, tracks — loads
+`--limit` rows both ways and maps them to the response items, one fresh session
+per simulated request:
+
+- orm: `select(Entity)` (+ the selectinloads the mapper needs), as before
+- dto: the repository's Core-projection method
+
+Reports per-request latency (median / p95) and Python allocations (tracemalloc
+peak bytes and live blocks at the end of the request). Needs a populated DB:
+
+    DATABASE_URL=postgresql+psycopg://... python scripts/bench_read_dtos.py --limit 100
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from myblog_shared_db.models import Album, Artist, Track, track_artists_table  # noqa: E402
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.mappers.album_mapper import AlbumItemMapper  # noqa: E402
+from app.mappers.artist_mapper import ArtistItemMapper  # noqa: E402
+from app.mappers.track_mapper import TrackItemMapper  # noqa: E402
+from app.repositories.album_repo import AlbumRepository  # noqa: E402
+from app.repositories.artist_repo import ArtistRepository  # noqa: E402
+from app.repositories.track_repo import TrackRepository  # noqa: E402
+
+
+def _sample(limit: int):
+    with SessionLocal() as db:
+        artist_ids = db.execute(select(Artist.id).limit(limit)).scalars().all()
+        album_ids = db.execute(select(Album.id).limit(limit)).scalars().all()
+        # The artist with the most credited tracks, so the top-tracks list fills up.
+        top_artist = db.execute(
+            select(track_artists_table.c.artist_id)
+            .group_by(track_artists_table.c.artist_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).scalar()
+    return artist_ids, album_ids, top_artist
+
+
+def _orm_artists(db, ids, limit):
+    rows = db.execute(select(Artist).where(Artist.id.in_(ids))).scalars().all()
+    return ArtistItemMapper.to_list(rows)
+
+
+def _dto_artists(db, ids, limit):
+    return ArtistItemMapper.to_list(ArtistRepository(db).get_by_ids(ids))
+
+
+def _orm_albums(db, ids, limit):
+    rows = db.execute(select(Album).where(Album.id.in_(ids))).scalars().all()
+    return AlbumItemMapper.to_list(rows, {})
+
+
+def _dto_albums(db, ids, limit):
+    return AlbumItemMapper.to_list(AlbumRepository(db).get_by_ids(ids), {})
+
+
+def _orm_tracks(db, artist_id, limit):
+    rows = db.execute(
+        select(Track)
+        .options(
+            selectinload(Track.album).selectinload(Album.artists),
+            selectinload(Track.artists),
+        )
+        .join(track_artists_table, track_artists_table.c.track_id == Track.id)
+        .join(Album, Track.album_id == Album.id)
+        .where(track_artists_table.c.artist_id == artist_id)
+        .order_by(
+            Track.views.desc(),
+            Album.popularity.desc().nullslast(),
+            Album.release_date.desc().nullslast(),
+            Track.track_no.asc().nullslast(),
+        )
+        .limit(limit)
+    ).scalars().all()
+    return TrackItemMapper.to_list(rows)
+
+
+def _dto_tracks(db, artist_id, limit):
+    repo = TrackRepository(db, ArtistRepository(db))
+    return TrackItemMapper.to_list(repo.list_top_tracks_by_artist(artist_id, limit=limit))
+
+
+def _measure(fn, arg, limit: int, iterations: int) -> dict:
+    with SessionLocal() as db:  # warm the pool + statement cache
+        n = len(fn(db, arg, limit))
+    latencies, peaks, blocks = [], [], []
+    for _ in range(iterations):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        with SessionLocal() as db:
+            fn(db, arg, limit)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak)
+        blocks.append(sum(s.count for s in tracemalloc.take_snapshot().statistics("filename")))
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        "rows": n,
+        "median_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "peak_kib": statistics.median(peaks) / 1024,
+        "blocks": int(statistics.median(blocks)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    artist_ids, album_ids, top_artist = _sample(args.limit)
+    cases = [
+        ("artists", artist_ids, _orm_artists, _dto_artists),
+        ("albums", album_ids, _orm_albums, _dto_albums),
+        ("tracks", top_artist, _orm_tracks, _dto_tracks),
+    ]
+    print(f"{'shape':8} {'path':4} {'rows':>5} {'median ms':>10} {'p95 ms':>8} {'peak KiB':>9} {'blocks':>7}")
+    for name, arg, orm_fn, dto_fn in cases:
+        for path, fn in (("orm", orm_fn), ("dto", dto_fn)):
+            r = _measure(fn, arg, args.limit, args.iterations)
+            print(
+                f"{name:8} {path:4} {r['rows']:>5} {r['median_ms']:>10.2f} {r['p95_ms']:>8.2f}"
+                f" {r['peak_kib']:>9.1f} {r['blocks']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Build the offline search index (app/core/search_index.py).
+
+Loads one catalog snapshot with COPY (the export_catalog.py loader) and writes
+the binary index that containers map read-only via SEARCH_INDEX_PATH — ship it
+in the Lambda bundle or sync it to /tmp. Rebuild well within
+SEARCH_INDEX_MAX_AGE_SEC:
+
+    DATABASE_URL=postgresql+psycopg://... python scripts/build_search_index.py --out build/search.idx
+
+Reads from DATABASE_REPLICA_URL when set.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.db import engine, replica_engine  # noqa: E402
+from app.core.search_index import build_index  # noqa: E402
+from app.services.catalog_export_service import load_catalog  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="index file to write")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    raw = (replica_engine or engine).raw_connection()
+    try:
+        catalog = load_catalog(raw.driver_connection)
+    finally:
+        raw.close()
+    data = build_index(catalog)
+    tmp = args.out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, args.out)
+    print(
+        f"indexed {len(catalog.artists)} artists, {len(catalog.albums)} albums, "
+        f"{len(catalog.tracks)} tracks → {args.out} ({len(data) / 1e6:.1f} MB) "
+        f"in {time.perf_counter() - t0:.2f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Export the catalog as static artist-hub JSON for the front's build.
+
+One read-only snapshot streamed with COPY (artists, albums, tracks and their
+links), then every hub — hero, first albums page, top tracks — is written in
+parallel worker processes (app/services/catalog_export_service.py). Replaces
+`/artists/ids` + three API requests per artist:
+
+    DATABASE_URL=postgresql+psycopg://... python scripts/export_catalog.py --out build/catalog
+
+Reads from DATABASE_REPLICA_URL when set.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.db import engine, replica_engine  # noqa: E402
+from app.services.catalog_export_service import load_catalog, write_hubs  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="output directory (artists/ is created in it)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="hub-writer processes (default: CPU count; 1 = in-process)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    raw = (replica_engine or engine).raw_connection()
+    try:
+        catalog = load_catalog(raw.driver_connection)
+    finally:
+        raw.close()
+    t1 = time.perf_counter()
+    print(
+        f"loaded {len(catalog.artists)} artists, {len(catalog.albums)} albums, "
+        f"{len(catalog.tracks)} tracks in {t1 - t0:.2f}s"
+    )
+
+    written = write_hubs(catalog, args.out, workers=args.workers)
+    print(f"wrote {written} artist hubs to {args.out} in {time.perf_counter() - t1:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Reconcile the trigger-maintained artist_stats counters (migration 004).
+
+Recounts album_artists / track_artists per artist and fixes drifted rows. The
+triggers keep the counters exact for INSERT / DELETE; this catches everything
+else (TRUNCATE, link-row UPDATEs, manual edits). Schedule it, e.g. nightly:
+
+    DATABASE_URL=postgresql+psycopg://... python scripts/reconcile_artist_stats.py
+
+Exits non-zero on failure; prints how many rows were corrected.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.repositories.artist_stats_repo import ArtistStatsRepository  # noqa: E402
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        fixed = ArtistStatsRepository(db).reconcile()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    print(f"artist_stats: corrected {fixed} row(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Refresh the artist_top_tracks materialized view (migration 005).
+
+Run at least every DETAIL_MAX_AGE_SEC (5 minutes) — e.g. on the warm-ping
+EventBridge schedule — or the top-tracks endpoint stops trusting the view and
+falls back to the live ranking query:
+
+    DATABASE_URL=postgresql+psycopg://... python scripts/refresh_artist_top_tracks.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.db import SessionLocal  # noqa: E402
+from app.repositories.artist_repo import ArtistRepository  # noqa: E402
+from app.repositories.track_repo import TrackRepository  # noqa: E402
+
+
+def main() -> int:
+    t0 = time.perf_counter()
+    db = SessionLocal()
+    try:
+        TrackRepository(db, ArtistRepository(db)).refresh_top_tracks()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    print(f"artist_top_tracks: refreshed in {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Album detail integration test — the one-statement JSON document
+(`AlbumRepository.get_detail_json*`) against real Postgres.
+
+The unit tests only feed the service a canned document, so the SQL shape —
+json_agg ordering, feat exclusion, ext_refs → external_url, the media fields of
+album artists (FEAT-write-ux-bundle PR-2) — is covered here, plus the
+"one statement per detail" contract for both routes.
+
+Guarded by `TEST_DB_URL` like the other integration tests.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+
+from myblog_shared_db.models import (  # noqa: E402
+    Album,
+    Artist,
+    Track,
+    album_artists_table,
+    track_artists_table,
+)
+
+from app.services.album_service import AlbumService  # noqa: E402
+
+_TEST_DB_URL = os.environ.get("TEST_DB_URL")
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not _TEST_DB_URL,
+        reason="integration test requires TEST_DB_URL env var (Neon test branch)",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    eng = create_engine(_TEST_DB_URL, pool_pre_ping=True, future=True)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    conn = engine.connect()
+    txn = conn.begin()
+    Session = sessionmaker(bind=conn, autoflush=False, future=True)
+    s = Session()
+    try:
+        yield s
+    finally:
+        s.close()
+        txn.rollback()
+        conn.close()
+
+
+def _artist(name, **kw):
+    return Artist(id=uuid.uuid4(), name=name, spotify_id=f"sp_{uuid.uuid4().hex[:12]}", **kw)
+
+
+def _seed(session):
+    """Album by Primary + Alpha; track 2 features Zulu, Delta and Alpha (an
+    album artist → not a feat), track 1 is album artists only."""
+    primary = _artist(
+        "Primary",
+        photo_url="https://i.scdn.co/image/p.jpg",
+        genres=["k-pop", "k-ballad"],
+        popularity=88,
+        followers=1234567,
+        spotify_url="https://open.spotify.com/artist/abc",
+    )
+    alpha = _artist("Alpha", popularity=10)
+    zulu, delta = _artist("Zulu"), _artist("Delta")
+    album = Album(
+        id=uuid.uuid4(),
+        title=f"Detail-{uuid.uuid4().hex[:8]}",
+        spotify_id=f"sp_alb_{uuid.uuid4().hex[:10]}",
+        release_date=date(2020, 1, 1),
+        label="Parlophone",
+        ext_refs={"spotify_url": "https://open.spotify.com/album/abc123"},
+    )
+    t1 = Track(id=uuid.uuid4(), album_id=album.id, title="Intro", track_no=1,
+               spotify_id=f"sp_t_{uuid.uuid4().hex[:10]}")
+    t2 = Track(id=uuid.uuid4(), album_id=album.id, title="Song", track_no=2,
+               spotify_id=f"sp_t_{uuid.uuid4().hex[:10]}")
+    session.add_all([primary, alpha, zulu, delta, album, t1, t2])
+    session.flush()
+    session.execute(album_artists_table.insert().values([
+        {"album_id": album.id, "artist_id": primary.id, "role": None},
+        {"album_id": album.id, "artist_id": alpha.id, "role": None},
+    ]))
+    session.execute(track_artists_table.insert().values([
+        {"track_id": t1.id, "artist_id": primary.id, "role": None},
+        {"track_id": t2.id, "artist_id": zulu.id, "role": None},
+        {"track_id": t2.id, "artist_id": delta.id, "role": None},
+        {"track_id": t2.id, "artist_id": alpha.id, "role": None},
+    ]))
+    session.flush()
+    return album
+
+
+def _count_statements(session):
+    counter = {"n": 0}
+
+    @event.listens_for(session.connection(), "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.strip().lower().startswith(("select", "with")):
+            counter["n"] += 1
+
+    return counter
+
+
+def test_album_detail_document(session):
+    album = _seed(session)
+    counter = _count_statements(session)
+
+    res = AlbumService(session).get_album_detail(str(album.id))
+
+    assert counter["n"] == 1, "album detail must be a single statement"
+    assert res.album.title == album.title and res.album.release_date == "2020-01-01"
+    assert res.album.label == "Parlophone"
+    assert res.album.external_url == "https://open.spotify.com/album/abc123"
+
+    assert [a.name for a in res.artists] == ["Primary", "Alpha"]
+    primary = res.artists[0]
+    assert primary.photo_url == "https://i.scdn.co/image/p.jpg"
+    assert primary.genres == ["k-pop", "k-ballad"]
+    assert primary.popularity == 88 and primary.followers_count == 1234567
+    assert primary.spotify_url == "https://open.spotify.com/artist/abc"
+    alpha = res.artists[1]
+    assert alpha.photo_url is None and alpha.genres == [] and alpha.followers_count is None
+
+    assert [t.title for t in res.tracks] == ["Intro", "Song"]
+    assert res.tracks[0].feat_artist_names == []
+    # album artists excluded, the rest sorted
+    assert res.tracks[1].feat_artist_names == ["Delta", "Zulu"]
+
+
+def test_album_detail_by_spotify_is_one_statement(session):
+    album = _seed(session)
+    counter = _count_statements(session)
+
+    res = AlbumService(session).get_album_detail_by_spotify(album.spotify_id)
+
+    assert counter["n"] == 1
+    assert res.album.id == str(album.id)
+    assert len(res.tracks) == 2
+
+
+def test_album_detail_missing_is_404(session):
+    from fastapi import HTTPException
+
+    with pytest.raises(HTTPException) as e:
+        AlbumService(session).get_album_detail(str(uuid.uuid4()))
+    assert e.value.status_code == 404
@@ -0,0 +1,87 @@
+"""db/migrations/006_primary_artist_columns.sql — trigger maintenance.
+
+A track credited to nobody takes its album's primary artist. The pick has to
+follow the track when it is inserted after the album's album_artists rows and
+when it moves to another album — neither touches a link table, so only the
+tracks row trigger covers them. Mock-based tests cannot run plpgsql.
+
+The migration is applied inside the test transaction and rolled back.
+Skipped when TEST_DB_URL is unset (local matrix without Neon test branch).
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+
+from myblog_shared_db.models import Album, Artist, Track, album_artists_table  # noqa: E402
+
+_TEST_DB_URL = os.environ.get("TEST_DB_URL")
+_MIGRATION = Path(__file__).resolve().parents[2] / "db" / "migrations" / "006_primary_artist_columns.sql"
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not _TEST_DB_URL,
+        reason="integration test requires TEST_DB_URL env var (Neon test branch)",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    eng = create_engine(_TEST_DB_URL, pool_pre_ping=True, future=True)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    conn = engine.connect()
+    txn = conn.begin()
+    conn.exec_driver_sql(_MIGRATION.read_text())
+    Session = sessionmaker(bind=conn, autoflush=False, future=True)
+    s = Session()
+    try:
+        yield s
+    finally:
+        s.close()
+        txn.rollback()
+        conn.close()
+
+
+def _primary_name(session, track_id):
+    return session.execute(
+        text("SELECT primary_artist_name FROM tracks WHERE id = :id"), {"id": track_id}
+    ).scalar_one()
+
+
+def test_uncredited_track_follows_its_album_pick(session):
+    tag = uuid.uuid4().hex[:8]
+    first = Artist(id=uuid.uuid4(), name=f"First-{tag}", spotify_id=f"sp_pa1_{tag}", popularity=50)
+    second = Artist(id=uuid.uuid4(), name=f"Second-{tag}", spotify_id=f"sp_pa2_{tag}", popularity=50)
+    album_a = Album(id=uuid.uuid4(), title="A", spotify_id=f"sp_pa_a_{tag}")
+    album_b = Album(id=uuid.uuid4(), title="B", spotify_id=f"sp_pa_b_{tag}")
+    session.add_all([first, second, album_a, album_b])
+    session.flush()
+    session.execute(album_artists_table.insert().values([
+        {"album_id": album_a.id, "artist_id": first.id, "role": None},
+        {"album_id": album_b.id, "artist_id": second.id, "role": None},
+    ]))
+
+    # inserted after the album's links, no track_artists rows
+    track = Track(id=uuid.uuid4(), album_id=album_a.id, title="T", spotify_id=f"sp_pa_t_{tag}")
+    session.add(track)
+    session.flush()
+    assert _primary_name(session, track.id) == first.name
+
+    session.execute(
+        text("UPDATE tracks SET album_id = :b WHERE id = :id"), {"b": album_b.id, "id": track.id}
+    )
+    assert _primary_name(session, track.id) == second.name
@@ -0,0 +1,75 @@
+"""Replica routing against two real Postgres instances (docker-compose
+`postgres-primary` / `postgres-replica`).
+
+The two instances do not replicate, which makes the replica a worst-case
+"infinitely lagging" one: a row written to the primary only is exactly the
+state right after the worker's insert, before it has replicated. Asserts:
+
+1. a read-only session reads the replica (the row is invisible there)
+2. the by-spotify lookup falls back to the primary and finds it
+
+Guarded by TEST_DB_URL + TEST_REPLICA_DB_URL, like the other integration tests.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, delete
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+
+from myblog_shared_db.models import Artist, Base  # noqa: E402
+
+from app.core.db import RoutingSession  # noqa: E402
+from app.repositories.album_repo import AlbumRepository  # noqa: E402
+from app.repositories.artist_repo import ArtistRepository  # noqa: E402
+from app.services.artist_service import ArtistService  # noqa: E402
+
+_PRIMARY_URL = os.environ.get("TEST_DB_URL")
+_REPLICA_URL = os.environ.get("TEST_REPLICA_DB_URL")
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not (_PRIMARY_URL and _REPLICA_URL),
+        reason="replica integration test requires TEST_DB_URL and TEST_REPLICA_DB_URL",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def engines():
+    primary = create_engine(_PRIMARY_URL, future=True)
+    replica = create_engine(_REPLICA_URL, future=True)
+    for eng in (primary, replica):
+        Base.metadata.create_all(eng, checkfirst=True)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def primary_only_artist(engines):
+    primary, _ = engines
+    spotify_id = f"sp_lag_{uuid.uuid4().hex[:12]}"
+    with RoutingSession(bind=primary) as s:
+        s.add(Artist(id=uuid.uuid4(), name=f"Lagging-{spotify_id}", spotify_id=spotify_id))
+        s.commit()
+    yield spotify_id
+    with RoutingSession(bind=primary) as s:
+        s.execute(delete(Artist).where(Artist.spotify_id == spotify_id))
+        s.commit()
+
+
+def test_by_spotify_miss_on_replica_falls_back_to_primary(engines, primary_only_artist):
+    primary, replica = engines
+    with RoutingSession(bind=primary, replica=replica) as s:
+        s.info["read_only"] = True
+        assert ArtistRepository(s).get_by_spotify_id(primary_only_artist) is None
+
+        hero = ArtistService(s, AlbumRepository(s)).get_hero_by_spotify_id(primary_only_artist)
+
+    assert hero is not None
+    assert hero.spotify_id == primary_only_artist
@@ -199,12 +199,13 @@ def test_unified_search_all_three_buckets_with_bounded_queries(session):
     assert guest.name in feat_row.feat_artist_names
 
     # ---- bounded query count ----
-    # Conservative upper bound: 1 each for artist/album/track literal matches,
-    # 1 per matched artist for albums + tracks expansion (≤1 matched artist
-    # here), 1 for tracks-by-album-ids (no album literal match → 0 in this
-    # case but allow headroom), 1 for primary_artist_map, plus selectinload
-    # second pass (≤4 relationships eagerly loaded). 20 leaves plenty of slack
-    # without going so loose the assertion stops catching regressions.
+    # Conservative upper bound: 1 each for artist/album/track literal matches
+    # (thin rows), 1 per matched artist for albums + tracks expansion (≤1
+    # matched artist here), 1 each for the album/track → tracks/albums/artists
+    # hops (0 here when nothing literal-matched, but allow headroom), 1 per
+    # bucket for the final hydrate plus its selectinload passes (≤3), 1 for
+    # primary_artist_map. 20 leaves plenty of slack without going so loose the
+    # assertion stops catching regressions.
     assert queries_used < 20, (
         f"unified_search ran {queries_used} SQL statements — likely N+1 regression"
     )
@@ -0,0 +1,197 @@
+"""absorb_requests (db/migrations/002) — pending/ready status for by-spotify.
+
+Covers the service-side ETA / TTL rules against a stubbed repository, the
+/candidates in-flight skip, and the router's 202-pending vs 404 split with the
+ABSORB_TRACKING_ENABLED flag on and off. Pure units — no DB.
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from app.core.cache import PENDING_CACHE_CONTROL  # noqa: E402
+
+
+def _enable(monkeypatch, on=True):
+    from app.core import config
+    monkeypatch.setattr(config.settings, "ABSORB_TRACKING_ENABLED", on)
+    monkeypatch.setattr(config.settings, "ABSORB_ETA_SEC", 30)
+    monkeypatch.setattr(config.settings, "ABSORB_INFLIGHT_TTL_SEC", 600)
+
+
+def _absorb_service(row):
+    from app.services.absorb_service import AbsorbService
+    svc = AbsorbService(MagicMock())
+    svc.repo = MagicMock()
+    svc.repo.get_status.return_value = row
+    return svc
+
+
+def _row(state, age_sec):
+    return SimpleNamespace(state=state, enqueued_at=datetime(2026, 1, 1, 12, 0, 0), age_sec=age_sec)
+
+
+class TestPendingStatus:
+    def test_pending_row_counts_eta_down(self, monkeypatch):
+        _enable(monkeypatch)
+        st = _absorb_service(_row("pending", 12.4)).pending_status("album", "sp-1")
+        assert st is not None
+        assert st.status == "pending"
+        assert st.eta_sec == 17
+        assert st.enqueued_at == "2026-01-01T12:00:00"
+
+    def test_overdue_pending_keeps_a_positive_eta(self, monkeypatch):
+        _enable(monkeypatch)
+        st = _absorb_service(_row("pending", 90)).pending_status("album", "sp-1")
+        assert st is not None and st.eta_sec == 1
+
+    def test_pending_past_ttl_is_treated_as_lost(self, monkeypatch):
+        _enable(monkeypatch)
+        assert _absorb_service(_row("pending", 601)).pending_status("album", "sp-1") is None
+
+    def test_failed_and_unknown_are_not_pending(self, monkeypatch):
+        _enable(monkeypatch)
+        assert _absorb_service(_row("failed", 5)).pending_status("album", "sp-1") is None
+        assert _absorb_service(None).pending_status("album", "sp-1") is None
+
+    def test_flag_off_never_touches_the_table(self, monkeypatch):
+        _enable(monkeypatch, on=False)
+        svc = _absorb_service(_row("pending", 1))
+        assert svc.pending_status("album", "sp-1") is None
+        assert svc.drop_in_flight("album", ["a", "b"]) == ["a", "b"]
+        svc.record_enqueued("album", ["a"], "KR")
+        svc.repo.get_status.assert_not_called()
+        svc.repo.get_in_flight_ids.assert_not_called()
+        svc.repo.record_enqueued.assert_not_called()
+
+
+class TestCandidatesSkipInFlight:
+    def _service(self, *, existing, in_flight):
+        from app.services.cadidate_search_service import CandidateSearchService
+        sqs = MagicMock()
+        svc = CandidateSearchService(sqs=sqs, db=MagicMock())
+        svc.album_repo = MagicMock()
+        svc.album_repo.get_existing_spotify_ids.return_value = set(existing)
+        svc.artist_repo = MagicMock()
+        svc.artist_repo.get_map_by_spotify_ids.return_value = {"art_known": object()}
+        svc.absorb.repo = MagicMock()
+        svc.absorb.repo.get_in_flight_ids.return_value = set(in_flight)
+        return svc, sqs
+
+    def test_only_new_and_not_in_flight_ids_are_enqueued_and_recorded(self, monkeypatch):
+        _enable(monkeypatch)
+        from app.services import cadidate_search_service as mod
+
+        monkeypatch.setattr(mod.spotify, "search", lambda **kw: {
+            "albums": {"items": [
+                {"id": "alb_done", "artists": [{"id": "art_known"}]},
+                {"id": "alb_flight", "artists": [{"id": "art_a"}]},
+                {"id": "alb_new", "artists": [{"id": "art_new"}]},
+            ]},
+        })
+        svc, sqs = self._service(existing={"alb_done"}, in_flight={"alb_flight"})
+
+        svc.search_candidates(q="x", typ="album", market="KR", limit=10, offset=0, include_external=None)
+
+        sqs.enqueue_album_sync.assert_called_once_with(["alb_new"], "KR")
+        calls = svc.absorb.repo.record_enqueued.call_args_list
+        assert [(c.args[0], list(c.args[1])) for c in calls] == [
+            ("album", ["alb_new"]),
+            ("artist", ["art_new"]),
+        ]
+
+    def test_everything_in_flight_sends_nothing(self, monkeypatch):
+        _enable(monkeypatch)
+        from app.services import cadidate_search_service as mod
+
+        monkeypatch.setattr(mod.spotify, "search", lambda **kw: {
+            "albums": {"items": [{"id": "alb_flight", "artists": []}]},
+        })
+        svc, sqs = self._service(existing=set(), in_flight={"alb_flight"})
+
+        svc.search_candidates(q="x", typ="album", market=None, limit=10, offset=0, include_external=None)
+
+        sqs.enqueue_album_sync.assert_not_called()
+        svc.absorb.repo.record_enqueued.assert_not_called()
+
+
+def _client():
+    from fastapi.testclient import TestClient
+
+    from app.core.db import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    return TestClient(app)
+
+
+class TestBySpotifyPendingRoutes:
+    def test_album_pending_is_a_short_cached_202(self, monkeypatch):
+        _enable(monkeypatch)
+        from fastapi import HTTPException
+
+        from app.api.routers import albums as albums_router
+        from app.domain.schemas import AbsorbStatus
+
+        svc = MagicMock()
+        svc.get_album_detail_by_spotify.side_effect = HTTPException(status_code=404, detail="album not found in DB")
+        svc.get_absorb_status.return_value = AbsorbStatus(kind="album", spotify_id="sp-p", eta_sec=12)
+        monkeypatch.setattr(albums_router, "AlbumService", lambda db: svc)
+
+        r = _client().get("/api/music/albums/by-spotify/sp-p")
+        assert r.status_code == 202
+        assert r.json()["status"] == "pending"
+        assert r.json()["eta_sec"] == 12
+        assert r.headers.get("Cache-Control") == PENDING_CACHE_CONTROL
+
+    def test_album_unknown_still_404_uncached(self, monkeypatch):
+        _enable(monkeypatch)
+        from fastapi import HTTPException
+
+        from app.api.routers import albums as albums_router
+
+        svc = MagicMock()
+        svc.get_album_detail_by_spotify.side_effect = HTTPException(status_code=404, detail="album not found in DB")
+        svc.get_absorb_status.return_value = None
+        monkeypatch.setattr(albums_router, "AlbumService", lambda db: svc)
+
+        r = _client().get("/api/music/albums/by-spotify/sp-unknown")
+        assert r.status_code == 404
+        assert "Cache-Control" not in r.headers
+
+    def test_artist_pending_hero(self, monkeypatch):
+        _enable(monkeypatch)
+        from app.api.routers import artists as artists_router
+        from app.domain.schemas import ArtistHero
+
+        svc = MagicMock()
+        svc.get_hero_by_spotify_id.return_value = None
+        svc.get_pending_hero.return_value = ArtistHero(
+            name="", spotify_id="sp-p", status="pending", eta_sec=20,
+        )
+        monkeypatch.setattr(artists_router, "_service", lambda db: svc)
+
+        r = _client().get("/api/music/artists/by-spotify/sp-p")
+        assert r.status_code == 202
+        body = r.json()
+        assert body["status"] == "pending"
+        assert body["eta_sec"] == 20
+        assert r.headers.get("Cache-Control") == PENDING_CACHE_CONTROL
+
+    def test_flag_off_keeps_plain_404(self, monkeypatch):
+        _enable(monkeypatch, on=False)
+        from app.api.routers import artists as artists_router
+
+        svc = MagicMock()
+        svc.get_hero_by_spotify_id.return_value = None
+        monkeypatch.setattr(artists_router, "_service", lambda db: svc)
+
+        r = _client().get("/api/music/artists/by-spotify/sp-p")
+        assert r.status_code == 404
+        svc.get_pending_hero.assert_not_called()
@@ -0,0 +1,77 @@
+"""Denormalized artist counters (ARTIST_STATS_ENABLED, migration 004).
+
+With the flag on, the hero is one repository read that already carries the
+counts — the COUNT(*) path must not run. With it off, the original path is
+unchanged. Pure units — the repositories are MagicMocks.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+def _artist():
+    return SimpleNamespace(
+        id=uuid.uuid4(), name="IU", spotify_id="sp_iu", photo_url=None, genres=["k-pop"],
+        followers=10, popularity=80, spotify_url=None,
+    )
+
+
+def _svc(monkeypatch, enabled: bool):
+    from app.core import config
+    from app.services import artist_service
+
+    monkeypatch.setattr(config.settings, "ARTIST_STATS_ENABLED", enabled)
+    monkeypatch.setattr(artist_service, "fallback_to_primary", lambda db: False)
+    return artist_service.ArtistService(MagicMock(), MagicMock(), artist_repo=MagicMock(),
+                                        track_repo=MagicMock())
+
+
+def test_hero_reads_counts_with_the_artist_when_enabled(monkeypatch):
+    svc = _svc(monkeypatch, True)
+    a = _artist()
+    svc.artist_repo.get_with_counts_by_id.return_value = (a, 12, 83)
+
+    hero = svc.get_hero_by_id(str(a.id))
+
+    assert (hero.album_count, hero.track_count) == (12, 83)
+    svc.artist_repo.count_albums_and_tracks.assert_not_called()
+    svc.artist_repo.get_by_id.assert_not_called()
+
+
+def test_hero_by_spotify_uses_the_single_read_when_enabled(monkeypatch):
+    svc = _svc(monkeypatch, True)
+    a = _artist()
+    svc.artist_repo.get_with_counts_by_spotify_id.return_value = (a, 0, 0)
+
+    hero = svc.get_hero_by_spotify_id("sp_iu")
+
+    assert hero.status == "ready" and hero.album_count == 0
+    svc.artist_repo.count_albums_and_tracks.assert_not_called()
+
+
+def test_missing_artist_is_none_when_enabled(monkeypatch):
+    svc = _svc(monkeypatch, True)
+    svc.artist_repo.get_with_counts_by_id.return_value = None
+    svc.artist_repo.get_with_counts_by_spotify_id.return_value = None
+
+    assert svc.get_hero_by_id(str(uuid.uuid4())) is None
+    assert svc.get_hero_by_spotify_id("sp_missing") is None
+
+
+def test_disabled_keeps_the_count_queries(monkeypatch):
+    svc = _svc(monkeypatch, False)
+    a = _artist()
+    svc.artist_repo.get_by_id.return_value = a
+    svc.artist_repo.count_albums_and_tracks.return_value = (3, 30)
+
+    hero = svc.get_hero_by_id(str(a.id))
+
+    assert (hero.album_count, hero.track_count) == (3, 30)
+    svc.artist_repo.get_with_counts_by_id.assert_not_called()
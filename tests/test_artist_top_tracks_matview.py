@@ -0,0 +1,71 @@
+"""Artist top-tracks from the materialized view (TOP_TRACKS_MATVIEW_ENABLED,
+migration 005).
+
+The view is trusted only while fresh: the repository returns None when it is
+stale or has no rows for the artist, and the service then runs the live
+ranking query. Pure units — the repositories are MagicMocks.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+def _svc(monkeypatch, enabled: bool):
+    from app.core import config
+    from app.services import artist_service
+
+    monkeypatch.setattr(config.settings, "TOP_TRACKS_MATVIEW_ENABLED", enabled)
+    return artist_service.ArtistService(MagicMock(), MagicMock(), artist_repo=MagicMock(),
+                                        track_repo=MagicMock())
+
+
+def test_fresh_view_skips_the_live_query(monkeypatch):
+    from app.core.cache import DETAIL_MAX_AGE_SEC
+
+    svc = _svc(monkeypatch, True)
+    artist_id = str(uuid.uuid4())
+    svc.track_repo.list_top_tracks_materialized.return_value = []
+
+    assert svc.list_top_tracks(artist_id=artist_id, limit=10) == []
+    svc.track_repo.list_top_tracks_materialized.assert_called_once_with(
+        artist_id, 10, max_age_sec=DETAIL_MAX_AGE_SEC
+    )
+    svc.track_repo.list_top_tracks_by_artist.assert_not_called()
+
+
+def test_stale_or_missing_view_falls_back_to_live(monkeypatch):
+    svc = _svc(monkeypatch, True)
+    artist_id = str(uuid.uuid4())
+    svc.track_repo.list_top_tracks_materialized.return_value = None
+    svc.track_repo.list_top_tracks_by_artist.return_value = []
+
+    svc.list_top_tracks(artist_id=artist_id, limit=10)
+
+    svc.track_repo.list_top_tracks_by_artist.assert_called_once_with(artist_id, limit=10)
+
+
+def test_limit_beyond_view_depth_uses_live(monkeypatch):
+    from app.repositories.track_repo import TOP_TRACKS_DEPTH
+
+    svc = _svc(monkeypatch, True)
+    svc.track_repo.list_top_tracks_by_artist.return_value = []
+
+    svc.list_top_tracks(artist_id=str(uuid.uuid4()), limit=TOP_TRACKS_DEPTH + 1)
+
+    svc.track_repo.list_top_tracks_materialized.assert_not_called()
+
+
+def test_disabled_uses_live(monkeypatch):
+    svc = _svc(monkeypatch, False)
+    svc.track_repo.list_top_tracks_by_artist.return_value = []
+
+    svc.list_top_tracks(artist_id=str(uuid.uuid4()), limit=10)
+
+    svc.track_repo.list_top_tracks_materialized.assert_not_called()
+    svc.track_repo.list_top_tracks_by_artist.assert_called_once()
@@ -237,14 +237,13 @@ class TestArtistIds:
 
     def test_returns_id_name_list(self, monkeypatch):
         client, artists_router = _client()
-        from app.domain.schemas import ArtistIdItem
 
         def fake_service(db):
             real = MagicMock()
-            real.list_artist_ids.return_value = [
-                ArtistIdItem(id="00000000-0000-0000-0000-0000000000aa", name="Vault Engine"),
-                ArtistIdItem(id="00000000-0000-0000-0000-0000000000bb", name="Sala"),
-            ]
+            real.iter_artist_ids.return_value = iter([
+                ("00000000-0000-0000-0000-0000000000aa", "Vault Engine"),
+                ("00000000-0000-0000-0000-0000000000bb", "Sala"),
+            ])
             return real
 
         monkeypatch.setattr(artists_router, "_service", fake_service)
@@ -262,7 +261,7 @@ class TestArtistIds:
 
         def fake_service(db):
             real = MagicMock()
-            real.list_artist_ids.return_value = []
+            real.iter_artist_ids.return_value = iter([])
             real.get_hero_by_id.return_value = None  # would 404 if misrouted
             return real
 
@@ -272,6 +271,38 @@ class TestArtistIds:
         assert r.status_code == 200  # hit list_artist_ids, not get_artist
         assert r.json() == []
 
+    def test_ndjson_page_passes_cursor_and_since(self, monkeypatch):
+        client, artists_router = _client()
+        svc = MagicMock()
+        svc.iter_artist_ids.return_value = iter([
+            ("00000000-0000-0000-0000-0000000000cc", "아이유"),
+        ])
+        monkeypatch.setattr(artists_router, "_service", lambda db: svc)
+
+        r = client.get(
+            "/api/music/artists/ids",
+            params={
+                "format": "ndjson",
+                "limit": 2,
+                "after": "00000000-0000-0000-0000-0000000000bb",
+                "since": "2026-01-01T00:00:00",
+            },
+        )
+
+        assert r.status_code == 200, r.text
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        assert r.text == '{"id":"00000000-0000-0000-0000-0000000000cc","name":"아이유"}\n'
+        kw = svc.iter_artist_ids.call_args.kwargs
+        assert str(kw["after"]) == "00000000-0000-0000-0000-0000000000bb"
+        assert kw["since"].year == 2026 and kw["limit"] == 2
+
+    def test_rejects_a_malformed_cursor(self, monkeypatch):
+        client, artists_router = _client()
+        monkeypatch.setattr(artists_router, "_service", lambda db: MagicMock())
+
+        r = client.get("/api/music/artists/ids", params={"after": "not-a-uuid"})
+        assert r.status_code == 422
+
 
 def _hero(a, album_count=0, track_count=0):
     from app.domain.schemas import ArtistHero
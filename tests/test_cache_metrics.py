@@ -0,0 +1,97 @@
+"""Cache observability (app/core/cache_metrics.py).
+
+Covers the counters a ByteBudgetCache reports, the EMF document shape and its
+delta semantics (each emit reports only what happened since the last one), and
+the debug route's enable flag. Pure units.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from pydantic import BaseModel  # noqa: E402
+
+from app.core.cache_metrics import EMF_NAMESPACE, CacheMetrics  # noqa: E402
+from app.core.result_cache import ByteBudgetCache  # noqa: E402
+
+
+class _Page(BaseModel):
+    items: List[str] = []
+
+
+def test_byte_budget_cache_reports_its_events():
+    now = {"t": 0.0}
+    m = CacheMetrics("t")
+    c = ByteBudgetCache(
+        _Page, max_bytes=2 * (ByteBudgetCache.ENTRY_OVERHEAD + 40), max_entry_bytes=400,
+        ttl=60, timer=lambda: now["t"], metrics=m,
+    )
+    assert c.get("a") is None                            # miss
+    c.set("a", _Page(items=["a"]))
+    now["t"] = 20
+    c.get("a")                                           # hit, age 20s
+    c.set("b", _Page(items=["b"]))
+    c.set("c", _Page(items=["c"]))                       # evicts "a"
+    c.set("big", _Page(items=[str(i) for i in range(500)]))  # rejected
+    now["t"] = 100
+    c.get("b")                                           # expired → miss
+
+    snap = m.snapshot()
+    assert (snap["hits"], snap["misses"], snap["evictions"], snap["rejected"]) == (1, 2, 1, 1)
+    assert snap["expirations"] == 1
+    assert snap["hit_age_sec"]["le_30"] == 1
+    assert snap["entries"] == len(c) and snap["bytes"] == c.currsize
+
+
+def test_emf_record_reports_deltas_then_goes_idle():
+    m = CacheMetrics("unified_search")
+    m.hit(3)
+    m.miss()
+    doc = m.emf_record(1_700_000_000_000)
+    directive = doc["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Namespace"] == EMF_NAMESPACE
+    assert directive["Dimensions"] == [["Cache"]]
+    names = {x["Name"] for x in directive["Metrics"]}
+    assert {"Hits", "Misses", "Stale", "Evictions", "HitAge"} <= names
+    assert doc["Cache"] == "unified_search"
+    assert (doc["Hits"], doc["Misses"]) == (1, 1)
+    assert doc["HitAge"] == {"Values": [5.0], "Counts": [1]}
+
+    assert m.emf_record(1_700_000_060_000) is None  # nothing new, empty cache
+    m.miss()
+    assert m.emf_record(1_700_000_120_000)["Misses"] == 1
+
+
+def test_emit_writes_one_json_line_per_active_cache(monkeypatch):
+    from app.core import cache_metrics
+
+    monkeypatch.setattr(cache_metrics, "_registry", {})
+    cache_metrics.register("idle")
+    cache_metrics.register("busy").miss()
+    buf = io.StringIO()
+    assert cache_metrics.emit_emf(buf) == 1
+    assert json.loads(buf.getvalue())["Cache"] == "busy"
+
+
+def test_debug_route_is_404_unless_enabled(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.core import config
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(config.settings, "DEBUG_ENDPOINTS_ENABLED", False)
+    assert client.get("/api/music/_debug/caches").status_code == 404
+
+    monkeypatch.setattr(config.settings, "DEBUG_ENDPOINTS_ENABLED", True)
+    monkeypatch.setattr(config.settings, "ENV", "local")
+    r = client.get("/api/music/_debug/caches")
+    assert r.status_code == 200
+    assert "unified_search" in r.json()
+    assert r.headers["Cache-Control"] == "no-store"
@@ -0,0 +1,70 @@
+"""Bulk catalog export (scripts/export_catalog.py): hubs assembled from the
+COPY-loaded catalog must match what the per-artist endpoints return. Pure
+units — the COPY rows are hand-built tuples."""
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+IU, GD, LONER = uuid.UUID(int=1), uuid.UUID(int=2), uuid.UUID(int=3)
+PALETTE, LILAC = uuid.UUID(int=10), uuid.UUID(int=11)
+T_PALETTE, T_LILAC, T_BARE = uuid.UUID(int=20), uuid.UUID(int=21), uuid.UUID(int=22)
+
+
+def _catalog():
+    from app.services.catalog_export_service import Catalog
+
+    c = Catalog()
+    c.add_rows("artists", [
+        (IU, "IU", "sp_iu", None, ["k-pop"], 100, 80, None),
+        (GD, "G-DRAGON", "sp_gd", None, [], 50, 90, None),
+        (LONER, "Loner", "sp_lo", None, [], 0, 1, None),  # no album → no hub
+    ])
+    c.add_rows("albums", [
+        (PALETTE, "Palette", date(2017, 4, 21), None, "album", "sp_p", {}, 10, None, 60, False),
+        (LILAC, "LILAC", date(2021, 3, 25), None, "album", "sp_l", {}, 10, None, None, True),
+    ])
+    c.add_rows("album_artists", [(PALETTE, IU), (LILAC, IU)])
+    c.add_rows("tracks", [
+        (T_PALETTE, "Palette", 2, 217, "sp_tp", PALETTE, 5),
+        (T_LILAC, "LILAC", 1, 214, "sp_tl", LILAC, 9),
+        (T_BARE, "Intro", 1, 60, "sp_tb", PALETTE, 0),
+    ])
+    c.add_rows("track_artists", [(T_PALETTE, IU), (T_PALETTE, GD), (T_LILAC, IU), (T_BARE, LONER)])
+    return c
+
+
+def test_hub_matches_the_endpoint_shapes_and_orderings():
+    hub = _catalog().hub(IU)
+
+    assert hub["hero"]["album_count"] == 2 and hub["hero"]["track_count"] == 2
+    # popularity DESC NULLS LAST → Palette (60) before LILAC (NULL)
+    assert [a["title"] for a in hub["albums"]["items"]] == ["Palette", "LILAC"]
+    assert hub["albums"]["items"][0]["artist_name"] == "IU"
+    assert hub["albums"]["items"][1]["best_new"] is True
+    # views DESC
+    assert [t["title"] for t in hub["top_tracks"]] == ["LILAC", "Palette"]
+    # GD is more popular → primary; IU becomes the feat
+    assert hub["top_tracks"][1]["artist_name"] == "G-DRAGON"
+    assert hub["top_tracks"][1]["feat_artist_names"] == ["IU"]
+
+
+def test_hub_ids_are_artists_with_albums_in_id_order():
+    assert _catalog().hub_artist_ids() == [IU]
+
+
+def test_write_hubs_in_worker_processes(tmp_path):
+    from app.services.catalog_export_service import write_hubs
+
+    assert write_hubs(_catalog(), str(tmp_path), workers=2, chunk=1) == 1
+
+    ids = json.loads((tmp_path / "artists" / "ids.json").read_text(encoding="utf-8"))
+    assert ids == [{"id": str(IU), "name": "IU"}]
+    hub = json.loads((tmp_path / "artists" / f"{IU}.json").read_text(encoding="utf-8"))
+    assert hub["hero"]["name"] == "IU"
@@ -0,0 +1,63 @@
+"""DB_POOL_STRATEGY engines (app/core/db.py).
+
+Engine construction never connects, so strategies are checked on the built
+pool. The thaw probe and the timing split run against a throwaway SQLite file
+— no Postgres needed.
+"""
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.pool import NullPool, QueuePool  # noqa: E402
+
+from app.core import db as dbmod  # noqa: E402
+
+URL = "postgresql+psycopg://x:x@localhost/x"
+
+
+def test_null_strategy_uses_nullpool_without_prepared_statements():
+    eng = dbmod.build_engine(URL, "null")
+    assert isinstance(eng.pool, NullPool)
+    assert dbmod._connect_args("null")["prepare_threshold"] is None
+    assert "keepalives" not in dbmod._connect_args("null")
+
+
+def test_single_strategy_has_one_connection_and_no_pre_ping():
+    eng = dbmod.build_engine(URL, "single")
+    assert isinstance(eng.pool, QueuePool)
+    assert eng.pool.size() == 1
+    assert eng.pool._pre_ping is False
+    assert dbmod._connect_args("single")["keepalives"] == 1
+
+
+def test_queue_strategy_keeps_pre_ping():
+    assert dbmod.build_engine(URL, "queue").pool._pre_ping is True
+
+
+def test_thaw_probe_pings_only_after_idle_and_timings_split(tmp_path, monkeypatch):
+    eng = create_engine(f"sqlite:///{tmp_path / 't.db'}", poolclass=QueuePool, pool_size=1)
+    dbmod._install_thaw_probe(eng)
+    dbmod._install_timing(eng)
+    dbmod.db_timings.reset()
+
+    monkeypatch.setattr(dbmod.settings, "DB_THAW_PING_AFTER_SEC", 3600)
+    with eng.connect() as c:
+        c.execute(text("SELECT 1"))
+    with eng.connect() as c:  # idle < threshold → no probe
+        c.execute(text("SELECT 1"))
+    assert dbmod.db_timings.pings == 0
+
+    monkeypatch.setattr(dbmod.settings, "DB_THAW_PING_AFTER_SEC", 0)
+    with eng.connect() as c:  # "thawed" → probed once
+        c.execute(text("SELECT 1"))
+
+    t = dbmod.db_timings.snapshot()
+    assert t["connects"] == 1
+    assert t["pings"] == 1
+    assert t["queries"] == 3
+    assert t["query_ms"] >= 0
@@ -0,0 +1,152 @@
+"""Per-request deadline (app/core/deadline.py + get_read_db).
+
+Covers the session hook that turns the remaining budget into a transaction-
+local statement_timeout, /search/unified dropping its optional phases (and not
+caching the partial answer) when the budget is low, and the 503 mapping for a
+cancelled statement. Pure units — no DB.
+"""
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from app.core.deadline import Deadline, DeadlineExceeded, extend_deadline, session_deadline  # noqa: E402
+
+
+def _clock(start=0.0):
+    now = {"t": start}
+    return now, (lambda: now["t"])
+
+
+def test_deadline_counts_down_and_extends():
+    now, clock = _clock()
+    d = Deadline(5, clock=clock)
+    now["t"] = 2
+    assert d.remaining() == 3 and d.has(3) and not d.has(3.5)
+    d.extend(10)
+    now["t"] = 14
+    assert d.remaining() == 1
+    now["t"] = 20
+    assert d.expired() and d.remaining() == 0
+
+
+def test_session_deadline_ignores_foreign_info():
+    assert session_deadline(MagicMock()) is None
+    db = SimpleNamespace(info={"deadline": Deadline(1)})
+    assert session_deadline(db) is db.info["deadline"]
+    extend_deadline(MagicMock(), 5)  # no deadline → no-op, no error
+
+
+class TestSessionHook:
+    def _run(self, info):
+        from app.core.db import _apply_read_session_limits
+
+        conn = MagicMock()
+        _apply_read_session_limits(SimpleNamespace(info=info), None, conn)
+        return conn
+
+    def test_read_session_gets_local_timeout_from_remaining_budget(self, monkeypatch):
+        from app.core import db as dbmod
+
+        monkeypatch.setattr(dbmod.settings, "STATEMENT_TIMEOUT_FLOOR_MS", 100)
+        now, clock = _clock()
+        d = Deadline(8, clock=clock)
+        now["t"] = 5.5
+        conn = self._run({"read_only": True, "deadline": d})
+        stmt, params = conn.execute.call_args.args
+        assert "statement_timeout" in str(stmt) and "transaction_read_only" in str(stmt)
+        assert params == {"ms": "2500"}
+
+    def test_timeout_never_below_floor_and_expired_raises(self, monkeypatch):
+        from app.core import db as dbmod
+
+        monkeypatch.setattr(dbmod.settings, "STATEMENT_TIMEOUT_FLOOR_MS", 100)
+        now, clock = _clock()
+        d = Deadline(1, clock=clock)
+        now["t"] = 0.99
+        assert self._run({"read_only": True, "deadline": d}).execute.call_args.args[1] == {"ms": "100"}
+        now["t"] = 1
+        with pytest.raises(DeadlineExceeded):
+            self._run({"read_only": True, "deadline": d})
+
+    def test_write_session_is_untouched(self):
+        self._run({}).execute.assert_not_called()
+
+
+def test_low_budget_skips_optional_phases_and_is_not_cached(monkeypatch):
+    from app.core import config
+    from app.services import search_service
+
+    monkeypatch.setattr(config.settings, "SEARCH_OPTIONAL_PHASE_MIN_SEC", 2.0)
+    db = SimpleNamespace(info={"deadline": Deadline(1.0)})
+    svc = search_service.SearchService(db)
+    for repo in ("artist_repo", "album_repo", "track_repo"):
+        setattr(svc, repo, MagicMock())
+    svc.artist_repo.search_rows_by_name.return_value = []
+    svc.album_repo.search_rows_by_title.return_value = []
+    svc.track_repo.search_rows_by_title.return_value = []
+    svc._decompose = MagicMock()  # type: ignore[method-assign]
+
+    result = svc.unified_search(q="iu love poem", limit=20, offset=0)
+
+    assert result.partial is True
+    svc._decompose.assert_not_called()
+    svc.album_repo.list_rows_by_artist_id.assert_not_called()
+    assert len(search_service._unified_cache) == 0
+
+
+def test_cancelled_statement_maps_to_503(monkeypatch):
+    from fastapi.testclient import TestClient
+    from sqlalchemy.exc import OperationalError
+
+    from app.api.routers import search as search_router
+    from app.core.db import get_db
+    from app.main import app
+
+    class _Canceled(Exception):
+        sqlstate = "57014"
+
+    svc = MagicMock()
+    svc.unified_search.side_effect = OperationalError("SELECT ...", {}, _Canceled())
+    monkeypatch.setattr(search_router, "DBSearchService", lambda db: svc)
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    try:
+        r = TestClient(app).get("/api/music/search/unified", params={"q": "a"})
+    finally:
+        app.dependency_overrides.clear()
+    assert r.status_code == 503
+    assert "Cache-Control" not in r.headers
+
+
+def test_cancelled_literal_match_is_not_swallowed(monkeypatch):
+    # ArtistRepository.search_rows_by_name logs-and-empties other failures; a
+    # statement_timeout cancel must still reach the 503 handler.
+    from fastapi.testclient import TestClient
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.db import get_db
+    from app.main import app
+    from app.repositories.artist_repo import ArtistRepository
+
+    class _Canceled(Exception):
+        sqlstate = "57014"
+
+    monkeypatch.setattr(
+        ArtistRepository, "_literal_statement", staticmethod(lambda q: (MagicMock(), ()))
+    )
+    db = MagicMock()
+    db.info = {}
+    db.execute.side_effect = OperationalError("SELECT ...", {}, _Canceled())
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        r = TestClient(app).get("/api/music/search/unified", params={"q": "radiohead", "type": "artist"})
+    finally:
+        app.dependency_overrides.clear()
+    assert r.status_code == 503
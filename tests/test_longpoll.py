@@ -0,0 +1,142 @@
+"""`?wait=N` long-poll on the by-spotify endpoints (app/core/longpoll.py).
+
+`wait_for` is driven with a fake clock/sleep so the backoff schedule and the
+deadline clipping are asserted without real sleeping. Router tests prove the
+`wait` query param reaches the service and is bounded. Pure units — no DB.
+"""
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, sec: float) -> None:
+        self.sleeps.append(sec)
+        self.now += sec
+
+
+def test_wait_for_returns_immediately_when_row_exists():
+    from app.core.longpoll import wait_for
+
+    fc = _FakeClock()
+    assert wait_for(lambda: True, 10, sleep=fc.sleep, clock=fc.clock) is True
+    assert fc.sleeps == []
+
+
+def test_wait_for_backs_off_until_probe_flips():
+    from app.core.longpoll import wait_for
+
+    fc = _FakeClock()
+    answers = iter([False, False, False, True])
+    assert wait_for(lambda: next(answers), 10, sleep=fc.sleep, clock=fc.clock) is True
+    assert fc.sleeps == [0.25, 0.5, 1.0]
+
+
+def test_wait_for_clips_last_sleep_to_deadline_and_gives_up():
+    from app.core.longpoll import wait_for
+
+    fc = _FakeClock()
+    probes = {"n": 0}
+
+    def probe():
+        probes["n"] += 1
+        return False
+
+    assert wait_for(probe, 3, sleep=fc.sleep, clock=fc.clock) is False
+    assert fc.sleeps == [0.25, 0.5, 1.0, 1.25]
+    assert fc.now == 3
+    # one probe per sleep + the initial one — the deadline probe still runs
+    assert probes["n"] == 5
+
+
+def test_wait_for_zero_timeout_is_a_single_probe():
+    from app.core.longpoll import wait_for
+
+    fc = _FakeClock()
+    assert wait_for(lambda: False, 0, sleep=fc.sleep, clock=fc.clock) is False
+    assert fc.sleeps == []
+
+
+def _client():
+    from fastapi.testclient import TestClient
+
+    from app.core.db import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    return TestClient(app)
+
+
+def test_artist_by_spotify_wait_is_forwarded(monkeypatch):
+    from app.api.routers import artists as artists_router
+    from app.domain.schemas import ArtistHero
+
+    svc = MagicMock()
+    svc.get_hero_by_spotify_id.return_value = ArtistHero(name="Absorbed", spotify_id="sp-1")
+    monkeypatch.setattr(artists_router, "_service", lambda db: svc)
+
+    r = _client().get("/api/music/artists/by-spotify/sp-1?wait=5")
+    assert r.status_code == 200, r.text
+    svc.wait_until_absorbed.assert_called_once_with("sp-1", 5)
+
+
+def test_artist_by_spotify_without_wait_does_not_block(monkeypatch):
+    from app.api.routers import artists as artists_router
+    from app.domain.schemas import ArtistHero
+
+    svc = MagicMock()
+    svc.get_hero_by_spotify_id.return_value = ArtistHero(name="Absorbed", spotify_id="sp-1")
+    monkeypatch.setattr(artists_router, "_service", lambda db: svc)
+
+    r = _client().get("/api/music/artists/by-spotify/sp-1")
+    assert r.status_code == 200
+    svc.wait_until_absorbed.assert_not_called()
+
+
+def test_album_by_spotify_wait_timeout_still_404s_uncached(monkeypatch):
+    from fastapi import HTTPException
+
+    from app.api.routers import albums as albums_router
+
+    svc = MagicMock()
+    svc.wait_until_absorbed.return_value = False
+    svc.get_album_detail_by_spotify.side_effect = HTTPException(status_code=404, detail="album not found in DB")
+    monkeypatch.setattr(albums_router, "AlbumService", lambda db: svc)
+
+    r = _client().get("/api/music/albums/by-spotify/sp-pending?wait=3")
+    assert r.status_code == 404
+    assert "Cache-Control" not in r.headers
+    svc.wait_until_absorbed.assert_called_once_with("sp-pending", 3)
+
+
+def test_wait_above_cap_is_rejected():
+    from app.core.longpoll import LONGPOLL_MAX_WAIT_SEC
+
+    r = _client().get(f"/api/music/albums/by-spotify/sp-x?wait={LONGPOLL_MAX_WAIT_SEC + 1}")
+    assert r.status_code == 422
+
+
+def test_service_probe_rolls_back_between_attempts(monkeypatch):
+    from app.core import longpoll
+    from app.services.album_service import AlbumService
+
+    db = MagicMock()
+    svc = AlbumService(db)
+    svc.albums = MagicMock()
+    svc.albums.exists_by_spotify_id.side_effect = [False, True]
+    monkeypatch.setattr(longpoll.time, "sleep", lambda s: None)
+
+    assert svc.wait_until_absorbed("sp-1", 5) is True
+    assert db.rollback.call_count == 1
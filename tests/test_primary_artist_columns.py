@@ -0,0 +1,54 @@
+"""Denormalized primary artist (PRIMARY_ARTIST_COLUMNS_ENABLED, migration 006).
+
+Rows that carry primary_artist_* are mapped as-is — no primary map, no
+popularity sort, no album-artists fallback query. Pure units — the DB session
+and the artist repository are MagicMocks.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import date
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+def test_album_row_primary_columns_map_without_a_primary_map():
+    from app.domain.rows import AlbumRow
+    from app.mappers.album_mapper import AlbumItemMapper
+
+    al = AlbumRow(uuid.uuid4(), "Palette", date(2017, 4, 21), None, "album", "sp_al",
+                  {}, 10, None, 71, False, "IU", "sp_iu")
+    item = AlbumItemMapper.to_list([al])[0]
+
+    assert (item.artist_name, item.artist_spotify_id) == ("IU", "sp_iu")
+
+
+def test_track_row_primary_column_wins_over_the_popularity_sort():
+    from app.domain.rows import ArtistRef, TrackRow
+    from app.mappers.track_mapper import TrackItemMapper
+
+    # The stored pick is authoritative even if the refs' popularity moved since.
+    t = TrackRow(
+        uuid.uuid4(), "Palette", 2, 217, "sp_t", uuid.uuid4(), None,
+        (ArtistRef(1, "G-DRAGON", 90), ArtistRef(2, "IU", 80)), "IU",
+    )
+    item = TrackItemMapper.to_list([t])[0]
+
+    assert item.artist_name == "IU" and item.feat_artist_names == ["G-DRAGON"]
+
+
+def test_track_rows_with_primary_column_skip_the_album_artists_query():
+    from app.repositories.track_repo import TrackRepository
+
+    projected = [(uuid.uuid4(), "Two", 1, 100, "sp2", uuid.uuid4(), "B", None, None, "spb", "Band")]
+    artist_repo = MagicMock()
+    artist_repo.refs_by_track_ids.return_value = {}
+
+    rows = TrackRepository(MagicMock(), artist_repo)._to_rows(projected)
+
+    artist_repo.refs_by_album_ids.assert_not_called()
+    assert rows[0].primary_artist_name == "Band" and rows[0].album.artists == ()
@@ -0,0 +1,82 @@
+"""Query-frequency telemetry (app/core/query_stats.py, QUERY_STATS_ENABLED).
+
+The sketch must keep the real heavy hitters under churn from a long tail of
+one-off queries, count case/whitespace variants as one query, and hand off
+per-interval counts exactly once. Flushing is best-effort. Pure units — no DB.
+"""
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from app.core.query_stats import QueryStats, SpaceSaving, canonical_query  # noqa: E402
+
+
+def test_canonical_query_folds_case_and_whitespace():
+    assert canonical_query("  New   Jeans ") == "new jeans"
+    assert canonical_query("IU") == canonical_query("iu")
+    assert canonical_query("   ") == ""
+
+
+def test_heavy_hitters_survive_a_long_tail():
+    sk = SpaceSaving(capacity=8)
+    for i in range(400):
+        sk.add("iu")
+        if i % 2 == 0:
+            sk.add("bts")
+        sk.add(f"tail-{i}")  # every tail query is seen once
+    top = [q for q, _ in sk.top(2)]
+    assert top == ["iu", "bts"]
+    assert len(sk) == 8
+
+
+def test_drain_reports_guaranteed_counts_and_resets():
+    sk = SpaceSaving(capacity=1)
+    sk.add("a", 3)
+    sk.add("b")  # evicts "a": estimate 4, error 3 → guaranteed 1
+    assert sk.drain() == {"b": 1}
+    assert len(sk) == 0 and sk.top(5) == []
+
+
+def test_flush_due_after_interval_and_only_with_counts():
+    now = {"t": 0.0}
+    stats = QueryStats(16, 300, clock=lambda: now["t"])
+    now["t"] = 400
+    assert not stats.flush_due()  # nothing recorded
+    stats.record("IU ")
+    stats.record("iu")
+    assert stats.flush_due()
+    assert stats.drain() == {"iu": 2}
+    stats.record("iu")
+    assert not stats.flush_due()  # clock restarted by drain
+
+
+class TestService:
+    def test_flag_off_records_nothing(self, monkeypatch):
+        from app.core import config
+        from app.services import query_stats_service as mod
+
+        monkeypatch.setattr(config.settings, "QUERY_STATS_ENABLED", False)
+        monkeypatch.setattr(mod, "query_stats", QueryStats(16, 0))
+        assert mod.record_query("iu") is False
+        assert len(mod.query_stats.sketch) == 0
+        assert mod.top_queries(MagicMock(), 10) == []
+
+    def test_flush_failure_is_swallowed(self, monkeypatch):
+        from app.core import config
+        from app.services import query_stats_service as mod
+
+        monkeypatch.setattr(config.settings, "QUERY_STATS_ENABLED", True)
+        monkeypatch.setattr(mod, "query_stats", QueryStats(16, 0))
+        db = MagicMock()
+        db.execute.side_effect = RuntimeError("neon unreachable")
+        monkeypatch.setattr(mod, "SessionLocal", lambda: db)
+
+        assert mod.record_query("iu") is True
+        assert mod.flush_query_stats() == 0
+        db.rollback.assert_called_once()
+        db.close.assert_called_once()
@@ -0,0 +1,76 @@
+"""Read-path DTOs (app/domain/rows.py): the mappers take them as-is, and the
+track repository attaches credited artists without loading ORM graphs.
+Pure units — the DB session is a MagicMock."""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import date
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+def test_album_row_maps_with_str_keyed_primary_map():
+    from app.domain.rows import AlbumRow
+    from app.mappers.album_mapper import AlbumItemMapper
+
+    al = AlbumRow(
+        uuid.uuid4(), "Palette", date(2017, 4, 21), "c.jpg", "album", "sp_al",
+        {"spotify_url": "https://open.spotify.com/album/x"}, 10, "Loen", 71, True,
+    )
+    item = AlbumItemMapper.to_list([al], {str(al.id): ("IU", "sp_iu")})[0]
+
+    assert item.id == str(al.id) and item.release_date == "2017-04-21"
+    assert item.artist_name == "IU" and item.external_url.endswith("/x")
+    assert item.best_new is True and item.popularity == 71
+
+
+def test_artist_row_maps():
+    from app.domain.rows import ArtistRow
+    from app.mappers.artist_mapper import ArtistItemMapper
+
+    ar = ArtistRow(uuid.uuid4(), "IU", "sp_iu", "p.jpg", '["k-pop"]', 100, 80, None,
+                   {"spotify_url": "https://open.spotify.com/artist/x"})
+    item = ArtistItemMapper.to_list([ar])[0]
+
+    assert item.cover_url == "p.jpg" and item.genres == ["k-pop"]
+    assert item.followers_count == 100 and item.spotify_url.endswith("/x")
+
+
+def test_track_row_maps_primary_and_feat():
+    from app.domain.rows import ArtistRef, TrackAlbumRef, TrackRow
+    from app.mappers.track_mapper import TrackItemMapper
+
+    album = TrackAlbumRef("Palette", "c.jpg", date(2017, 4, 21), "sp_al", ())
+    t = TrackRow(
+        uuid.uuid4(), "Palette", 2, 217, "sp_t", uuid.uuid4(), album,
+        (ArtistRef(1, "G-DRAGON", 70), ArtistRef(2, "IU", 80)),
+    )
+    item = TrackItemMapper.to_list([t])[0]
+
+    assert item.artist_name == "IU" and item.feat_artist_names == ["G-DRAGON"]
+    assert item.album_title == "Palette" and item.release_date == "2017-04-21"
+
+
+def test_track_rows_fetch_album_artists_only_for_uncredited_tracks():
+    from app.domain.rows import ArtistRef
+    from app.repositories.track_repo import TrackRepository
+
+    credited, bare = uuid.uuid4(), uuid.uuid4()
+    al_a, al_b = uuid.uuid4(), uuid.uuid4()
+    projected = [
+        (credited, "One", 1, 100, "sp1", al_a, "A", None, None, "spa"),
+        (bare, "Two", 1, 100, "sp2", al_b, "B", None, None, "spb"),
+    ]
+    artist_repo = MagicMock()
+    artist_repo.refs_by_track_ids.return_value = {credited: (ArtistRef(1, "Solo", 50),)}
+    artist_repo.refs_by_album_ids.return_value = {al_b: (ArtistRef(2, "Band", 40),)}
+
+    rows = TrackRepository(MagicMock(), artist_repo)._to_rows(projected)
+
+    artist_repo.refs_by_album_ids.assert_called_once_with([al_b])
+    assert [a.name for a in rows[0].artists] == ["Solo"] and rows[0].album.artists == ()
+    assert rows[1].artists == () and [a.name for a in rows[1].album.artists] == ["Band"]
@@ -0,0 +1,64 @@
+"""Byte-budgeted result cache (app/core/result_cache.py).
+
+The budget is the contract: total charged bytes never exceed max_bytes, the
+least recently used entries go first, oversized results are not cached at all,
+and a hit decodes back to an equal model. Pure units.
+"""
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel
+
+from app.core.result_cache import ByteBudgetCache
+
+
+class _Page(BaseModel):
+    items: List[str] = []
+
+
+def _cache(max_bytes=4096, **kw):
+    now = {"t": 0.0}
+    c = ByteBudgetCache(_Page, max_bytes=max_bytes, ttl=60, timer=lambda: now["t"], **kw)
+    return c, now
+
+
+def test_round_trip_returns_equal_fresh_object():
+    c, _ = _cache()
+    page = _Page(items=["a", "b"])
+    assert c.set("k", page)
+    hit = c.get("k")
+    assert hit == page and hit is not page
+    assert c.size_of("k") == c.currsize > ByteBudgetCache.ENTRY_OVERHEAD
+
+
+def test_budget_evicts_least_recently_used():
+    c, _ = _cache(max_bytes=3 * (ByteBudgetCache.ENTRY_OVERHEAD + 40), max_entry_bytes=10_000)
+    for k in ("a", "b", "c"):
+        c.set(k, _Page(items=[k]))
+    c.get("a")  # "b" is now least recently used
+    c.set("d", _Page(items=["d"]))
+    assert "b" not in c
+    assert all(k in c for k in ("a", "c", "d"))
+    assert c.currsize <= c.max_bytes
+
+
+def test_oversized_entry_is_not_cached():
+    c, _ = _cache(max_bytes=4096, max_entry_bytes=ByteBudgetCache.ENTRY_OVERHEAD + 64)
+    c.set("small", _Page())
+    assert not c.set("big", _Page(items=[str(i) for i in range(500)]))
+    assert "big" not in c and "small" in c
+
+
+def test_ttl_and_expiring():
+    c, now = _cache()
+    c.set("old", _Page())
+    now["t"] = 40
+    c.set("new", _Page())
+    now["t"] = 50
+    assert c.expiring(within_sec=15) == ["old"]
+    now["t"] = 60
+    assert c.get("old") is None
+    assert len(c) == 1
+    c.clear()
+    assert len(c) == 0 and c.currsize == 0
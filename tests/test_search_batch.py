@@ -0,0 +1,177 @@
+"""POST /search/unified:batch: per-query results in order, the literal phase
+set-based per bucket (app/repositories/literal_batch.py), repository reads
+shared across the batch. Stubbed repos; routing units mirror
+tests/test_cache_control.py.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from app.domain.rows import ArtistRow  # noqa: E402
+from app.services import search_service  # noqa: E402
+from app.services.search_service import SearchService  # noqa: E402
+
+RH = SimpleNamespace(id=uuid.uuid4(), name="Radiohead", popularity=80, aliases=None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    search_service._unified_cache.clear()
+    yield
+    search_service._unified_cache.clear()
+
+
+def _service():
+    svc = SearchService(MagicMock())
+    svc.artist_repo, svc.album_repo, svc.track_repo = MagicMock(), MagicMock(), MagicMock()
+    svc.artist_repo.search_rows_by_name_batch.side_effect = lambda specs: [
+        [RH] if q.lower() in "radiohead" else [] for q, _, _ in specs
+    ]
+    svc.album_repo.search_rows_by_title_batch.side_effect = lambda specs: [[] for _ in specs]
+    svc.track_repo.search_rows_by_title_batch.side_effect = lambda specs: [[] for _ in specs]
+    for repo in (svc.artist_repo, svc.album_repo, svc.track_repo):
+        for name in ("list_rows_by_artist_id", "list_rows_by_album_ids", "rows_by_album_ids",
+                     "rows_by_track_ids", "rows_by_ids"):
+            getattr(repo, name).return_value = []
+    svc.artist_repo.get_by_ids.side_effect = lambda ids: [
+        ArtistRow(i, "Radiohead", "sp", None, None, 100, 80, None, None) for i in ids
+    ]
+    svc.album_repo.get_by_ids.return_value = []
+    svc.track_repo.get_by_ids.return_value = []
+    return svc
+
+
+def _q(q, **kw):
+    return {"q": q, "limit": 20, "offset": 0, **kw}
+
+
+def test_results_in_request_order_with_one_literal_statement_per_bucket():
+    svc = _service()
+    results = svc.unified_search_batch([_q("radiohead"), _q("zzzz"), _q("RADIO", artist_offset=3)])
+    assert [len(r.artists) for r in results] == [1, 0, 1]
+    svc.artist_repo.search_rows_by_name_batch.assert_called_once_with(
+        [("radiohead", 20, 0), ("zzzz", 20, 0), ("RADIO", 20, 3)]
+    )
+    svc.album_repo.search_rows_by_title_batch.assert_called_once()
+    svc.artist_repo.search_rows_by_name.assert_not_called()
+    # repos are restored after the batch
+    assert not isinstance(svc.artist_repo, search_service._BatchMemo)
+
+
+def test_overlapping_reads_are_shared_across_the_batch():
+    svc = _service()
+    svc.unified_search_batch([_q("radio", types={"artist", "album"}), _q("head", types={"album", "artist"})])
+    # both queries expand the same literal artist and hydrate the same row
+    svc.album_repo.list_rows_by_artist_id.assert_called_once()
+    svc.artist_repo.get_by_ids.assert_called_once_with([RH.id])
+
+
+def test_repeated_and_cached_queries_are_answered_once():
+    svc = _service()
+    first = svc.unified_search(q="radiohead", limit=20, offset=0)
+    svc.artist_repo.search_rows_by_name.assert_called_once()
+    results = svc.unified_search_batch([_q("radiohead"), _q("zzzz"), _q("zzzz")])
+    assert results[0] == first and results[1] == results[2]
+    svc.artist_repo.search_rows_by_name_batch.assert_called_once_with([("zzzz", 20, 0)])
+
+
+def test_split_decomposition_reads_are_batched():
+    svc = _service()
+    svc.unified_search_batch([_q("radiohead amnesiac", types={"album"})])
+    (specs,), _ = svc.artist_repo.search_rows_by_name_batch.call_args
+    assert ("radiohead", search_service.DECOMP_ARTIST_CANDIDATES, 0) in specs
+    (album_specs,), _ = svc.album_repo.search_rows_by_title_batch.call_args
+    assert album_specs == [("radiohead amnesiac", 20, 0), ("amnesiac", 20, 0), ("radiohead", 20, 0)]
+    svc.artist_repo.search_rows_by_name.assert_not_called()
+
+
+def test_each_query_gets_its_own_deadline(monkeypatch):
+    from app.core.deadline import Deadline
+
+    monkeypatch.setattr(search_service.settings, "REQUEST_DEADLINE_SEC", 8.0)
+    monkeypatch.setattr(search_service.settings, "SEARCH_OPTIONAL_PHASE_MIN_SEC", 2.0)
+    now = {"t": 0.0}
+    monkeypatch.setattr(search_service, "Deadline", lambda sec: Deadline(sec, clock=lambda: now["t"]))
+
+    svc = _service()
+    svc.db.info = {"deadline": Deadline(8.0, clock=lambda: now["t"])}
+    svc.artist_repo.search_rows_by_name_batch.side_effect = lambda specs: [
+        [SimpleNamespace(id=uuid.uuid4(), name=q, popularity=1, aliases=None)] for q, _, _ in specs
+    ]
+
+    def slow_expansion(artist_id, limit):
+        now["t"] += 3.0  # each query's expansion costs 3s of an 8s budget
+        return []
+
+    svc.album_repo.list_rows_by_artist_id.side_effect = slow_expansion
+    queries = [_q(f"artist{i}", types={"artist", "album"}) for i in range(5)]
+    results = svc.unified_search_batch(queries)
+    # on one shared 8s budget, the fourth query onward would skip expansion
+    assert [r.partial for r in results] == [False] * 5
+    assert svc.album_repo.list_rows_by_artist_id.call_count == 5
+    assert len(search_service._unified_cache) == 5
+
+
+def test_literal_rows_batch_is_one_lateral_statement_split_per_query():
+    from sqlalchemy import column, select, table
+    from sqlalchemy.dialects import postgresql
+
+    from app.repositories.literal_batch import contains_pattern, literal_rows_batch
+
+    albums = table("albums", column("id"), column("title"))
+
+    def build(q):
+        return select(albums.c.id).where(albums.c.title.ilike(contains_pattern(q))), (albums.c.id,)
+
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [
+        SimpleNamespace(idx=0, id=1), SimpleNamespace(idx=2, id=3), SimpleNamespace(idx=2, id=4),
+    ]
+    assert literal_rows_batch(db, [("a", 5, 0), ("b", 5, 0), ("c", 2, 1)], build) == [
+        [db.execute.return_value.all.return_value[0]], [], db.execute.return_value.all.return_value[1:],
+    ]
+    sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "JOIN LATERAL" in sql and "LIMIT qs.lim OFFSET qs.\"off\"" in sql
+    assert "ORDER BY qs.idx, m.batch_pos" in sql
+
+
+def _client():
+    from fastapi.testclient import TestClient
+
+    from app.core.db import get_db
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    return TestClient(app)
+
+
+def test_batch_route_validates_and_passes_resolved_types(monkeypatch):
+    from app.api.routers import search as search_router
+    from app.domain.schemas import UnifiedSearchResult
+
+    fake_svc = MagicMock()
+    fake_svc.unified_search_batch.side_effect = lambda qs: [UnifiedSearchResult() for _ in qs]
+    monkeypatch.setattr(search_router, "DBSearchService", lambda db: fake_svc)
+    client = _client()
+
+    r = client.post("/api/music/search/unified:batch", json={"queries": [{"q": "radiohead", "type": "album"}, {"q": "x"}]})
+    assert r.status_code == 200, r.text
+    assert len(r.json()["results"]) == 2
+    (queries,), _ = fake_svc.unified_search_batch.call_args
+    assert queries[0]["types"] == {"album"} and queries[1]["types"] == {"album", "artist", "track"}
+
+    r = client.post("/api/music/search/unified:batch", json={"queries": [{"q": "x"}, {"q": "y", "type": "bogus"}]})
+    assert r.status_code == 400 and r.json()["detail"].startswith("queries[1]:")
+
+    monkeypatch.setattr(search_router.settings, "SEARCH_BATCH_MAX_QUERIES", 1)
+    r = client.post("/api/music/search/unified:batch", json={"queries": [{"q": "x"}, {"q": "y"}]})
+    assert r.status_code == 400
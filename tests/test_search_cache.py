@@ -34,7 +34,7 @@ def test_identical_calls_compute_once():
     a = svc.unified_search(q="radiohead", limit=20, offset=0)
     b = svc.unified_search(q="radiohead", limit=20, offset=0)
     assert calls["n"] == 1, "second identical call must hit the cache"
-    assert a is b, "cache returns the same object"
+    assert a == b, "cache returns an equal (decoded) result"
 
 
 def test_distinct_args_recompute():
@@ -57,3 +57,18 @@ def test_explain_is_a_separate_entry():
     svc.unified_search(q="radiohead", limit=20, offset=0)
     svc.unified_search(q="radiohead", limit=20, offset=0, explain=True)
     assert calls["n"] == 2, "explain=True must not reuse the non-explain entry"
+
+
+def test_hit_decodes_the_full_result():
+    from app.domain.schemas import AlbumItem, ExplainEntry, UnifiedSearchResult
+    from app.services.search_service import SearchService
+
+    full = UnifiedSearchResult(
+        albums=[AlbumItem(id="a1", title="Kid A", popularity=80)],
+        debug=[ExplainEntry(bucket="album", id="a1", rank=1, path="literal")],
+    )
+    svc = SearchService(MagicMock())
+    svc._compute_unified_search = lambda **kw: full  # type: ignore[method-assign]
+    svc.unified_search(q="kid a", limit=20, offset=0, explain=True)
+    svc._compute_unified_search = lambda **kw: UnifiedSearchResult()  # type: ignore[method-assign]
+    assert svc.unified_search(q="kid a", limit=20, offset=0, explain=True) == full
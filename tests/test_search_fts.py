@@ -0,0 +1,72 @@
+"""SEARCH_FTS_ENABLED (db/migrations/008_search_documents.sql): multi-word
+queries are matched with one search_documents query per bucket instead of the
+per-split decomposition queries. Stubbed repos; the SQL itself needs Postgres."""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import date
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+def _album(title, popularity=50):
+    # Doubles as the thin row and the hydrated DTO.
+    from app.domain.rows import AlbumRow
+
+    return AlbumRow(
+        uuid.uuid4(), title, date(2022, 6, 10), None, "album", None, {}, None, None, popularity, False
+    )
+
+
+def _service(fts_albums):
+    from app.services.search_service import SearchService
+
+    svc = SearchService(MagicMock())
+    svc.artist_repo, svc.album_repo, svc.track_repo = MagicMock(), MagicMock(), MagicMock()
+    svc.artist_repo.search_rows_by_name.return_value = []
+    svc.album_repo.search_rows_by_title.return_value = []
+    svc.album_repo.search_rows_fts.return_value = fts_albums
+    svc.album_repo.get_by_ids.side_effect = lambda ids: [a for a in fts_albums if a.id in ids]
+    svc.album_repo.get_primary_artist_map.return_value = {}
+    return svc
+
+
+def test_multi_word_query_is_one_document_query(monkeypatch):
+    from app.core import config
+
+    monkeypatch.setattr(config.settings, "SEARCH_FTS_ENABLED", True)
+    proof, other = _album("Proof", 10), _album("Proof of Inspiration", 90)
+    svc = _service([other, proof])
+
+    res = svc._compute_unified_search(q="방탄소년단 Proof", limit=10, offset=0, types={"album"}, explain=True)
+
+    svc.album_repo.search_rows_fts.assert_called_once_with("방탄소년단 Proof", 10)
+    # Only the literal phase searches by title; no per-split queries.
+    svc.album_repo.search_rows_by_title.assert_called_once()
+    svc.album_repo.artist_ids_by_album_ids.assert_not_called()
+    # Title-part similarity still ranks the exact "Proof" first.
+    assert [a.title for a in res.albums] == ["Proof", "Proof of Inspiration"]
+    assert [(d.path, d.similarity) for d in res.debug] == [("decomposed", 3.0), ("decomposed", 2.0)]
+
+
+def test_single_word_query_skips_the_document_query(monkeypatch):
+    from app.core import config
+
+    monkeypatch.setattr(config.settings, "SEARCH_FTS_ENABLED", True)
+    svc = _service([])
+    svc._compute_unified_search(q="Proof", limit=10, offset=0, types={"album"})
+    svc.album_repo.search_rows_fts.assert_not_called()
+
+
+def test_fts_query_uses_the_hangul_bigram_transform():
+    from sqlalchemy.dialects import postgresql
+
+    from app.repositories.search_document_repo import fts_query
+
+    sql = str(fts_query("방탄 proof").compile(dialect=postgresql.dialect()))
+    assert sql.startswith("plainto_tsquery(")
+    assert "search_hangul_bigrams(" in sql
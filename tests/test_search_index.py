@@ -0,0 +1,134 @@
+"""Offline search index (app/core/search_index.py): build → mmap round trip,
+DB-order substring matching, relations, and the repository stand-ins' Postgres
+fallback. Pure units — the catalog is hand-built, the DB repos are MagicMocks."""
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+IU, TAEYEON, IUNA = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+PALETTE, LILAC = uuid.uuid4(), uuid.uuid4()
+T1, T2, T3 = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+_TS = datetime(2024, 1, 1)
+
+
+def _catalog():
+    from app.services.catalog_export_service import Catalog
+
+    c = Catalog()
+    c.add_rows("artists", [
+        (IU, "IU", "sp1", None, [], 100, 80, None, ["아이유"], 5),
+        (TAEYEON, "태연", "sp2", None, [], 100, 75, None, ["Taeyeon"], 1),
+        (IUNA, "Iuna", "sp3", None, [], 1, None, None, [], 0),
+    ])
+    c.add_rows("albums", [
+        (PALETTE, "Palette", date(2017, 4, 21), None, "album", "a1", {}, 10, None, 60, False),
+        (LILAC, "LILAC", date(2021, 3, 25), None, "album", "a2", {}, 10, None, 70, False),
+    ])
+    c.add_rows("album_artists", [(PALETTE, IU), (LILAC, IU)])
+    c.add_rows("tracks", [
+        (T1, "Palette", 2, 217, "t1", PALETTE, 3, _TS),
+        (T2, "LILAC", 1, 214, "t2", LILAC, 9, _TS),
+        (T3, "Coin", 2, 190, "t3", LILAC, 0, _TS),
+    ])
+    c.add_rows("track_artists", [(T1, IU), (T2, IU), (T3, IU)])
+    return c
+
+
+@pytest.fixture(scope="module")
+def index():
+    from app.core.search_index import SearchIndex, build_index
+
+    return SearchIndex(build_index(_catalog()))
+
+
+def test_substring_matches_come_back_in_db_order(index):
+    # popularity DESC NULLS LAST: IU (80) before Iuna (NULL)
+    assert [a.name for a in index.search("ar", "iu", 10, 0)] == ["IU", "Iuna"]
+    assert [a.name for a in index.search("ar", "iu", 1, 1)] == ["Iuna"]
+    assert index.search("ar", "zz", 10, 0) == []
+
+
+def test_aliases_and_two_syllable_hangul_match(index):
+    assert [a.id for a in index.search("ar", "아이유", 10, 0)] == [IU]
+    assert [a.id for a in index.search("ar", "태연", 10, 0)] == [TAEYEON]
+    assert [a.id for a in index.search("ar", "TAEYEON", 10, 0)] == [TAEYEON]
+
+
+def test_unanswerable_queries_are_none(index):
+    assert index.search("ar", "i", 10, 0) is None  # shorter than a gram
+    assert index.search("al", "pa%", 10, 0) is None  # ILIKE wildcard
+
+
+def test_track_hits_carry_album_rank_inputs(index):
+    (hit,) = index.search("tr", "lilac", 10, 0)
+    assert hit.album_id == LILAC and hit.album_popularity == 70
+    assert hit.album_release_date == date(2021, 3, 25)
+
+
+def test_relations_follow_the_db_orderings(index):
+    assert [al.title for al in index.artist_albums(IU, 10)] == ["LILAC", "Palette"]
+    # album popularity first (LILAC 70), then track_no within the album
+    assert [t.title for t in index.album_tracks([PALETTE, LILAC], 10)] == ["LILAC", "Coin", "Palette"]
+    assert index.credit_ids("tr", [T1]) == {T1: {IU}}
+    assert index.artist_albums(uuid.uuid4(), 10) is None  # absorbed after the build
+
+
+def test_open_maps_the_file(tmp_path):
+    from app.core.search_index import SearchIndex, build_index
+
+    path = tmp_path / "search.idx"
+    path.write_bytes(build_index(_catalog(), built_at=time.time() - 5))
+    idx = SearchIndex.open(str(path))
+
+    assert 5 <= idx.age_sec() < 60
+    assert [a.id for a in idx.search("ar", "iu", 1, 0)] == [IU]
+
+
+def test_stand_in_falls_back_to_the_db_when_the_index_cannot_answer(index, monkeypatch):
+    from app.core import config
+    from app.repositories.search_index_repo import IndexedArtistRepository, IndexedTrackRepository
+
+    monkeypatch.setattr(config.settings, "SEARCH_USE_PG_TRGM", False)
+    db = MagicMock()
+    repo = IndexedArtistRepository(index, db)
+
+    assert [a.id for a in repo.search_rows_by_name("iu", 10, 0)] == [IU, IUNA]
+    db.search_rows_by_name.assert_not_called()
+
+    repo.search_rows_by_name("nobody", 10, 0)  # no hit: may postdate the build
+    db.search_rows_by_name.assert_called_once_with("nobody", 10, 0)
+
+    monkeypatch.setattr(config.settings, "SEARCH_USE_PG_TRGM", True)
+    repo.search_rows_by_name("iu", 10, 0)  # short page: pg_trgm may add a fuzzy tail
+    assert db.search_rows_by_name.call_count == 2
+
+    tracks = IndexedTrackRepository(index, MagicMock())
+    new_album = uuid.uuid4()
+    tracks.list_rows_by_album_ids([new_album], 5)
+    tracks.db_repo.list_rows_by_album_ids.assert_called_once_with([new_album], 5)
+    tracks.get_by_ids([T1])  # hydrate is always the DB's
+    tracks.db_repo.get_by_ids.assert_called_once_with([T1])
+
+
+def test_batched_stand_in_sends_only_the_misses_to_the_db(index, monkeypatch):
+    from app.core import config
+    from app.repositories.search_index_repo import IndexedArtistRepository
+
+    monkeypatch.setattr(config.settings, "SEARCH_USE_PG_TRGM", False)
+    db = MagicMock()
+    db.search_rows_by_name_batch.return_value = [["db"]]
+    repo = IndexedArtistRepository(index, db)
+
+    out = repo.search_rows_by_name_batch([("iu", 10, 0), ("nobody", 10, 0)])
+    assert [a.id for a in out[0]] == [IU, IUNA] and out[1] == ["db"]
+    db.search_rows_by_name_batch.assert_called_once_with([("nobody", 10, 0)])
@@ -0,0 +1,117 @@
+"""Query planner (app/core/search_plan.py): shape classification, and the
+service running the picked strategy. Stubbed repos."""
+from __future__ import annotations
+
+import os
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from app.core.search_plan import plan_query, prefix_match  # noqa: E402
+
+SPID = "4Z8W4fKeB5YxbusRsdQVPb"
+
+
+@pytest.mark.parametrize("q, strategy, script", [
+    ("a", "prefix", "latin"),
+    ("Ab", "prefix", "latin"),
+    ("방", "prefix", "hangul"),
+    ("방탄", "substring", "hangul"),  # whole names / aliases: keep substring
+    ("radiohead", "substring", "latin"),
+    ("방탄소년단 Proof", "multi_token", "mixed"),
+    (SPID, "spotify_id", "latin"),
+    (f"spotify:artist:{SPID}", "spotify_id", "latin"),
+    (f"https://open.spotify.com/intl-ko/track/{SPID}?si=x", "spotify_id", "latin"),
+    ("supercalifragilisticab", "substring", "latin"),  # 22 letters, no digit
+])
+def test_plan_by_shape(q, strategy, script):
+    plan = plan_query(q)
+    assert (plan.strategy, plan.script) == (strategy, script)
+
+
+def test_plan_flags_follow_settings(monkeypatch):
+    from app.core import config
+
+    monkeypatch.setattr(config.settings, "SEARCH_USE_PG_TRGM", True)
+    monkeypatch.setattr(config.settings, "SEARCH_FTS_ENABLED", True)
+    assert plan_query("Kendric Lamar").describe() == (
+        "strategy=multi_token script=latin tokens=2 fuzzy=trgm decompose=fts"
+    )
+    assert plan_query("ab").fuzzy is False
+    assert plan_query(f"spotify:album:{SPID}").spotify_type == "album"
+
+
+def test_prefix_match_is_a_c_collated_range():
+    from sqlalchemy import column, select, table
+    from sqlalchemy.dialects import postgresql
+
+    artists = table("artists", column("name"))
+    sql = str(select(artists.c.name).where(prefix_match(artists.c.name, "Ab")).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+    assert "(lower(artists.name) COLLATE \"C\") >= 'ab'" in sql
+    assert "(lower(artists.name) COLLATE \"C\") < 'ac'" in sql
+
+
+def _service():
+    from app.services.search_service import SearchService
+
+    svc = SearchService(MagicMock())
+    svc.artist_repo, svc.album_repo, svc.track_repo = MagicMock(), MagicMock(), MagicMock()
+    for repo in (svc.artist_repo, svc.album_repo, svc.track_repo):
+        for name in ("search_rows_by_prefix", "search_rows_by_spotify_id",
+                     "search_rows_by_name", "search_rows_by_title", "get_by_ids"):
+            getattr(repo, name).return_value = []
+    svc.album_repo.get_primary_artist_map.return_value = {}
+    return svc
+
+
+def test_short_query_runs_the_prefix_strategy_with_per_bucket_offsets():
+    svc = _service()
+    res = svc._compute_unified_search(
+        q="ab ", limit=20, offset=5, artist_offset=100, explain=True
+    )
+    svc.artist_repo.search_rows_by_prefix.assert_called_once_with("ab", 20, 100)
+    svc.album_repo.search_rows_by_prefix.assert_called_once_with("ab", 20, 5)
+    svc.artist_repo.search_rows_by_name.assert_not_called()
+    svc.album_repo.search_rows_by_title.assert_not_called()
+    assert res.plan.startswith("strategy=prefix")
+
+
+def test_typed_spotify_uri_looks_up_only_its_bucket():
+    svc = _service()
+    svc._compute_unified_search(q=f"spotify:track:{SPID}", limit=20, offset=0)
+    svc.track_repo.search_rows_by_spotify_id.assert_called_once_with(SPID)
+    svc.artist_repo.search_rows_by_spotify_id.assert_not_called()
+    svc.track_repo.search_rows_by_title.assert_not_called()
+
+
+def test_cached_search_looks_up_the_exact_case_sensitive_id():
+    svc = _service()
+    svc.unified_search(q=f" spotify:artist:{SPID}", limit=20, offset=0)
+    svc.artist_repo.search_rows_by_spotify_id.assert_called_once_with(SPID)
+    # the cache key is canonical, the warm-ping refresh still computes the id
+    svc.artist_repo.search_rows_by_spotify_id.reset_mock()
+    assert svc.refresh_expiring(within_sec=10**6, max_entries=1) == 1
+    svc.artist_repo.search_rows_by_spotify_id.assert_called_once_with(SPID)
+
+
+def test_unknown_bare_id_is_searched_as_text():
+    svc = _service()
+    res = svc._compute_unified_search(q=SPID, limit=20, offset=0, explain=True)
+    svc.album_repo.search_rows_by_spotify_id.assert_called_once_with(SPID)
+    svc.album_repo.search_rows_by_title.assert_called_once_with(SPID, 20, 0)
+    assert res.plan.startswith("strategy=substring")
+
+
+def test_exact_id_hit_skips_text_search():
+    svc = _service()
+    row = MagicMock(id=uuid.uuid4(), name="X", popularity=1)
+    svc.artist_repo.search_rows_by_spotify_id.return_value = [row]
+    svc._compute_unified_search(q=SPID, limit=20, offset=0, types={"artist"})
+    svc.artist_repo.search_rows_by_name.assert_not_called()
@@ -0,0 +1,95 @@
+"""Relevance ladder + popularity blend (app/core/ranking.py): the Ranker, the
+heap top-k over RankColumns, and the SQL form the repos' stage-one queries
+ORDER BY so LIMIT keeps the true top-N."""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from sqlalchemy import column, select, table  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+
+from app.core.ranking import RankColumns, Ranker, Weights, sql_blend  # noqa: E402
+
+
+def test_exact_match_outranks_a_popular_contains_match():
+    r = Ranker("PROOF")
+    assert r.similarity("Proof") == 3
+    assert r.similarity("Proof of Inspiration") == 2
+    assert r.similarity("Bulletproof") == 1
+    assert r.similarity(None) == 0
+    assert r.score(3, 0) > r.score(1, 100)
+    assert r.score(0, None) == r.score(0, -5) == 0.7 * 0.1
+
+
+def test_weights_are_configurable(monkeypatch):
+    from app.core import config
+
+    monkeypatch.setattr(config.settings, "SEARCH_RANK_POPULARITY_WEIGHT", 1.0)
+    assert Ranker("x").weights == Weights(0.7, 1.0)
+    assert Ranker("x").score(1, 100) > Ranker("x").score(3, 0)
+
+
+def _blend_sql(q):
+    albums = table("albums", column("title"), column("popularity"))
+    expr = sql_blend(albums.c.title, q, albums.c.popularity)
+    return str(
+        select(albums.c.title).order_by(expr.desc()).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_sql_blend_is_the_ladder_over_lowercased_text(monkeypatch):
+    from app.core import config
+
+    sql = _blend_sql("Proof")
+    assert "0.7 * CASE WHEN (lower(albums.title) = 'proof') THEN 1.0" in sql
+    assert "WHEN starts_with(lower(albums.title), 'proof') THEN 0.6" in sql
+    assert "WHEN (strpos(lower(albums.title), 'proof') > 0) THEN 0.35 ELSE 0.1 END" in sql
+    assert "0.3 * least(greatest(coalesce(albums.popularity, 0), 0), 100)" in sql
+    assert sql.rstrip().endswith("DESC")
+
+    # same weights as the Ranker
+    monkeypatch.setattr(config.settings, "SEARCH_RANK_POPULARITY_WEIGHT", 0.5)
+    assert "0.5 * least(" in _blend_sql("Proof")
+
+    # batched stage one: the query is a column, lowercased in SQL
+    assert "lower(albums.title) = lower(qs.q)" in _blend_sql(table("qs", column("q")).c.q)
+
+
+def test_top_k_matches_a_full_stable_sort():
+    cols = RankColumns()
+    keys = [(1, 0.5, 0), (0, 0.2, 0), (0, 0.9, 0), (1, 0.5, -3), (0, 0.2, 0), (-1, 0.0, 0)]
+    for tier, score, tb in keys:
+        cols.append(tier, 0, score, tb)
+    full = sorted(range(len(keys)), key=lambda i: (keys[i][0], -keys[i][1], keys[i][2]))
+    assert cols.top_k(3) == full[:3]
+    assert cols.top_k(10) == full
+
+
+def test_service_rank_is_path_tiered_with_explain_keys():
+    from app.services.search_service import PATH_EXPANSION, PATH_LITERAL, _rank
+
+    def track(title, pop, rd=None):
+        return SimpleNamespace(
+            id=uuid.uuid4(), title=title, album_popularity=pop, album_release_date=rd
+        )
+
+    exact, contains = track("Proof", 0), track("Bulletproof", 100)
+    old, new = track("Old", 50, date(2001, 1, 1)), track("New", 50, date(2024, 1, 1))
+    rows = [old, contains, new, exact]
+    path = {exact.id: PATH_LITERAL, contains.id: PATH_LITERAL}  # unlabeled → expansion
+    path.update({old.id: PATH_EXPANSION})
+
+    ranked, keys = _rank("track", rows, path, Ranker("proof"), 3)
+
+    assert ranked == [exact, contains, new]
+    assert keys[exact.id] == (3, 0.7)
+    assert keys[new.id][0] == -1  # expansion: no similarity
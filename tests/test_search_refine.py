@@ -0,0 +1,103 @@
+"""Search-as-you-type refinement (app/core/refine_cache.py and
+SearchService._refined_literal): a keystroke that extends the previous query
+is answered from the kept superset, without a repository call. Stubbed repos.
+"""
+from __future__ import annotations
+
+import os
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+from app.core.refine_cache import RefineCache  # noqa: E402
+from app.services import search_service  # noqa: E402
+from app.services.search_service import SearchService  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    search_service._refine_cache.clear()
+    yield
+    search_service._refine_cache.clear()
+
+
+def _artist(name, popularity=0, aliases=None):
+    return SimpleNamespace(id=uuid.uuid4(), name=name, popularity=popularity, aliases=aliases)
+
+
+def _service(artists):
+    svc = SearchService(MagicMock())
+    svc.artist_repo, svc.album_repo, svc.track_repo = MagicMock(), MagicMock(), MagicMock()
+    svc.artist_repo.search_rows_by_name.return_value = artists
+    svc.artist_repo.get_by_ids.side_effect = lambda ids: []
+    return svc
+
+
+def _literal(svc, q, session="s1", limit=20, offset=0):
+    return svc._refined_literal(
+        session, "artist", q, limit, offset, svc.artist_repo.search_rows_by_name
+    )
+
+
+def test_cache_is_lru_with_ttl():
+    now = {"t": 0.0}
+    c = RefineCache(max_entries=2, ttl=60, timer=lambda: now["t"])
+    c.set("a", "ra", [1])
+    c.set("b", "ra", [2])
+    assert c.get("a").rows == (1,)  # "b" is now least recently used
+    c.set("c", "ra", [3])
+    assert c.get("b") is None and c.get("a") is not None
+    now["t"] = 60
+    assert c.get("a") is None
+    assert len(RefineCache(max_entries=0, ttl=60)) == 0
+
+
+def test_extending_keystroke_is_refined_in_memory():
+    rows = [_artist("Radio Moscow", 90), _artist("Radiohead", 80), _artist("X", aliases=["radiohead fan"])]
+    svc = _service(rows)
+    assert _literal(svc, "radi") == rows
+    svc.artist_repo.search_rows_by_name.assert_called_once()
+
+    refined = _literal(svc, "Radiohead")
+    svc.artist_repo.search_rows_by_name.assert_called_once()
+    # exact match first, alias-only match kept after it
+    assert [r.name for r in refined] == ["Radiohead", "X"]
+
+
+def test_truncated_superset_is_not_kept(monkeypatch):
+    monkeypatch.setattr(search_service.settings, "SEARCH_REFINE_SUPERSET_ROWS", 2)
+    svc = _service([_artist("Radio A"), _artist("Radio B"), _artist("Radio C")])
+    assert len(_literal(svc, "radi", limit=2)) == 2
+    svc.artist_repo.search_rows_by_name.assert_called_once_with("radi", 3, 0)
+    _literal(svc, "radio", limit=2)
+    assert svc.artist_repo.search_rows_by_name.call_count == 2
+
+
+def test_unrelated_query_or_other_session_reseeds():
+    svc = _service([_artist("Radiohead")])
+    _literal(svc, "radio")
+    _literal(svc, "head")  # not an extension of "radio"
+    _literal(svc, "header", session="s2")
+    assert svc.artist_repo.search_rows_by_name.call_count == 3
+    _literal(svc, "headers")  # extends "head" in s1
+    assert svc.artist_repo.search_rows_by_name.call_count == 3
+
+
+def test_unified_search_without_session_does_not_refine():
+    svc = _service([_artist("Radiohead")])
+    svc.unified_search(q="radio", types={"artist"}, limit=20, offset=0)
+    svc.unified_search(q="radioh", types={"artist"}, limit=20, offset=0)
+    assert svc.artist_repo.search_rows_by_name.call_count == 2
+    assert len(search_service._refine_cache) == 0
+
+
+def test_wildcard_query_is_not_refined():
+    svc = _service([_artist("100% Radio")])
+    svc._compute_unified_search(q="0% r", types={"artist"}, limit=20, offset=0, session="s1")
+    assert len(search_service._refine_cache) == 0
@@ -82,70 +82,81 @@ class TestCognitoAuthBypass:
         assert exc_info.value.status_code == 503
 
 
-class TestAlbumServiceExternalUrl:
-    """AlbumOut.external_url must be populated from Album.ext_refs['spotify_url']."""
+class TestAlbumServiceDetailDocument:
+    """AlbumService parses the one-statement JSON document from
+    AlbumRepository.get_detail_json* straight into AlbumDetail. The SQL itself
+    (external_url from ext_refs, feat exclusion, media fields) is exercised
+    against Postgres in tests/integration/test_album_detail.py."""
 
-    def _make_album(self, ext_refs):
-        from datetime import date
-        al = MagicMock()
-        al.id = uuid.uuid4()
-        al.title = "OK Computer"
-        al.release_date = date(1997, 6, 16)
-        al.cover_url = "https://example.com/cover.jpg"
-        al.album_type = "album"
-        al.spotify_id = "test_spotify_id"
-        al.ext_refs = ext_refs
-        al.label = None
-        return al
-
-    def test_external_url_populated_from_ext_refs(self):
+    def _doc(self, **album):
+        import json
+        al = {
+            "id": str(uuid.uuid4()), "title": "OK Computer", "release_date": "1997-06-16",
+            "cover_url": None, "album_type": "album", "spotify_id": "test_spotify_id",
+            "external_url": None, "label": None, "best_new": False,
+        }
+        al.update(album)
+        return json.dumps({
+            "album": al,
+            "artists": [{"id": str(uuid.uuid4()), "name": "Radiohead", "spotify_id": "sp_rh",
+                         "photo_url": None, "genres": ["alt"], "followers_count": 10,
+                         "popularity": 80, "spotify_url": None}],
+            "tracks": [{"id": str(uuid.uuid4()), "title": "Airbag", "track_no": 1,
+                        "duration_sec": 284, "spotify_id": "sp_t1", "feat_artist_names": []}],
+            "meta": {"source": "db"},
+        })
+
+    def _svc(self):
         from app.services.album_service import AlbumService
-        from app.domain.schemas import AlbumDetail
-
-        al = self._make_album({"spotify_url": "https://open.spotify.com/album/abc123"})
-        mock_db = MagicMock()
-        svc = AlbumService(mock_db)
+        svc = AlbumService(MagicMock())
         svc.albums = MagicMock()
-        svc.artists = MagicMock()
-        svc.tracks = MagicMock()
-        svc.albums.get_with_artists.return_value = (al, [])
-        svc.tracks.get_by_album.return_value = []
+        return svc
 
-        result: AlbumDetail = svc.get_album_detail(str(al.id))
+    def test_document_parsed_into_album_detail(self):
+        svc = self._svc()
+        svc.albums.get_detail_json.return_value = self._doc(
+            external_url="https://open.spotify.com/album/abc123", label="Parlophone",
+        )
+        album_id = str(uuid.uuid4())
 
+        result = svc.get_album_detail(album_id)
+
+        svc.albums.get_detail_json.assert_called_once_with(album_id)
         assert result.album.external_url == "https://open.spotify.com/album/abc123"
+        assert result.album.label == "Parlophone"
+        assert result.artists[0].genres == ["alt"]
+        assert result.tracks[0].title == "Airbag"
+        assert result.meta == {"source": "db"}
 
-    def test_external_url_none_when_ext_refs_empty(self):
-        from app.services.album_service import AlbumService
+    def test_missing_album_is_404(self):
+        from fastapi import HTTPException
 
-        al = self._make_album({})
-        mock_db = MagicMock()
-        svc = AlbumService(mock_db)
-        svc.albums = MagicMock()
-        svc.artists = MagicMock()
-        svc.tracks = MagicMock()
-        svc.albums.get_with_artists.return_value = (al, [])
-        svc.tracks.get_by_album.return_value = []
+        svc = self._svc()
+        svc.albums.get_detail_json.return_value = None
+        with pytest.raises(HTTPException) as e:
+            svc.get_album_detail(str(uuid.uuid4()))
+        assert e.value.status_code == 404
 
-        result = svc.get_album_detail(str(al.id))
+    def test_non_uuid_id_is_404_without_a_query(self):
+        from fastapi import HTTPException
 
-        assert result.album.external_url is None
+        svc = self._svc()
+        with pytest.raises(HTTPException) as e:
+            svc.get_album_detail("not-a-uuid")
+        assert e.value.status_code == 404
+        svc.albums.get_detail_json.assert_not_called()
 
-    def test_external_url_none_when_ext_refs_null(self):
-        from app.services.album_service import AlbumService
+    def test_by_spotify_retries_on_primary_after_a_replica_miss(self, monkeypatch):
+        from app.services import album_service
 
-        al = self._make_album(None)
-        mock_db = MagicMock()
-        svc = AlbumService(mock_db)
-        svc.albums = MagicMock()
-        svc.artists = MagicMock()
-        svc.tracks = MagicMock()
-        svc.albums.get_with_artists.return_value = (al, [])
-        svc.tracks.get_by_album.return_value = []
+        svc = self._svc()
+        svc.albums.get_detail_json_by_spotify_id.side_effect = [None, self._doc()]
+        monkeypatch.setattr(album_service, "fallback_to_primary", lambda db: True)
 
-        result = svc.get_album_detail(str(al.id))
+        result = svc.get_album_detail_by_spotify("test_spotify_id")
 
-        assert result.album.external_url is None
+        assert result.album.spotify_id == "test_spotify_id"
+        assert svc.albums.get_detail_json_by_spotify_id.call_count == 2
 
 
 class TestAlbumItemMapperArtistName:
@@ -191,130 +202,6 @@ class TestAlbumItemMapperArtistName:
         assert rows[0].artist_spotify_id is None
 
 
-class TestAlbumServiceWriteUxBundle:
-    """FEAT-write-ux-bundle PR-2: AlbumOut.label + TrackOut.feat_artist_names."""
-
-    def _make_album(self, *, label=None, ext_refs=None):
-        from datetime import date
-        al = MagicMock()
-        al.id = uuid.uuid4()
-        al.title = "Album"
-        al.release_date = date(2020, 1, 1)
-        al.cover_url = None
-        al.album_type = "album"
-        al.spotify_id = "alb_sp"
-        al.ext_refs = ext_refs or {}
-        al.label = label
-        return al
-
-    def _make_artist(self, name: str, *, photo_url=None, genres=None,
-                     popularity=None, followers=None, spotify_url=None):
-        ar = MagicMock()
-        ar.id = uuid.uuid4()
-        ar.name = name
-        ar.spotify_id = f"sp_{name}"
-        ar.photo_url = photo_url
-        ar.genres = genres if genres is not None else []
-        ar.popularity = popularity
-        ar.followers = followers
-        ar.spotify_url = spotify_url
-        return ar
-
-    def _make_track(self, *, title: str, track_no: int, artists: list):
-        t = MagicMock()
-        t.id = uuid.uuid4()
-        t.title = title
-        t.track_no = track_no
-        t.duration_sec = 200
-        t.spotify_id = f"sp_trk_{track_no}"
-        t.artists = artists
-        return t
-
-    def _svc(self, *, album, album_artists, tracks):
-        from app.services.album_service import AlbumService
-        mock_db = MagicMock()
-        svc = AlbumService(mock_db)
-        svc.albums = MagicMock()
-        svc.artists = MagicMock()
-        svc.tracks = MagicMock()
-        svc.albums.get_with_artists.return_value = (album, album_artists)
-        svc.tracks.get_by_album.return_value = tracks
-        return svc
-
-    def test_album_label_populated(self):
-        al = self._make_album(label="Parlophone")
-        svc = self._svc(album=al, album_artists=[], tracks=[])
-        result = svc.get_album_detail(str(al.id))
-        assert result.album.label == "Parlophone"
-
-    def test_album_label_none(self):
-        al = self._make_album(label=None)
-        svc = self._svc(album=al, album_artists=[], tracks=[])
-        result = svc.get_album_detail(str(al.id))
-        assert result.album.label is None
-
-    def test_feat_excludes_album_primary_artists(self):
-        primary = self._make_artist("Primary")
-        guest = self._make_artist("Guest")
-        al = self._make_album()
-        t = self._make_track(title="Song", track_no=1, artists=[primary, guest])
-        svc = self._svc(album=al, album_artists=[primary], tracks=[t])
-        result = svc.get_album_detail(str(al.id))
-        assert result.tracks[0].feat_artist_names == ["Guest"]
-
-    def test_feat_sorted_and_dedupes_album_artists_only(self):
-        a1 = self._make_artist("Alpha")
-        a2 = self._make_artist("Bravo")
-        zulu = self._make_artist("Zulu")
-        delta = self._make_artist("Delta")
-        al = self._make_album()
-        t = self._make_track(title="Song", track_no=1, artists=[zulu, delta, a1, a2])
-        svc = self._svc(album=al, album_artists=[a1, a2], tracks=[t])
-        result = svc.get_album_detail(str(al.id))
-        assert result.tracks[0].feat_artist_names == ["Delta", "Zulu"]
-
-    def test_feat_empty_when_no_guest(self):
-        primary = self._make_artist("Primary")
-        al = self._make_album()
-        t = self._make_track(title="Song", track_no=1, artists=[primary])
-        svc = self._svc(album=al, album_artists=[primary], tracks=[t])
-        result = svc.get_album_detail(str(al.id))
-        assert result.tracks[0].feat_artist_names == []
-
-    def test_album_artist_media_fields_mapped(self):
-        # Regression: album detail dropped photo_url/genres/popularity/
-        # followers/spotify_url (only id/name/spotify_id were mapped), so the
-        # /profile bucket detail slide-over rendered a letter tile instead of
-        # the synced artist photo even though the DB column was populated.
-        al = self._make_album()
-        ar = self._make_artist(
-            "아이유",
-            photo_url="https://i.scdn.co/image/iu.jpg",
-            genres=["k-pop", "k-ballad"],
-            popularity=88,
-            followers=1234567,
-            spotify_url="https://open.spotify.com/artist/abc",
-        )
-        svc = self._svc(album=al, album_artists=[ar], tracks=[])
-        out = svc.get_album_detail(str(al.id)).artists[0]
-        assert out.photo_url == "https://i.scdn.co/image/iu.jpg"
-        assert out.genres == ["k-pop", "k-ballad"]
-        assert out.popularity == 88
-        assert out.followers_count == 1234567
-        assert out.spotify_url == "https://open.spotify.com/artist/abc"
-
-    def test_album_artist_media_fields_default_when_absent(self):
-        al = self._make_album()
-        ar = self._make_artist("Unknown")
-        svc = self._svc(album=al, album_artists=[ar], tracks=[])
-        out = svc.get_album_detail(str(al.id)).artists[0]
-        assert out.photo_url is None
-        assert out.genres == []
-        assert out.popularity is None
-        assert out.followers_count is None
-        assert out.spotify_url is None
-
-
 class TestTrackItemMapperFeatArtistNames:
     """BUG-19 Step 1: unified search TrackItem 의 feat_artist_names list 노출.
 
@@ -531,27 +418,54 @@ class TestUnifiedSearchExpansion:
         t.spotify_id = f"trk_{title}"
         t.album_id = album.id
         t.album = album
+        # thin-row columns (joined from the album)
+        t.album_popularity = album.popularity
+        t.album_release_date = album.release_date
         t.artists = artists or []
         return t
 
     def _build_service(self, *, literal_artists, literal_albums, literal_tracks,
                        expand_artist_albums=None, expand_artist_tracks=None,
                        expand_album_tracks=None):
+        """The stubs double as thin rows (stage one) and hydrated entities
+        (stage three); `get_by_ids` resolves from every stub handed in."""
         from app.services.search_service import SearchService
         svc = SearchService(MagicMock())
         svc.artist_repo = MagicMock()
         svc.album_repo = MagicMock()
         svc.track_repo = MagicMock()
-        svc.artist_repo.search_by_name.return_value = literal_artists
-        svc.album_repo.search_by_title.return_value = literal_albums
-        svc.track_repo.search_by_title.return_value = literal_tracks
-        svc.album_repo.list_by_artist_id_simple.side_effect = (
+        svc.artist_repo.search_rows_by_name.return_value = literal_artists
+        svc.album_repo.search_rows_by_title.return_value = literal_albums
+        svc.track_repo.search_rows_by_title.return_value = literal_tracks
+        svc.album_repo.list_rows_by_artist_id.side_effect = (
             lambda artist_id, limit: (expand_artist_albums or {}).get(artist_id, [])
         )
-        svc.track_repo.list_by_artist_id.side_effect = (
+        svc.track_repo.list_rows_by_artist_id.side_effect = (
             lambda artist_id, limit: (expand_artist_tracks or {}).get(artist_id, [])
         )
-        svc.track_repo.list_by_album_ids.return_value = expand_album_tracks or []
+        svc.track_repo.list_rows_by_album_ids.side_effect = (
+            lambda album_ids, limit: (expand_album_tracks or [])[:limit]
+        )
+
+        albums = list(literal_albums) + [t.album for t in literal_tracks]
+        albums += [al for rows in (expand_artist_albums or {}).values() for al in rows]
+        tracks = list(literal_tracks) + list(expand_album_tracks or [])
+        tracks += [t for rows in (expand_artist_tracks or {}).values() for t in rows]
+        artists = list(literal_artists)
+        artists += [ar for x in albums + tracks for ar in x.artists]
+        registry = {x.id: x for x in albums + tracks + artists}
+
+        svc.artist_repo.rows_by_album_ids.side_effect = lambda ids: [
+            ar for al in literal_albums if al.id in ids for ar in al.artists
+        ]
+        svc.artist_repo.rows_by_track_ids.side_effect = lambda ids: [
+            ar for t in literal_tracks if t.id in ids for ar in t.artists
+        ]
+        svc.album_repo.rows_by_ids.side_effect = lambda ids: [
+            registry[i] for i in ids if i in registry
+        ]
+        for repo in (svc.artist_repo, svc.album_repo, svc.track_repo):
+            repo.get_by_ids.side_effect = lambda ids: [registry[i] for i in ids]
         svc.album_repo.get_primary_artist_map.return_value = {}
         return svc
 
@@ -586,7 +500,7 @@ class TestUnifiedSearchExpansion:
         res = svc.unified_search(q="MatchedAlbum", limit=20, offset=0)
         assert len(res.albums) == 1
         assert len(res.tracks) == 1 and res.tracks[0].title == "Cut1"
-        # album.artists eager-loaded ⇒ feed expansion_artists
+        # the album's credited artists feed expansion_artists
         assert len(res.artists) == 1 and res.artists[0].name == "BandX"
 
     def test_dedup_retains_literal_path_for_track_ranking(self):
@@ -639,25 +553,25 @@ class TestUnifiedSearchExpansion:
         album_titles = {a.title for a in res.albums}
         assert "MatchedAlbum" in album_titles
         assert "UnrelatedAlbum" not in album_titles, "2-hop expansion leaked"
-        # And the artist's list_by_artist_id_simple must not have been called:
-        svc.album_repo.list_by_artist_id_simple.assert_not_called()
+        # And the artist's list_rows_by_artist_id must not have been called:
+        svc.album_repo.list_rows_by_artist_id.assert_not_called()
 
     def test_per_bucket_offset_overrides_singular_offset(self):
-        ar = self._stub_artist(name="A", popularity=10)
+        ar = self._stub_artist(name="Abc", popularity=10)
         svc = self._build_service(
             literal_artists=[ar],
             literal_albums=[],
             literal_tracks=[],
         )
         svc.unified_search(
-            q="A", limit=20, offset=5,
+            q="Abc", limit=20, offset=5,
             artist_offset=100, album_offset=None, track_offset=None,
         )
         # artist_offset override wins
-        svc.artist_repo.search_by_name.assert_called_with("A", 20, 100)
+        svc.artist_repo.search_rows_by_name.assert_called_with("Abc", 20, 100)
         # album/track buckets fall back to singular offset=5
-        svc.album_repo.search_by_title.assert_called_with("A", 20, 5)
-        svc.track_repo.search_by_title.assert_called_with("A", 20, 5)
+        svc.album_repo.search_rows_by_title.assert_called_with("Abc", 20, 5)
+        svc.track_repo.search_rows_by_title.assert_called_with("Abc", 20, 5)
 
     def test_type_filter_skips_excluded_buckets(self):
         ar = self._stub_artist(name="ArtistOnly", popularity=10)
@@ -670,8 +584,8 @@ class TestUnifiedSearchExpansion:
         assert res.albums == []
         assert res.tracks == []
         # No expansion fired into excluded buckets
-        svc.album_repo.list_by_artist_id_simple.assert_not_called()
-        svc.track_repo.list_by_artist_id.assert_not_called()
+        svc.album_repo.list_rows_by_artist_id.assert_not_called()
+        svc.track_repo.list_rows_by_artist_id.assert_not_called()
 
     def test_expansion_only_artists_ranked_by_popularity(self):
         from datetime import date
@@ -691,6 +605,35 @@ class TestUnifiedSearchExpansion:
         # Both are expansion-only — ranked by popularity DESC
         assert [a.name for a in res.artists] == ["HighPop", "LowPop"]
 
+    def test_hydrates_only_the_trimmed_top_n(self):
+        """Late materialization: ranking runs on thin rows; only the `limit`
+        survivors are hydrated, in one batch, and come back in ranked order."""
+        from datetime import date
+        ar = self._stub_artist(name="Prolific", popularity=50)
+        albums = [
+            self._stub_album(title=f"LP{i}", popularity=i, artists=[ar],
+                             release=date(2000 + i, 1, 1))
+            for i in range(12)
+        ]
+        tracks = [self._stub_track(title=f"Cut{i}", album=al, artists=[ar])
+                  for i, al in enumerate(albums)]
+        svc = self._build_service(
+            literal_artists=[ar],
+            literal_albums=[],
+            literal_tracks=[],
+            expand_artist_albums={ar.id: albums},
+            expand_artist_tracks={ar.id: tracks},
+        )
+        res = svc.unified_search(q="Prolific", limit=3, offset=0)
+
+        assert [a.title for a in res.albums] == ["LP11", "LP10", "LP9"]
+        assert [t.title for t in res.tracks] == ["Cut11", "Cut10", "Cut9"]
+        svc.album_repo.get_by_ids.assert_called_once()
+        (hydrated,), _ = svc.album_repo.get_by_ids.call_args
+        assert len(hydrated) == 3
+        svc.track_repo.get_by_ids.assert_called_once()
+        assert len(svc.track_repo.get_by_ids.call_args[0][0]) == 3
+
 
 class TestCandidateSearchResultSchema:
     """PR-12: /api/music/search/candidates response_model — front consumes typed shape."""
@@ -0,0 +1,154 @@
+"""Cold-start priming (app/services/warmup_service.py, PRIME_ON_INIT).
+
+Priming runs during Lambda init, so the contract that matters is: it fills the
+unified-search cache with front-default keys, respects its time budget, and
+never raises. Pure units — the DB session is a MagicMock.
+"""
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://x:x@localhost/x")
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test")
+
+
+def test_parse_prime_queries_dedupes_and_caps():
+    from app.services.warmup_service import parse_prime_queries
+
+    assert parse_prime_queries(" iu, bts ,,iu, newjeans ", 2) == ["iu", "bts"]
+    assert parse_prime_queries("", 20) == []
+
+
+def test_preload_fills_cache_with_front_default_key(monkeypatch):
+    import time
+
+    from app.domain.schemas import UnifiedSearchResult
+    from app.services import search_service, warmup_service
+
+    monkeypatch.setattr(
+        search_service.SearchService, "_compute_unified_search",
+        lambda self, **kw: UnifiedSearchResult(),
+    )
+    n = warmup_service.preload_queries(MagicMock(), ["iu", "bts"], time.perf_counter())
+    assert n == 2
+
+    # A real default request (router: type="album,artist,track", limit=20,
+    # offset=0) must now be a cache hit.
+    computed = {"n": 0}
+
+    def counting(self, **kw):
+        computed["n"] += 1
+        return UnifiedSearchResult()
+
+    monkeypatch.setattr(search_service.SearchService, "_compute_unified_search", counting)
+    search_service.SearchService(MagicMock()).unified_search(
+        q="iu", types={"album", "artist", "track"}, limit=20, offset=0,
+    )
+    assert computed["n"] == 0
+
+    # Recorded queries are canonical (casefolded); other spellings still hit.
+    for q in ("IU", " iu ", "BTS"):
+        search_service.SearchService(MagicMock()).unified_search(q=q, limit=20, offset=0)
+    assert computed["n"] == 0
+
+
+def test_preload_stops_when_budget_is_spent(monkeypatch):
+    from app.core import config
+    from app.domain.schemas import UnifiedSearchResult
+    from app.services import search_service, warmup_service
+
+    monkeypatch.setattr(config.settings, "PRIME_BUDGET_SEC", 0.0)
+    monkeypatch.setattr(
+        search_service.SearchService, "_compute_unified_search",
+        lambda self, **kw: UnifiedSearchResult(),
+    )
+    started = 0.0  # perf_counter epoch → budget already exceeded
+    assert warmup_service.preload_queries(MagicMock(), ["iu"], started) == 0
+
+
+def test_prime_cold_start_swallows_failures(monkeypatch):
+    from app.services import warmup_service
+
+    db = MagicMock()
+    db.execute.side_effect = RuntimeError("neon unreachable")
+    monkeypatch.setattr(warmup_service, "SessionLocal", lambda: db)
+
+    warmup_service.prime_cold_start()  # must not raise
+
+    db.close.assert_called_once()
+
+
+class TestWarmPing:
+    def test_event_shapes(self):
+        from app.services.warmup_service import is_warm_ping
+
+        assert is_warm_ping({"source": "aws.events", "detail-type": "Scheduled Event"})
+        assert is_warm_ping({"source": "serverless-plugin-warmup"})
+        assert is_warm_ping({"warmer": True})
+        assert not is_warm_ping({"warmer": True, "requestContext": {}})
+        assert not is_warm_ping({"source": "aws.events", "detail-type": "Other"})
+        assert not is_warm_ping({"rawPath": "/api/music/search/unified"})
+        assert not is_warm_ping(None)
+
+    def test_handler_skips_asgi_for_warm_events(self, monkeypatch):
+        from app import main
+
+        asgi = MagicMock()
+        monkeypatch.setattr(main, "_asgi_handler", asgi)
+        monkeypatch.setattr(main, "handle_warm_ping", lambda: {"warm": True})
+
+        assert main.handler({"warmer": True}, None) == {"warm": True}
+        asgi.assert_not_called()
+
+        main.handler({"requestContext": {}}, "ctx")
+        asgi.assert_called_once_with({"requestContext": {}}, "ctx")
+
+    def test_refreshes_only_entries_near_expiry(self, monkeypatch):
+        from app.domain.schemas import UnifiedSearchResult
+        from app.services import search_service
+
+        monkeypatch.setattr(
+            search_service.SearchService, "_compute_unified_search",
+            lambda self, **kw: UnifiedSearchResult(),
+        )
+        now = {"t": 1000.0}
+        monkeypatch.setattr(search_service._unified_cache, "timer", lambda: now["t"])
+        svc = search_service.SearchService(MagicMock())
+        svc.unified_search(q="old", limit=20, offset=0)
+        now["t"] += 40
+        svc.unified_search(q="fresh", limit=20, offset=0)
+        now["t"] += 10  # "old" is 50s into its 60s TTL, "fresh" 10s
+
+        seen = []
+        monkeypatch.setattr(
+            search_service.SearchService, "_compute_unified_search",
+            lambda self, **kw: seen.append(kw["q"]) or UnifiedSearchResult(),
+        )
+        assert svc.refresh_expiring(within_sec=30, max_entries=10) == 1
+        assert seen == ["old"]
+        old_key = next(k for k in search_service._unified_cache if k[0] == "old")
+        assert search_service._unified_cache.stored_at(old_key) == now["t"]
+
+    def test_warm_ping_swallows_db_failure(self, monkeypatch):
+        from app.services import warmup_service
+
+        db = MagicMock()
+        db.execute.side_effect = RuntimeError("neon unreachable")
+        monkeypatch.setattr(warmup_service, "SessionLocal", lambda: db)
+
+        out = warmup_service.handle_warm_ping()
+        assert out["warm"] is True and out["db"] is False
+        db.close.assert_called_once()
+
+
+def test_popular_queries_merges_configured_then_recorded(monkeypatch):
+    from app.core import config
+    from app.services import warmup_service
+
+    monkeypatch.setattr(config.settings, "PRIME_QUERIES", "iu,aespa")
+    monkeypatch.setattr(config.settings, "PRIME_TOP_N", 3)
+    monkeypatch.setattr(warmup_service, "top_queries", lambda db, n: ["iu", "bts", "ive"])
+
+    assert warmup_service.popular_queries(MagicMock()) == ["iu", "aespa", "bts"]